@@ -0,0 +1,70 @@
+"""
+Benchmark du chargement de plusieurs fichiers de scraping sur des données synthétiques.
+
+Compare `fusionner_fichiers_json` (liste de dictionnaires Python) au chargeur `charger_voitures`
+(LazyFrame Polars, dédoublonné sur `lien`) pour les formats JSON, NDJSON et Parquet.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_chargement --annonces 2000000 --fichiers 20
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+import polars as pl
+from benchmarks.donnees_synthetiques import generer_donnees, ecrire_fichiers
+from src.modules.scraping.webscraping import fusionner_fichiers_json
+from src.modules.scraping.stockage import charger_voitures
+
+
+def chronometrer(fonction) -> tuple[float, int]:
+    """
+    Renvoie la durée d'exécution d'une fonction et le nombre de lignes qu'elle renvoie.
+    """
+    debut = time.perf_counter()
+    nombre_lignes = len(fonction())
+    return time.perf_counter() - debut, nombre_lignes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--annonces", type=int, default=2_000_000)
+    parser.add_argument("--fichiers", type=int, default=20)
+    parser.add_argument(
+        "--sans-reference",
+        action="store_true",
+        help="Ne mesure pas fusionner_fichiers_json (très lent et gourmand en mémoire).",
+    )
+    args = parser.parse_args()
+
+    donnees = generer_donnees(args.annonces)
+    with tempfile.TemporaryDirectory() as dossier:
+        dossier = Path(dossier)
+        resultats = {}
+        for format in ("json", "ndjson", "parquet"):
+            ecrire_fichiers(donnees, dossier / format, args.fichiers, format)
+            motif = str(dossier / format / f"*.{format}")
+            resultats[f"charger_voitures ({format})"] = chronometrer(
+                lambda: charger_voitures(motif).collect()
+            )
+        if not args.sans_reference:
+            # fusionner_fichiers_json lit les fichiers relativement au dossier json/
+            fichiers = [
+                os.path.relpath(chemin, "json")
+                for chemin in sorted((dossier / "json").glob("*.json"))
+            ]
+            resultats["fusionner_fichiers_json + DataFrame"] = chronometrer(
+                lambda: pl.DataFrame(fusionner_fichiers_json(fichiers)).unique(
+                    subset="lien", keep="first", maintain_order=True
+                )
+            )
+
+    print(f"{args.annonces} annonces réparties dans {args.fichiers} fichiers")
+    for nom, (duree, nombre_lignes) in resultats.items():
+        print(f"{nom:<38} {duree:>8.2f} s  ({nombre_lignes} annonces uniques)")
+
+
+if __name__ == "__main__":
+    main()
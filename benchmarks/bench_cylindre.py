@@ -0,0 +1,130 @@
+"""
+Benchmark de l'extraction des informations du cylindre (`get_cylindre`).
+
+Compare l'ancienne méthode (douze `str.extract`, soit une lecture de chaque chaîne par groupe extrait,
+puis une suite de `with_columns` pour compléter les colonnes) à la méthode actuelle (un `extract_groups`
+par motif, colonnes complétées en une seule projection), et vérifie que les deux résultats sont identiques.
+
+Les chaînes utilisées sont celles de `json/test_data.json`, complétées des cas particuliers
+(moteur absent, électrique, cylindre inconnu), répétées jusqu'au nombre de lignes demandé.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_cylindre --lignes 500000
+"""
+
+import argparse
+import time
+import polars as pl
+from src.modules.datacleaning import get_cylindre, convert_puissance
+from src.modules.scraping.webscraping import fusionner_fichiers_json
+
+
+CAS_PARTICULIERS = [
+    "1.1 60 MIAMI",
+    "DOLLY",
+    "2.0 HDI 90",
+    "320ch 75kWh",
+    "300ch 80kWh E-TECH",
+]
+
+
+def get_cylindre_reference(data: pl.DataFrame) -> pl.DataFrame:
+    """
+    Ancienne implémentation de `get_cylindre`, conservée comme référence.
+    """
+    MOTIF1 = r"(?P<cylindre>\d+\.\d+)\s+(?:(?P<moteur>[\w-]+)\s+)?(?P<puissance>\d+)\s+(?P<finition>\w+.*)"
+    MOTIF2 = r"(?P<cylindre>\d+\.\d+)\s+(?P<puissance>\d+)"
+    MOTIF3 = r"(?P<cylindre>\d+\.\d+)\s+(?P<moteur>[\w-]+)\s+?(?P<puissance>\d+)"
+    MOTIF_ELEC = r"(?P<puissance>\d+ch)\s+(?P<batterie>\d+kWh)\s+(?P<finition>\w+.*)"
+    MOTIF_ELEC2 = r"(?P<puissance>\d+ch)\s+(?P<batterie>\d+kWh+)"
+    MOTIF_CYLINDRE = r"(?P<cylindre>\d+\.\d+)"
+    data = data.with_columns(
+        pl.col("cylindre").str.extract(MOTIF_CYLINDRE, 1).alias("cylindre_2"),
+        pl.col("cylindre").str.extract(MOTIF1, 2).alias("moteur"),
+        pl.col("cylindre").str.extract(MOTIF1, 3).alias("puissance"),
+        pl.col("cylindre").str.extract(MOTIF1, 4).alias("finition"),
+        pl.col("cylindre").str.extract(MOTIF2, 2).alias("puissance_2"),
+        pl.col("cylindre").str.extract(MOTIF3, 2).alias("moteur_2"),
+        pl.col("cylindre").str.extract(MOTIF3, 3).alias("puissance_3"),
+        pl.col("cylindre").str.extract(MOTIF_ELEC, 1).alias("puissance_elec"),
+        pl.col("cylindre").str.extract(MOTIF_ELEC, 2).alias("batterie"),
+        pl.col("cylindre").str.extract(MOTIF_ELEC, 3).alias("finition_2"),
+        pl.col("cylindre").str.extract(MOTIF_ELEC2, 1).alias("puissance_elec_2"),
+        pl.col("cylindre").str.extract(MOTIF_ELEC2, 2).alias("batterie_2"),
+    )
+    for colonne, remplacement in [
+        ("puissance", "puissance_2"),
+        ("puissance", "puissance_3"),
+        ("puissance", "puissance_elec"),
+        ("puissance", "puissance_elec_2"),
+        ("finition", "finition_2"),
+        ("batterie", "batterie_2"),
+        ("moteur", "moteur_2"),
+    ]:
+        data = data.with_columns(
+            pl.when(pl.col(colonne).is_null())
+            .then(pl.col(remplacement))
+            .otherwise(pl.col(colonne))
+            .alias(colonne)
+        )
+    return (
+        data.drop(
+            [
+                "cylindre",
+                "moteur_2",
+                "puissance_2",
+                "puissance_3",
+                "finition_2",
+                "puissance_elec",
+                "puissance_elec_2",
+                "batterie_2",
+            ]
+        )
+        .rename({"cylindre_2": "cylindre"})
+        .pipe(convert_puissance)
+    )
+
+
+def generer_cylindres(lignes: int) -> pl.DataFrame:
+    """
+    Répète les chaînes de cylindre de `json/test_data.json` et les cas particuliers jusqu'à `lignes` lignes.
+    """
+    cylindres = [
+        voiture["cylindre"] for voiture in fusionner_fichiers_json(["test_data.json"])
+    ] + CAS_PARTICULIERS
+    return pl.DataFrame(
+        {"cylindre": [cylindres[i % len(cylindres)] for i in range(lignes)]}
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lignes", type=int, default=500_000)
+    parser.add_argument("--repetitions", type=int, default=5)
+    args = parser.parse_args()
+
+    data = generer_cylindres(args.lignes)
+    resultats = {}
+    for nom, fonction in {
+        "12 str.extract": get_cylindre_reference,
+        "extract_groups": get_cylindre,
+    }.items():
+        durees = []
+        for _ in range(args.repetitions):
+            debut = time.perf_counter()
+            resultat = fonction(data)
+            durees.append(time.perf_counter() - debut)
+        resultats[nom] = (min(durees), resultat)
+
+    reference, combine = (resultat for _, resultat in resultats.values())
+    print(f"{args.lignes} lignes, meilleur temps sur {args.repetitions} répétitions")
+    print(f"Résultats identiques : {reference.equals(combine)}")
+    duree_reference = resultats["12 str.extract"][0]
+    for nom, (duree, _) in resultats.items():
+        print(
+            f"{nom:<16} {args.lignes / duree:>12.0f} lignes/s  (x{duree_reference / duree:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
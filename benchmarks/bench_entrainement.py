@@ -0,0 +1,129 @@
+"""
+Benchmark de l'entraînement d'une marque (`find_best_model` puis réentraînement sur toutes les données).
+
+Compare :
+- l'ancienne méthode : préprocesseur ajusté une fois par modèle sur tout X_train (les plis de validation en
+  font partie), chaque recherche sur grille réentraînant son meilleur modèle ;
+- le pipeline préprocesseur + modèle sans cache : le préprocesseur est réajusté pour chaque combinaison et
+  chaque pli ;
+- le pipeline avec cache, sur disque (`joblib.Memory`) ou en mémoire (`MemoirePreprocesseurs`) : un ajustement
+  du préprocesseur par pli, partagé par toutes les combinaisons et tous les modèles. Le hachage des données par
+  `joblib.Memory` coûte plus cher que l'ajustement qu'il évite.
+
+Dans les trois cas avec pipeline, seul le meilleur modèle est réentraîné.
+
+Les annonces d'une seule marque sont générées par `generer_annonces`, puis nettoyées avec `gazoduc`.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_entrainement --lignes 5000
+    python -m benchmarks.bench_entrainement --lignes 20000 --modeles LinearRegression KNeighbors
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import warnings
+import polars as pl
+from sklearn.model_selection import GridSearchCV
+from src.modules.datacleaning import gazoduc
+from src.modules.machinelearning import (
+    split_data,
+    get_preprocessor,
+    set_models,
+    find_best_model,
+    MemoirePreprocesseurs,
+)
+from src.modules.scraping.webscraping import import_marques_modeles
+from benchmarks.donnees_synthetiques import generer_annonces
+
+
+def entrainer_reference(models, param_grids, X, y, X_train, y_train) -> None:
+    """
+    Ancienne implémentation de `find_best_model` et du réentraînement, conservée comme référence.
+    """
+    preprocessor = get_preprocessor()
+    best_score = float("-inf")
+    for model_name, model in models.items():
+        grid_search = GridSearchCV(model, param_grids[model_name], cv=5)
+        grid_search.fit(preprocessor.fit_transform(X_train), y_train)
+        if grid_search.best_score_ > best_score:
+            best_score = grid_search.best_score_
+            best_model = grid_search.best_estimator_
+    best_model.fit(preprocessor.fit_transform(X.to_pandas()), y.to_numpy())
+    preprocessor.fit(X.to_pandas())
+
+
+def entrainer_pipeline(models, param_grids, X, y, X_train, y_train, memoire) -> None:
+    """
+    Implémentation actuelle : recherche sur grille de pipelines, puis réentraînement sur toutes les données.
+    """
+    best_pipeline, _ = find_best_model(
+        models,
+        param_grids,
+        get_preprocessor(),
+        X_train,
+        y_train,
+        "BENCH",
+        None,
+        memoire,
+    )
+    best_pipeline.fit(X.to_pandas(), y.to_numpy())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lignes", type=int, default=5_000)
+    parser.add_argument(
+        "--modeles",
+        nargs="+",
+        default=["LinearRegression", "KNeighbors", "RandomForest"],
+    )
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    data = gazoduc(
+        generer_annonces(args.lignes, nom_marques_modeles), nom_marques_modeles
+    )
+    # Une seule marque, comme pour l'entraînement d'un modèle par marque
+    data = data.with_columns(pl.lit("BENCH").alias("marque"))
+    X, y, X_train, X_test, y_train, y_test = split_data(data, "BENCH")
+    models, param_grids = set_models()
+    models = {nom: models[nom] for nom in args.modeles}
+
+    # find_best_model exporte les résultats de la validation croisée dans 'cv_results'
+    dossier_courant = os.getcwd()
+    with tempfile.TemporaryDirectory() as dossier:
+        os.chdir(dossier)
+        os.mkdir("cv_results")
+        try:
+            durees = {}
+            for nom, fonction in {
+                "ancienne méthode": lambda: entrainer_reference(
+                    models, param_grids, X, y, X_train, y_train
+                ),
+                "pipeline sans cache": lambda: entrainer_pipeline(
+                    models, param_grids, X, y, X_train, y_train, None
+                ),
+                "pipeline + joblib.Memory": lambda: entrainer_pipeline(
+                    models, param_grids, X, y, X_train, y_train, "cache"
+                ),
+                "pipeline + cache en mémoire": lambda: entrainer_pipeline(
+                    models, param_grids, X, y, X_train, y_train, MemoirePreprocesseurs()
+                ),
+            }.items():
+                debut = time.perf_counter()
+                fonction()
+                durees[nom] = time.perf_counter() - debut
+        finally:
+            os.chdir(dossier_courant)
+
+    print(f"{data.height} lignes nettoyées, modèles : {', '.join(args.modeles)}")
+    reference = durees["ancienne méthode"]
+    for nom, duree in durees.items():
+        print(f"{nom:<28} {duree:>8.2f} s  ({duree / reference - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark des moteurs d'extraction sur `pages/exemple_annonces.html`.
+
+Mesure le nombre d'annonces extraites par seconde avec le moteur classique (`recup_*` sur toute la page)
+et avec le moteur rapide (SoupStrainer + un seul parcours par annonce).
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_extraction --repetitions 20
+"""
+
+import argparse
+import time
+from pathlib import Path
+from src.modules.scraping.extraction import (
+    ExtracteurAnnonces,
+    ExtracteurClassique,
+    ExtracteurRapide,
+)
+
+
+def mesurer(extracteur: ExtracteurAnnonces, contenu: bytes, repetitions: int) -> float:
+    """
+    Renvoie le nombre d'annonces extraites par seconde par un moteur d'extraction.
+
+    ## Parameters:
+        extracteur (ExtracteurAnnonces): Moteur d'extraction à mesurer.
+        contenu (bytes): Contenu HTML de la page.
+        repetitions (int): Nombre d'extractions de la page.
+
+    ## Returns:
+        float: Nombre d'annonces par seconde.
+    """
+    nombre_annonces = 0
+    debut = time.perf_counter()
+    for _ in range(repetitions):
+        nombre_annonces += len(extracteur.extraire(contenu))
+    return nombre_annonces / (time.perf_counter() - debut)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repetitions", type=int, default=20)
+    args = parser.parse_args()
+
+    contenu = (Path(".").resolve() / "pages/exemple_annonces.html").read_bytes()
+    extracteurs = {
+        "classique (html.parser)": ExtracteurClassique(),
+        "rapide (html.parser)": ExtracteurRapide(parser="html.parser"),
+        f"rapide ({ExtracteurRapide().parser})": ExtracteurRapide(),
+    }
+    resultats = {
+        nom: mesurer(extracteur, contenu, args.repetitions)
+        for nom, extracteur in extracteurs.items()
+    }
+    reference = resultats["classique (html.parser)"]
+    for nom, annonces_par_seconde in resultats.items():
+        print(
+            f"{nom:<28} {annonces_par_seconde:>10.1f} annonces/s  (x{annonces_par_seconde / reference:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
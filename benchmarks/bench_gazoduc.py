@@ -0,0 +1,224 @@
+"""
+Benchmark du pipeline de nettoyage (`gazoduc`), étape par étape.
+
+Les annonces brutes sont générées par `generer_annonces` (noms tirés de `json/marques_modeles.json`,
+formats de `json/test_data.json`) pour chaque taille demandée. Chaque étape de `gazoduc` est exécutée sur
+la sortie de la précédente ; on mesure sa durée (meilleur temps sur plusieurs répétitions), le pic de
+mémoire résidente du processus pendant l'étape et sa hausse par rapport à la mémoire occupée avant l'étape.
+
+Le pic est remis à zéro avant chaque étape (`/proc/self/clear_refs`, Linux). Ailleurs, seul le pic depuis
+le lancement est disponible (`resource`) : il ne diminue jamais, n'est donné qu'à titre indicatif et la
+hausse n'est pas calculée.
+
+Les résultats sont écrits en JSON (un enregistrement par taille et par étape, avec le commit, les versions
+et la machine) ; `--comparer` affiche le rapport des durées avec un fichier de résultats précédent.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_gazoduc --lignes 10000 100000 1000000 --sortie resultats.json
+    python -m benchmarks.bench_gazoduc --lignes 100000 --comparer resultats.json
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import platform
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+import polars as pl
+from src.modules.datacleaning import (
+    get_marque_modele_generation,
+    get_km_prix_annee,
+    get_garantie,
+    get_cylindre,
+    supp_doublons,
+)
+from src.modules.validation import valider
+from src.modules.scraping.webscraping import import_marques_modeles
+from benchmarks.donnees_synthetiques import generer_annonces
+
+
+def get_etapes(
+    nom_marques_modeles: pl.DataFrame,
+) -> dict[str, Callable[[pl.DataFrame], pl.DataFrame]]:
+    """
+    Renvoie les étapes de `gazoduc`, dans l'ordre.
+    """
+    return {
+        "get_marque_modele_generation": lambda data: get_marque_modele_generation(
+            data, nom_marques_modeles
+        ),
+        "get_km_prix_annee": get_km_prix_annee,
+        "get_garantie": get_garantie,
+        "get_cylindre": get_cylindre,
+        "valider": valider,
+        "supp_doublons": supp_doublons,
+    }
+
+
+def reinitialiser_pic_memoire() -> None:
+    """
+    Remet à zéro le pic de mémoire résidente du processus, si le système le permet (Linux).
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as fichier:
+            fichier.write("5")
+    except OSError:
+        pass
+
+
+def get_memoire_residente(champ: str = "VmRSS") -> float | None:
+    """
+    Renvoie la mémoire résidente actuelle ("VmRSS") ou son pic ("VmHWM") en Mo, ou None hors Linux.
+    """
+    try:
+        with open("/proc/self/status") as fichier:
+            for ligne in fichier:
+                if ligne.startswith(f"{champ}:"):
+                    return int(ligne.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def get_pic_memoire() -> float:
+    """
+    Renvoie le pic de mémoire résidente du processus, en Mo.
+    """
+    pic = get_memoire_residente("VmHWM")
+    if pic is not None:
+        return pic
+    import resource
+
+    pic = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Octets sous macOS, kilo-octets ailleurs
+    return pic / 1024**2 if sys.platform == "darwin" else pic / 1024
+
+
+def mesurer(
+    etape: Callable[[pl.DataFrame], pl.DataFrame], data: pl.DataFrame, repetitions: int
+) -> tuple[pl.DataFrame, float, float, float | None]:
+    """
+    Exécute une étape plusieurs fois et renvoie son résultat, son meilleur temps (s), son pic de mémoire (Mo)
+    et la hausse de la mémoire pendant l'étape (Mo, None hors Linux).
+    """
+    durees, pics, hausses = [], [], []
+    for _ in range(repetitions):
+        resultat = None
+        gc.collect()
+        reinitialiser_pic_memoire()
+        avant = get_memoire_residente()
+        debut = time.perf_counter()
+        resultat = etape(data)
+        durees.append(time.perf_counter() - debut)
+        pics.append(get_pic_memoire())
+        hausses.append(None if avant is None else pics[-1] - avant)
+    return resultat, min(durees), min(pics), None if avant is None else min(hausses)
+
+
+def get_contexte() -> dict:
+    """
+    Renvoie le contexte des mesures : commit, date, versions et machine.
+    """
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "date": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "machine": platform.machine(),
+        "processeur": platform.processor(),
+        "coeurs": pl.threadpool_size(),
+    }
+
+
+def comparer(resultats: list[dict], chemin_reference: str | Path) -> None:
+    """
+    Affiche le rapport des durées avec celles d'un fichier de résultats précédent (mêmes tailles et étapes).
+    """
+    with open(chemin_reference, "r", encoding="utf-8") as fichier:
+        reference = json.load(fichier)
+    durees_reference = {
+        (mesure["lignes"], mesure["etape"]): mesure["duree_s"]
+        for mesure in reference["resultats"]
+    }
+    print(
+        f"\nComparaison avec {chemin_reference} (commit {reference['contexte']['commit']})"
+    )
+    for mesure in resultats:
+        duree_reference = durees_reference.get((mesure["lignes"], mesure["etape"]))
+        if duree_reference is not None:
+            print(
+                f"{mesure['lignes']:>9} {mesure['etape']:<30} "
+                f"{duree_reference:>8.3f} s -> {mesure['duree_s']:>8.3f} s "
+                f"({mesure['duree_s'] / duree_reference - 1:+.1%})"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--lignes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument("--repetitions", type=int, default=3)
+    parser.add_argument("--sortie", type=Path, default=None)
+    parser.add_argument("--comparer", type=Path, default=None)
+    args = parser.parse_args()
+
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    etapes = get_etapes(nom_marques_modeles)
+    resultats = []
+    for lignes in args.lignes:
+        data = generer_annonces(lignes, nom_marques_modeles)
+        print(f"\n{lignes} lignes, meilleur temps sur {args.repetitions} répétitions")
+        duree_totale = 0.0
+        for nom, etape in etapes.items():
+            lignes_entree = data.height
+            data, duree, pic, hausse = mesurer(etape, data, args.repetitions)
+            duree_totale += duree
+            resultats.append(
+                {
+                    "lignes": lignes,
+                    "etape": nom,
+                    "lignes_entree": lignes_entree,
+                    "lignes_sortie": data.height,
+                    "duree_s": round(duree, 6),
+                    "lignes_par_s": round(lignes_entree / duree) if duree > 0 else None,
+                    "pic_memoire_mo": round(pic, 1),
+                    "hausse_memoire_mo": None if hausse is None else round(hausse, 1),
+                }
+            )
+            print(
+                f"{nom:<30} {duree:>8.3f} s  {pic:>8.1f} Mo (+{hausse or 0:.1f})  "
+                f"{lignes_entree:>9} -> {data.height:>9} lignes"
+            )
+        print(
+            f"{'total':<30} {duree_totale:>8.3f} s  ({lignes / duree_totale:,.0f} lignes/s)"
+        )
+
+    if args.sortie is not None:
+        args.sortie.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.sortie, "w", encoding="utf-8") as fichier:
+            json.dump(
+                {"contexte": get_contexte(), "resultats": resultats},
+                fichier,
+                ensure_ascii=False,
+                indent=2,
+            )
+    if args.comparer is not None:
+        comparer(resultats, args.comparer)
+
+
+if __name__ == "__main__":
+    main()
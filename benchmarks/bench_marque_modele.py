@@ -0,0 +1,89 @@
+"""
+Benchmark de l'extraction de la marque, du modèle et de la génération (`get_marque_modele_generation`).
+
+Compare l'ancienne méthode (`map_rows` avec `recup_marque_modele_generation` sur chaque ligne) à la méthode
+indexée (index précalculé, un seul calcul par nom de véhicule distinct, puis jointure), et vérifie que
+les deux résultats sont identiques.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_marque_modele --lignes 200000 --noms-distincts 5000
+"""
+
+import argparse
+import random
+import time
+import polars as pl
+from src.modules.datacleaning import (
+    recup_marque_modele_generation,
+    get_marque_modele_generation,
+)
+from src.modules.scraping.webscraping import import_marques_modeles
+
+
+def get_marque_modele_generation_ligne_a_ligne(
+    data: pl.DataFrame, nom_marques_modeles: pl.DataFrame
+) -> pl.DataFrame:
+    """
+    Ancienne implémentation de `get_marque_modele_generation`, conservée comme référence.
+    """
+    return (
+        data.with_columns(
+            data.select(pl.col("marque")).map_rows(
+                lambda row: recup_marque_modele_generation(row, nom_marques_modeles)
+            )
+        )
+        .drop("marque")
+        .rename({"column_0": "marque", "column_1": "modele", "column_2": "generation"})
+    )
+
+
+def generer_noms(
+    nom_marques_modeles: pl.DataFrame, lignes: int, noms_distincts: int, graine: int = 0
+) -> pl.DataFrame:
+    """
+    Génère des noms de véhicules au format des annonces ("MARQUE MODELE génération").
+    """
+    generateur = random.Random(graine)
+    couples = [
+        (marque, modele.upper())
+        for marque, modeles in nom_marques_modeles.iter_rows()
+        for modele in modeles
+    ]
+    generations = ["", " II", " III", " phase 2", " IV SPORTBACK", " (2)"]
+    noms = []
+    for _ in range(noms_distincts):
+        marque, modele = generateur.choice(couples)
+        noms.append(f"{marque} {modele}{generateur.choice(generations)}")
+    noms.append("MARQUE INCONNUE")
+    return pl.DataFrame({"marque": [generateur.choice(noms) for _ in range(lignes)]})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lignes", type=int, default=200_000)
+    parser.add_argument("--noms-distincts", type=int, default=5_000)
+    args = parser.parse_args()
+
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    data = generer_noms(nom_marques_modeles, args.lignes, args.noms_distincts)
+    resultats = {}
+    for nom, fonction in {
+        "map_rows (ligne à ligne)": get_marque_modele_generation_ligne_a_ligne,
+        "index + jointure": get_marque_modele_generation,
+    }.items():
+        debut = time.perf_counter()
+        resultat = fonction(data, nom_marques_modeles)
+        resultats[nom] = (time.perf_counter() - debut, resultat)
+
+    reference, indexe = (resultat for _, resultat in resultats.values())
+    print(f"{args.lignes} lignes, {args.noms_distincts} noms distincts")
+    print(f"Résultats identiques : {reference.equals(indexe)}")
+    duree_reference = resultats["map_rows (ligne à ligne)"][0]
+    for nom, (duree, _) in resultats.items():
+        print(
+            f"{nom:<26} {args.lignes / duree:>12.0f} lignes/s  (x{duree_reference / duree:.1f})"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Benchmark des recherches d'hyperparamètres de `find_best_model` : grille complète ou divisions successives.
+
+Pour chaque recherche, on mesure la durée de la recherche, la MAE du meilleur pipeline sur l'ensemble de test et
+le nombre d'arbres entraînés pendant la validation croisée de la forêt aléatoire (lu dans les résultats exportés
+pour "halving", déduit de la grille pour "grille").
+
+Les annonces d'une seule marque sont générées par `generer_annonces`, puis nettoyées avec `gazoduc`.
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_recherche --lignes 2000
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import warnings
+import pandas as pd
+import polars as pl
+from sklearn.metrics import mean_absolute_error
+from src.modules.datacleaning import gazoduc
+from src.modules.machinelearning import (
+    split_data,
+    get_preprocessor,
+    set_models,
+    find_best_model,
+    MemoirePreprocesseurs,
+    RECHERCHES,
+)
+from src.modules.scraping.webscraping import import_marques_modeles
+from benchmarks.donnees_synthetiques import generer_annonces
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lignes", type=int, default=2_000)
+    args = parser.parse_args()
+    warnings.filterwarnings("ignore")
+
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    data = gazoduc(
+        generer_annonces(args.lignes, nom_marques_modeles), nom_marques_modeles
+    )
+    # Une seule marque, comme pour l'entraînement d'un modèle par marque
+    data = data.with_columns(pl.lit("BENCH").alias("marque"))
+    X, y, X_train, X_test, y_train, y_test = split_data(data, "BENCH")
+    models, param_grids = set_models()
+    grille_foret = param_grids["RandomForest"]
+    combinaisons_foret = (
+        len(grille_foret["max_depth"])
+        * len(grille_foret["min_samples_split"])
+        * len(grille_foret["min_samples_leaf"])
+    )
+
+    dossier_courant = os.getcwd()
+    with tempfile.TemporaryDirectory() as dossier:
+        os.chdir(dossier)
+        os.mkdir("cv_results")
+        try:
+            resultats = {}
+            for recherche in RECHERCHES:
+                debut = time.perf_counter()
+                best_pipeline, best_model_name = find_best_model(
+                    models,
+                    param_grids,
+                    get_preprocessor(),
+                    X_train,
+                    y_train,
+                    "BENCH",
+                    None,
+                    MemoirePreprocesseurs(),
+                    recherche,
+                )
+                duree = time.perf_counter() - debut
+                if recherche == "halving":
+                    arbres = 5 * int(
+                        pd.read_json(
+                            "cv_results/BENCH_RandomForest_results.json", lines=True
+                        )["n_resources"].sum()
+                    )
+                else:
+                    arbres = 5 * combinaisons_foret * sum(grille_foret["n_estimators"])
+                mae = mean_absolute_error(y_test, best_pipeline.predict(X_test))
+                resultats[recherche] = (duree, mae, arbres, best_model_name)
+        finally:
+            os.chdir(dossier_courant)
+
+    print(f"{data.height} lignes nettoyées ({len(X_train)} pour la validation croisée)")
+    duree_grille, _, arbres_grille, _ = resultats["grille"]
+    for recherche, (duree, mae, arbres, best_model_name) in resultats.items():
+        print(
+            f"{recherche:<8} {duree:>8.1f} s ({duree / duree_grille:.0%})  "
+            f"{arbres:>6} arbres ({arbres / arbres_grille:.0%})  "
+            f"MAE {mae:>9.1f}  meilleur modèle : {best_model_name}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark du coût de l'étape de validation (`valider`) dans `gazoduc`.
+
+Compare `gazoduc` sans validation (ancien enchaînement des étapes, avec `filter_data` et `supp_na`) à
+`gazoduc` avec validation, sans puis avec enregistrement des rejets, sur des annonces synthétiques.
+
+Le coût des contrôles est fixe ; celui de l'enregistrement dépend du nombre de lignes rejetées. Dans les
+annonces synthétiques, deux des six cylindres n'ont pas de puissance lisible : environ un tiers des lignes
+est rejeté (elles étaient déjà écartées, sans trace, par `filter_data`).
+
+Utilisation (depuis la racine du projet) :
+    python -m benchmarks.bench_validation --lignes 1000000
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+import polars as pl
+from src.modules.datacleaning import (
+    gazoduc,
+    get_marque_modele_generation,
+    get_km_prix_annee,
+    get_garantie,
+    get_cylindre,
+    filter_data,
+    supp_doublons,
+    supp_na,
+)
+from src.modules.scraping.webscraping import import_marques_modeles
+from benchmarks.donnees_synthetiques import generer_donnees
+
+
+def gazoduc_sans_validation(
+    data: pl.DataFrame, nom_marques_modeles: pl.DataFrame
+) -> pl.DataFrame:
+    """
+    Enchaînement des étapes de `gazoduc` sans l'étape de validation, conservé comme référence.
+    """
+    return (
+        data.pipe(get_marque_modele_generation, nom_marques_modeles)
+        .pipe(get_km_prix_annee)
+        .pipe(get_garantie)
+        .pipe(get_cylindre)
+        .pipe(filter_data)
+        .pipe(supp_doublons)
+        .pipe(supp_na)
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--lignes", type=int, default=1_000_000)
+    parser.add_argument("--repetitions", type=int, default=3)
+    args = parser.parse_args()
+
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    # Quelques prix hors des bornes, en plus des puissances illisibles
+    data = generer_donnees(args.lignes).with_columns(
+        pl.when(pl.int_range(0, pl.len()) % 1000 == 0)
+        .then(pl.lit("10 €"))
+        .otherwise(pl.col("prix"))
+        .alias("prix")
+    )
+    with tempfile.TemporaryDirectory() as dossier:
+        chemin_rejets = Path(dossier) / "rejets.parquet"
+        durees: dict[str, float] = {}
+        for nom, fonction in {
+            "sans validation": lambda: gazoduc_sans_validation(
+                data, nom_marques_modeles
+            ),
+            "validation": lambda: gazoduc(data, nom_marques_modeles),
+            "validation + rejets": lambda: gazoduc(
+                data, nom_marques_modeles, chemin_rejets
+            ),
+        }.items():
+            mesures = []
+            for _ in range(args.repetitions):
+                debut = time.perf_counter()
+                fonction()
+                mesures.append(time.perf_counter() - debut)
+            durees[nom] = min(mesures)
+        nombre_rejets = pl.scan_parquet(chemin_rejets).select(pl.len()).collect().item()
+
+    print(f"{args.lignes} lignes, meilleur temps sur {args.repetitions} répétitions")
+    print(f"{nombre_rejets} lignes rejetées ({nombre_rejets / args.lignes:.1%})")
+    reference = durees["sans validation"]
+    for nom, duree in durees.items():
+        print(f"{nom:<20} {duree:>8.3f} s  ({duree / reference - 1:+.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""
+Génération de données de scraping synthétiques pour les benchmarks.
+
+Les annonces reprennent la forme des objets voiture (toutes les valeurs sont des chaînes, comme en sortie
+du scraping). Une proportion d'annonces est répétée d'un fichier à l'autre, comme lorsque plusieurs
+scrapings se recoupent.
+"""
+
+import json
+import re
+from dataclasses import asdict
+from pathlib import Path
+import numpy as np
+import polars as pl
+from src.modules.scraping.webscraping import voiture
+from src.modules.scraping.stockage import SCHEMA_POLARS
+
+VEHICULES = [
+    ("CITROEN C3 III", "1.2 PURETECH 110 FEEL"),
+    ("RENAULT CAPTUR phase 2", "1.3 TCE 130 INTENS"),
+    ("PEUGEOT 208 II", "1.2 PURETECH 100 ALLURE"),
+    ("VOLKSWAGEN GOLF VII", "1.6 TDI 115 CONFORTLINE"),
+    ("TESLA MODEL 3", "LONG RANGE AWD DUAL MOTOR"),
+    ("BMW SERIE 3 G20", "320D 190 M SPORT BVA8"),
+]
+BOITES = ["Automatique", "Manuelle"]
+ENERGIES = ["Essence", "Diesel", "Electrique", "Hybride"]
+POSITIONS = [
+    "Bonne affaire",
+    "Très bonne affaire",
+    "Analyse indisponible",
+    "Offre équitable",
+]
+GARANTIES = ["Garantie 12 mois", "Garantie 6 mois", "NA"]
+# Suffixes de génération rencontrés dans les noms des annonces
+GENERATIONS = ["", " II", " III", " V", " phase 2", " (2E GENERATION)", " IV SPORTBACK"]
+# Cylindres électriques et cylindres sans puissance lisible (rejetés par la validation)
+CYLINDRES_ELECTRIQUES = [
+    "{puissance}ch 50kWh ICONIC",
+    "{puissance}ch 75kWh",
+    "{puissance}ch 80kWh E-TECH",
+]
+CYLINDRES_ILLISIBLES = ["DOLLY", "E-TENSE", "HYBRID"]
+
+
+def generer_donnees(
+    nombre_annonces: int, taux_doublons: float = 0.1, graine: int = 0
+) -> pl.DataFrame:
+    """
+    Génère un DataFrame d'annonces synthétiques au format brut du scraping.
+
+    ## Parameters:
+        nombre_annonces (int): Nombre d'annonces (doublons compris).
+        taux_doublons (float): Proportion d'annonces dont le lien est celui d'une autre annonce.
+        graine (int): Graine du générateur aléatoire.
+
+    ## Returns:
+        pl.DataFrame: Les annonces, avec les colonnes de l'objet voiture.
+    """
+    generateur = np.random.default_rng(graine)
+    vehicules = generateur.integers(0, len(VEHICULES), nombre_annonces)
+    identifiants = np.arange(nombre_annonces)
+    doublons = generateur.random(nombre_annonces) < taux_doublons
+    identifiants[doublons] = generateur.integers(0, nombre_annonces, doublons.sum())
+    return pl.DataFrame(
+        {
+            "marque": [VEHICULES[i][0] for i in vehicules],
+            "cylindre": [VEHICULES[i][1] for i in vehicules],
+            "annee": generateur.integers(2005, 2024, nombre_annonces).astype(str),
+            "kilometrage": [
+                f"{km:,} km".replace(",", " ")
+                for km in generateur.integers(0, 300_000, nombre_annonces)
+            ],
+            "boite": generateur.choice(BOITES, nombre_annonces),
+            "energie": generateur.choice(ENERGIES, nombre_annonces),
+            "prix": [
+                f"{prix:,} €".replace(",", " ")
+                for prix in generateur.integers(2_000, 80_000, nombre_annonces)
+            ],
+            "position_marché": generateur.choice(POSITIONS, nombre_annonces),
+            "garantie": generateur.choice(GARANTIES, nombre_annonces),
+            "lien": [
+                f"https://www.lacentrale.fr/auto-occasion-annonce-{i}.html"
+                for i in identifiants
+            ],
+        },
+        schema=SCHEMA_POLARS,
+    )
+
+
+def ecrire_fichiers(
+    donnees: pl.DataFrame, dossier: str | Path, nombre_fichiers: int, format: str
+) -> list[Path]:
+    """
+    Répartit les annonces dans plusieurs fichiers d'un même format.
+
+    ## Parameters:
+        donnees (pl.DataFrame): Annonces à écrire.
+        dossier (str | Path): Dossier de sortie.
+        nombre_fichiers (int): Nombre de fichiers.
+        format (str): "json" (tableau, comme `export_to_json`), "ndjson" ou "parquet".
+
+    ## Returns:
+        list[Path]: Chemins des fichiers écrits.
+    """
+    dossier = Path(dossier)
+    dossier.mkdir(parents=True, exist_ok=True)
+    taille = -(-donnees.height // nombre_fichiers)
+    chemins = []
+    for numero, morceau in enumerate(donnees.iter_slices(taille)):
+        chemin = dossier / f"voitures_{numero:04d}.{format}"
+        if format == "json":
+            # Même forme que `export_to_json` : un tableau d'objets voiture
+            voitures = [voiture(**ligne) for ligne in morceau.iter_rows(named=True)]
+            chemin.write_text(
+                json.dumps([asdict(v) for v in voitures], ensure_ascii=False),
+                encoding="utf-8",
+            )
+        elif format == "ndjson":
+            morceau.write_ndjson(chemin)
+        elif format == "parquet":
+            morceau.write_parquet(chemin)
+        else:
+            raise ValueError(f"Format inconnu : {format}.")
+        chemins.append(chemin)
+    return chemins
+
+
+def generer_annonces(
+    nombre_annonces: int,
+    nom_marques_modeles: pl.DataFrame,
+    chemin_exemples: str | Path = "json/test_data.json",
+    noms_distincts: int = 5_000,
+    taux_doublons: float = 0.05,
+    graine: int = 0,
+) -> pl.DataFrame:
+    """
+    Génère des annonces brutes réalistes : noms de véhicules tirés de toutes les marques et de tous les modèles
+    connus, cylindres construits sur ceux des annonces d'exemple (puissance et cylindrée variées), avec une
+    part d'électriques, de cylindres illisibles, de valeurs hors bornes et de liens en double.
+
+    ## Parameters:
+        nombre_annonces (int): Nombre d'annonces (doublons compris).
+        nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et les modèles associés des véhicules.
+        chemin_exemples (str | Path): Annonces d'exemple (tableau JSON) dont les formats sont repris.
+        noms_distincts (int): Nombre de noms de véhicules distincts.
+        taux_doublons (float): Proportion d'annonces dont le lien est celui d'une autre annonce.
+        graine (int): Graine du générateur aléatoire.
+
+    ## Returns:
+        pl.DataFrame: Les annonces, avec les colonnes de l'objet voiture.
+    """
+    generateur = np.random.default_rng(graine)
+    exemples = pl.read_json(chemin_exemples, schema=SCHEMA_POLARS)
+    couples = [
+        (marque, modele.upper())
+        for marque, modeles in nom_marques_modeles.iter_rows()
+        for modele in modeles
+    ]
+    noms = [
+        f"{marque} {modele}{GENERATIONS[generation]}"
+        for (marque, modele), generation in zip(
+            (couples[i] for i in generateur.integers(0, len(couples), noms_distincts)),
+            generateur.integers(0, len(GENERATIONS), noms_distincts),
+        )
+    ]
+    # Cylindres des exemples ("1.2 PURETECH 110 FEEL") : la cylindrée et la puissance varient
+    modeles_cylindres = [
+        re.sub(r"^\d\.\d (.*?)\d+ ", r"{cylindree} \1{puissance} ", cylindre)
+        for cylindre in exemples["cylindre"].unique(maintain_order=True)
+    ]
+    cylindres = [
+        modele.format(cylindree=f"{cylindree:.1f}", puissance=puissance)
+        for modele in modeles_cylindres
+        for cylindree in np.arange(1.0, 3.1, 0.1)
+        for puissance in range(60, 260, 5)
+    ]
+    cylindres += [
+        modele.format(puissance=puissance)
+        for modele in CYLINDRES_ELECTRIQUES
+        for puissance in range(100, 520, 20)
+    ]
+    tirage = generateur.random(nombre_annonces)
+    choix_cylindres = np.where(
+        tirage < 0.03,
+        # 3 % de cylindres illisibles
+        len(cylindres)
+        + generateur.integers(0, len(CYLINDRES_ILLISIBLES), nombre_annonces),
+        generateur.integers(0, len(cylindres), nombre_annonces),
+    )
+    cylindres += CYLINDRES_ILLISIBLES
+    kilometrages = generateur.integers(0, 300_000, nombre_annonces)
+    # 1 % de kilométrages hors bornes
+    kilometrages[generateur.random(nombre_annonces) < 0.01] = 999_999
+    identifiants = 69_000_000_000 + np.arange(nombre_annonces)
+    doublons = generateur.random(nombre_annonces) < taux_doublons
+    identifiants[doublons] = identifiants[
+        generateur.integers(0, nombre_annonces, doublons.sum())
+    ]
+    garanties = exemples["garantie"].unique(maintain_order=True).to_list() + GARANTIES
+    positions = exemples["position_marché"].unique(maintain_order=True).to_list()
+    return pl.DataFrame(
+        {
+            "marque": [
+                noms[i] for i in generateur.integers(0, noms_distincts, nombre_annonces)
+            ],
+            "cylindre": [cylindres[i] for i in choix_cylindres],
+            "annee": generateur.integers(2000, 2025, nombre_annonces).astype(str),
+            "kilometrage": [f"{km:,} km".replace(",", " ") for km in kilometrages],
+            "boite": generateur.choice(BOITES, nombre_annonces),
+            "energie": generateur.choice(ENERGIES, nombre_annonces),
+            "prix": [
+                f"{prix:,} €".replace(",", " ")
+                for prix in generateur.integers(1_500, 90_000, nombre_annonces)
+            ],
+            "position_marché": generateur.choice(
+                positions + POSITIONS, nombre_annonces
+            ),
+            "garantie": generateur.choice(garanties, nombre_annonces),
+            "lien": [
+                f"https://www.lacentrale.fr/auto-occasion-annonce-{i}.html"
+                for i in identifiants
+            ],
+        },
+        schema=SCHEMA_POLARS,
+    )
@@ -4,6 +4,7 @@ from sklearn.linear_model import LinearRegression
 from sklearn.neighbors import KNeighborsRegressor
 from sklearn.compose import ColumnTransformer
 from joblib import load
+from src.modules.registre import charger_version, version_courante
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as Figure
@@ -17,6 +18,9 @@ def charger_modeles(
     """
     Charge le modèle de régression et le préprocesseur associé pour une marque donnée.
 
+    Le modèle est résolu par le registre des modèles (version courante de la marque). Les modèles exportés avant
+    le registre, 'src/models/{MARQUE}_best_model.joblib', sont utilisés pour les marques sans version publiée.
+
     ## Parameters:
         marque (str): Nom de la marque pour laquelle le modèle est chargé.
 
@@ -28,8 +32,11 @@ def charger_modeles(
         # Charge le modèle de régression et le préprocesseur associé pour la marque PORSCHE.
     """
     try:
-        model = load(f"src/models/{marque.upper()}_best_model.joblib")
-        preprocessor = load(f"src/models/{marque.upper()}_preprocessor.joblib")
+        if version_courante(marque.upper()) is not None:
+            model, preprocessor = charger_version(marque.upper())
+        else:
+            model = load(f"src/models/{marque.upper()}_best_model.joblib")
+            preprocessor = load(f"src/models/{marque.upper()}_preprocessor.joblib")
     except Exception as e:
         print(f"Erreur lors de l'importation du modèle : {str(e)}")
     return model, preprocessor
@@ -0,0 +1,524 @@
+"""
+Module de la base de données nettoyée, mise à jour de façon incrémentale.
+
+La base est un jeu de données Parquet partitionné par marque (format Hive) :
+
+    data/database/marque=RENAULT/partie-000001.parquet
+    data/database/marque=RENAULT/partie-000002.parquet
+    data/database/marque=PEUGEOT/partie-000001.parquet
+    data/database/index_liens.duckdb
+
+Chaque partie est triée par modèle puis année et écrite avec les statistiques de ses groupes de lignes :
+une requête filtrée sur la marque ne lit que le dossier de la marque (élagage des partitions), et les
+filtres sur le modèle ou l'année sautent les groupes de lignes grâce aux valeurs min/max. La colonne
+`marque` est aussi gardée dans les fichiers, pour qu'une partie se lise seule.
+
+Un index DuckDB sur disque associe chaque `lien` à la partie qui le contient. Une mise à jour ne nettoie
+que les nouvelles annonces brutes (avec `gazoduc`), puis :
+
+- ajoute les annonces inconnues dans une nouvelle partie ;
+- remplace les annonces déjà présentes (même `lien`), en ne réécrivant que les parties concernées ;
+- supprime les annonces retirées du site.
+
+Comme avec `supp_doublons`, la base ne contient jamais deux annonces avec le même lien. Le coût d'une
+mise à jour dépend de la taille du lot, et non de celle de la base. Chaque lot ajoute une partie par marque :
+au-delà de `PARTIES_MAX` parties, celles de la marque sont fusionnées en une seule (`compacter`).
+
+Une ancienne base monolithique (`data/database.parquet`) se convertit avec `migrer_base`.
+"""
+
+import json
+import os
+import shutil
+from dataclasses import dataclass
+from pathlib import Path
+import duckdb
+import polars as pl
+from src.modules.datacleaning import gazoduc
+from src.modules.dedoublonnage import IndexEmpreintes
+from src.modules.scraping.stockage import COLONNES_VOITURE, SCHEMA_POLARS
+from src.modules.validation import SCHEMA_NETTOYE
+
+
+CHEMIN_BASE = "data/database"
+TAILLE_GROUPE = 50_000
+PARTIES_MAX = 20
+# Source à utiliser dans les requêtes DuckDB : `FROM {SOURCE_BASE}`
+SOURCE_BASE = f"read_parquet('{CHEMIN_BASE}/*/*.parquet', hive_partitioning = true)"
+
+
+@dataclass
+class BilanNettoyage:
+    ajoutees: int = 0
+    remplacees: int = 0
+    ignorees: int = 0
+    supprimees: int = 0
+    doublons: int = 0
+
+
+class BaseNettoyee:
+    """
+    Base de données nettoyée, stockée en parties Parquet partitionnées par marque avec un index DuckDB des liens.
+
+    ## Example(s):
+        >>> with BaseNettoyee("data/database") as base:
+        ...     nettoyage_incremental(pl.read_ndjson("json/nouvelles.ndjson"), nom_marques_modeles, base)
+        ...     base.lire().collect()
+    """
+
+    def __init__(
+        self,
+        dossier: str | Path = CHEMIN_BASE,
+        chemin_index: str | Path | None = None,
+        parties_max: int | None = PARTIES_MAX,
+    ) -> None:
+        """
+        ## Parameters:
+            dossier (str | Path): Dossier racine du jeu de données partitionné.
+            chemin_index (str | Path | None): Fichier DuckDB de l'index des liens. `index_liens.duckdb` dans le dossier si None.
+            parties_max (int | None): Nombre de parties d'une marque au-delà duquel `ajouter` les fusionne
+                (voir `compacter`). Jamais de fusion automatique si None.
+        """
+        self.dossier = Path(dossier)
+        self.parties_max = parties_max
+        self.dossier.mkdir(parents=True, exist_ok=True)
+        self.chemin_index = (
+            Path(chemin_index)
+            if chemin_index is not None
+            else self.dossier / "index_liens.duckdb"
+        )
+        self.connexion = duckdb.connect(str(self.chemin_index))
+        self.connexion.execute(
+            "CREATE TABLE IF NOT EXISTS liens (lien VARCHAR PRIMARY KEY, partie VARCHAR NOT NULL)"
+        )
+
+    def parties(self, marque: str | None = None) -> list[Path]:
+        """
+        Renvoie les fichiers Parquet de la base (toutes marques), ou ceux d'une marque.
+        """
+        partition = "*" if marque is None else f"marque={marque}"
+        return sorted(self.dossier.glob(f"{partition}/partie-*.parquet"))
+
+    def __len__(self) -> int:
+        return self.connexion.execute("SELECT count(*) FROM liens").fetchone()[0]
+
+    def lire(self, marque: str | None = None) -> pl.LazyFrame:
+        """
+        Lit paresseusement la base nettoyée, ou seulement la partition d'une marque.
+
+        ## Parameters:
+            marque (str | None): Marque à lire. Toute la base si None.
+
+        ## Raises:
+            FileNotFoundError: Si la base (ou la partition) est vide.
+        """
+        return lire_base(self.dossier, marque)
+
+    def _ecrire_parties(self, nettoyees: pl.DataFrame) -> pl.DataFrame:
+        # Une nouvelle partie par marque, toutes avec le même numéro pour un même lot
+        numero = max((int(p.stem.split("-")[1]) for p in self.parties()), default=0) + 1
+        index = []
+        for lot in nettoyees.partition_by("marque"):
+            partie = f"marque={lot['marque'][0]}/partie-{numero:06d}.parquet"
+            ecrire_partie(lot, self.dossier / partie)
+            index.append(
+                pl.DataFrame({"lien": lot["lien"], "partie": [partie] * lot.height})
+            )
+        return pl.concat(index)
+
+    def _retirer_des_parties(self, liens_parties: pl.DataFrame) -> None:
+        # Seules les parties contenant des liens retirés sont réécrites
+        for liens in liens_parties.partition_by("partie"):
+            chemin = self.dossier / liens["partie"][0]
+            restantes = pl.read_parquet(chemin, hive_partitioning=False).filter(
+                ~pl.col("lien").is_in(liens["lien"])
+            )
+            if restantes.height == 0:
+                chemin.unlink()
+                continue
+            ecrire_partie(restantes, chemin)
+
+    def _liens_connus(self, liens: pl.Series) -> pl.DataFrame:
+        lot = pl.DataFrame({"lien": liens}).to_arrow()
+        self.connexion.register("lot_liens", lot)
+        try:
+            return pl.DataFrame(
+                self.connexion.execute(
+                    "SELECT liens.lien, liens.partie FROM liens JOIN lot_liens USING (lien)"
+                ).fetchall(),
+                schema={"lien": pl.Utf8, "partie": pl.Utf8},
+                orient="row",
+            )
+        finally:
+            self.connexion.unregister("lot_liens")
+
+    def ajouter(
+        self, nettoyees: pl.DataFrame, remplacer: bool = True
+    ) -> BilanNettoyage:
+        """
+        Ajoute à la base un lot d'annonces déjà nettoyées (sans doublon de lien).
+
+        ## Parameters:
+            nettoyees (pl.DataFrame): Annonces nettoyées par `gazoduc`.
+            remplacer (bool): Remplace les annonces déjà présentes. Si False, elles sont ignorées
+                (la première version de l'annonce est gardée, comme avec `supp_doublons`).
+
+        ## Returns:
+            BilanNettoyage: Nombre d'annonces ajoutées, remplacées et ignorées.
+        """
+        bilan = BilanNettoyage()
+        if nettoyees.height == 0:
+            return bilan
+        connues = self._liens_connus(nettoyees["lien"])
+        if remplacer:
+            self._retirer_des_parties(connues)
+            bilan.remplacees = connues.height
+        else:
+            nettoyees = nettoyees.filter(~pl.col("lien").is_in(connues["lien"]))
+            bilan.ignorees = connues.height
+        bilan.ajoutees = nettoyees.height - bilan.remplacees
+        if nettoyees.height == 0:
+            return bilan
+
+        index = self._ecrire_parties(nettoyees).to_arrow()
+        self.connexion.register("lot_index", index)
+        try:
+            # Une annonce remplacée change de partie : mise à jour de la ligne existante
+            self.connexion.execute(
+                """
+                INSERT INTO liens SELECT lien, partie FROM lot_index
+                ON CONFLICT (lien) DO UPDATE SET partie = excluded.partie
+                """
+            )
+        finally:
+            self.connexion.unregister("lot_index")
+        if self.parties_max is not None:
+            for marque in nettoyees["marque"].unique().sort():
+                if len(self.parties(marque)) > self.parties_max:
+                    self.compacter(marque)
+        return bilan
+
+    def compacter(self, marque: str | None = None) -> int:
+        """
+        Fusionne les parties d'une marque (ou de chaque marque) en une seule partie, pour que les lectures
+        n'ouvrent pas un fichier par lot intégré.
+
+        La nouvelle partie est écrite puis l'index mis à jour avant la suppression des anciennes parties.
+
+        ## Parameters:
+            marque (str | None): Marque à compacter. Toutes les marques si None.
+
+        ## Returns:
+            int: Nombre de parties supprimées.
+
+        ## Example(s):
+            >>> with BaseNettoyee("data/database") as base:
+            ...     base.compacter("PEUGEOT")
+            37
+        """
+        marques = (
+            [marque]
+            if marque is not None
+            else sorted(
+                {partie.parent.name.split("=", 1)[1] for partie in self.parties()}
+            )
+        )
+        supprimees = 0
+        for marque in marques:
+            anciennes = self.parties(marque)
+            if len(anciennes) < 2:
+                continue
+            numero = max(int(p.stem.split("-")[1]) for p in self.parties()) + 1
+            partie = f"marque={marque}/partie-{numero:06d}.parquet"
+            ecrire_partie(
+                pl.read_parquet(
+                    self.dossier / f"marque={marque}" / "partie-*.parquet",
+                    hive_partitioning=False,
+                ),
+                self.dossier / partie,
+            )
+            self.connexion.execute(
+                "UPDATE liens SET partie = ? WHERE partie IN (SELECT unnest(?))",
+                [partie, [p.relative_to(self.dossier).as_posix() for p in anciennes]],
+            )
+            for chemin in anciennes:
+                chemin.unlink()
+            supprimees += len(anciennes)
+        return supprimees
+
+    def supprimer(self, liens: list[str] | pl.Series) -> int:
+        """
+        Supprime des annonces de la base.
+
+        ## Parameters:
+            liens (list[str] | pl.Series): Liens des annonces à supprimer.
+
+        ## Returns:
+            int: Nombre d'annonces supprimées (les liens inconnus sont ignorés).
+        """
+        connues = self._liens_connus(pl.Series("lien", liens, dtype=pl.Utf8))
+        if connues.height == 0:
+            return 0
+        self._retirer_des_parties(connues)
+        self.connexion.register("lot_liens", connues.to_arrow())
+        try:
+            self.connexion.execute(
+                "DELETE FROM liens WHERE lien IN (SELECT lien FROM lot_liens)"
+            )
+        finally:
+            self.connexion.unregister("lot_liens")
+        return connues.height
+
+    def reconstruire_index(self) -> None:
+        """
+        Reconstruit l'index des liens à partir des parties Parquet (après une interruption pendant une mise à jour).
+        """
+        # L'index est reconstruit dans une nouvelle table, qui remplace ensuite l'ancienne
+        self.connexion.execute("DROP TABLE IF EXISTS liens_reconstruits")
+        self.connexion.execute(
+            "CREATE TABLE liens_reconstruits (lien VARCHAR PRIMARY KEY, partie VARCHAR NOT NULL)"
+        )
+        for partie in self.parties():
+            self.connexion.execute(
+                """
+                INSERT INTO liens_reconstruits SELECT lien, ? FROM read_parquet(?)
+                ON CONFLICT (lien) DO UPDATE SET partie = excluded.partie
+                """,
+                [partie.relative_to(self.dossier).as_posix(), str(partie)],
+            )
+        self.connexion.execute("BEGIN TRANSACTION")
+        self.connexion.execute("DROP TABLE liens")
+        self.connexion.execute("ALTER TABLE liens_reconstruits RENAME TO liens")
+        self.connexion.execute("COMMIT")
+
+    def fermer(self) -> None:
+        """
+        Ferme l'index DuckDB.
+        """
+        self.connexion.close()
+
+    def __enter__(self) -> "BaseNettoyee":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.fermer()
+
+
+def ecrire_partie(donnees: pl.DataFrame, chemin: Path) -> None:
+    """
+    Écrit une partie de la base, triée par modèle puis année, avec les statistiques des groupes de lignes
+    (fichier temporaire puis renommage).
+
+    ## Parameters:
+        donnees (pl.DataFrame): Annonces nettoyées d'une seule marque.
+        chemin (Path): Chemin de la partie.
+    """
+    chemin.parent.mkdir(parents=True, exist_ok=True)
+    chemin_temporaire = chemin.with_name(chemin.name + ".tmp")
+    donnees.sort(["modele", "annee"]).write_parquet(
+        chemin_temporaire, statistics=True, row_group_size=TAILLE_GROUPE
+    )
+    os.replace(chemin_temporaire, chemin)
+
+
+def lire_base(
+    dossier: str | Path = CHEMIN_BASE, marque: str | None = None
+) -> pl.LazyFrame:
+    """
+    Lit paresseusement la base nettoyée partitionnée, ou seulement la partition d'une marque.
+
+    ## Parameters:
+        dossier (str | Path): Dossier racine du jeu de données partitionné.
+        marque (str | None): Marque à lire. Toute la base si None.
+
+    ## Returns:
+        pl.LazyFrame: Annonces nettoyées.
+
+    ## Raises:
+        FileNotFoundError: Si la base (ou la partition) est vide.
+
+    ## Example(s):
+        >>> lire_base(marque="PORSCHE").filter(pl.col("modele") == "911").collect()
+    """
+    partition = "*" if marque is None else f"marque={marque}"
+    if not any(Path(dossier).glob(f"{partition}/partie-*.parquet")):
+        raise FileNotFoundError(f"La base {dossier} ({partition}) est vide.")
+    # La colonne marque est lue dans les fichiers : pas de colonne de partition en double
+    return pl.scan_parquet(
+        Path(dossier) / partition / "partie-*.parquet", hive_partitioning=False
+    )
+
+
+def exporter_base(
+    nettoyees: pl.DataFrame | pl.LazyFrame, dossier: str | Path = CHEMIN_BASE
+) -> None:
+    """
+    Écrit toute la base nettoyée (sortie de `gazoduc`) en jeu de données partitionné par marque, puis remplace
+    l'ancienne base. Avec un LazyFrame, une seule marque est en mémoire à la fois.
+
+    ## Parameters:
+        nettoyees (pl.DataFrame | pl.LazyFrame): Annonces nettoyées, sans doublon de lien.
+        dossier (str | Path): Dossier racine du jeu de données partitionné.
+
+    ## Example(s):
+        >>> exporter_base(gazoduc(charger_voitures("json/*.json"), nom_marques_modeles))
+        >>> duckdb.sql(f"SELECT AVG(prix) FROM {SOURCE_BASE} WHERE marque = 'PORSCHE'")
+    """
+    dossier = Path(dossier)
+    dossier_temporaire = dossier.with_name(dossier.name + ".tmp")
+    shutil.rmtree(dossier_temporaire, ignore_errors=True)
+    nettoyees = nettoyees.lazy()
+    marques = nettoyees.select(pl.col("marque").unique()).collect()["marque"]
+    for marque in marques.sort():
+        ecrire_partie(
+            nettoyees.filter(pl.col("marque") == marque).collect(),
+            dossier_temporaire / f"marque={marque}" / "partie-000001.parquet",
+        )
+    with BaseNettoyee(dossier_temporaire) as base:
+        base.reconstruire_index()
+    dossier_ancien = dossier.with_name(dossier.name + ".ancien")
+    if dossier.exists():
+        os.replace(dossier, dossier_ancien)
+    os.replace(dossier_temporaire, dossier)
+    shutil.rmtree(dossier_ancien, ignore_errors=True)
+
+
+def migrer_base(
+    chemin_parquet: str | Path = "data/database.parquet",
+    dossier: str | Path = CHEMIN_BASE,
+) -> None:
+    """
+    Convertit une ancienne base nettoyée monolithique (un seul fichier Parquet, sortie de `gazoduc`) en base
+    partitionnée par marque, avec son index des liens (voir `exporter_base`). Le fichier d'origine est gardé.
+
+    ## Parameters:
+        chemin_parquet (str | Path): Ancienne base monolithique.
+        dossier (str | Path): Dossier racine du jeu de données partitionné.
+
+    ## Raises:
+        FileNotFoundError: Si l'ancienne base n'existe pas.
+
+    ## Example(s):
+        >>> migrer_base("data/database.parquet", "data/database")
+    """
+    if not Path(chemin_parquet).is_file():
+        raise FileNotFoundError(f"La base {chemin_parquet} n'existe pas.")
+    exporter_base(pl.scan_parquet(chemin_parquet), dossier)
+
+
+def nettoyage_incremental(
+    nouvelles: pl.DataFrame | pl.LazyFrame,
+    nom_marques_modeles: pl.DataFrame,
+    base: BaseNettoyee,
+    remplacer: bool = True,
+    empreintes: IndexEmpreintes | None = None,
+) -> BilanNettoyage:
+    """
+    Nettoie uniquement un lot d'annonces brutes nouvelles ou modifiées et l'intègre à la base nettoyée.
+
+    ## Parameters:
+        nouvelles (pl.DataFrame | pl.LazyFrame): Annonces brutes du lot (colonnes de l'objet voiture).
+        nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et les modèles associés des véhicules.
+        base (BaseNettoyee): Base nettoyée à mettre à jour.
+        remplacer (bool): Remplace les annonces déjà présentes dans la base (sinon elles sont ignorées).
+        empreintes (IndexEmpreintes | None): Index des empreintes : les annonces remises en vente sous un
+            nouveau lien ne sont pas intégrées. Aucun dédoublonnage entre lots si None.
+
+    ## Returns:
+        BilanNettoyage: Nombre d'annonces ajoutées, remplacées, ignorées et écartées comme doublons.
+
+    ## Example(s):
+        >>> with BaseNettoyee("data/database") as base:
+        ...     nettoyage_incremental(charger_voitures("json/scraping_du_jour.ndjson"), nom_marques_modeles, base)
+        ... BilanNettoyage(ajoutees=1200, remplacees=310, ignorees=0, supprimees=0)
+    """
+    nettoyees = gazoduc(nouvelles, nom_marques_modeles)
+    if empreintes is None:
+        return base.ajouter(nettoyees, remplacer)
+    # Les empreintes ne sont enregistrées que si les annonces gardées ont bien été écrites dans la base
+    with empreintes.transaction():
+        gardees = empreintes.filtrer(nettoyees)
+        bilan = base.ajouter(gardees, remplacer)
+    bilan.doublons = nettoyees.height - gardees.height
+    return bilan
+
+
+def appliquer_delta(
+    chemin_delta: str | Path,
+    nom_marques_modeles: pl.DataFrame,
+    base: BaseNettoyee,
+    empreintes: IndexEmpreintes | None = None,
+) -> BilanNettoyage:
+    """
+    Applique à la base nettoyée un fichier delta produit par `scraping_incremental`.
+
+    Les ajouts et modifications sont nettoyés puis intégrés à la base, les suppressions en sont retirées.
+
+    ## Parameters:
+        chemin_delta (str | Path): Fichier delta NDJSON (`operation` : ajout, modification ou suppression).
+        nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et les modèles associés des véhicules.
+        base (BaseNettoyee): Base nettoyée à mettre à jour.
+        empreintes (IndexEmpreintes | None): Index des empreintes, mis à jour avec les ajouts et les suppressions.
+
+    ## Returns:
+        BilanNettoyage: Nombre d'annonces ajoutées, remplacées, supprimées et écartées comme doublons.
+    """
+    nouvelles, suppressions = [], []
+    with open(chemin_delta, "r", encoding="utf-8") as delta:
+        for ligne in delta:
+            if ligne.strip() == "":
+                continue
+            entree = json.loads(ligne)
+            if entree["operation"] == "suppression":
+                suppressions.append(entree["lien"])
+            else:
+                nouvelles.append(
+                    {colonne: entree[colonne] for colonne in COLONNES_VOITURE}
+                )
+    bilan = BilanNettoyage()
+    if nouvelles != []:
+        bilan = nettoyage_incremental(
+            pl.DataFrame(nouvelles, schema=SCHEMA_POLARS),
+            nom_marques_modeles,
+            base,
+            empreintes=empreintes,
+        )
+    bilan.supprimees = base.supprimer(suppressions)
+    if empreintes is not None:
+        empreintes.oublier(suppressions)
+    return bilan
+
+
+def get_empreintes_donnees(
+    marques: list[str], source: str = SOURCE_BASE
+) -> dict[str, str]:
+    """
+    Calcule l'empreinte des données de chaque marque (une seule requête, limitée aux partitions des marques).
+
+    ## Parameters:
+        marques (list[str]): Marques dont l'empreinte est calculée.
+        source (str): Source DuckDB de la base nettoyée.
+
+    ## Returns:
+        dict[str, str]: Marque -> empreinte MD5 de ses annonces.
+    """
+    if marques == []:
+        return {}
+    # Une valeur manquante est distinguée d'une chaîne vide
+    colonnes = ", ".join(
+        f"coalesce(CAST({colonne} AS VARCHAR), '\\N')"
+        for colonne in SCHEMA_NETTOYE
+        if colonne != "marque"
+    )
+    parametres = ", ".join("?" for _ in marques)
+    return dict(
+        duckdb.execute(
+            f"""
+            SELECT marque, md5(string_agg(md5(concat_ws('|', {colonnes})), ',' ORDER BY lien))
+            FROM {source}
+            WHERE marque IN ({parametres})
+            GROUP BY marque
+            """,
+            marques,
+        ).fetchall()
+    )
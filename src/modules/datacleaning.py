@@ -1,5 +1,9 @@
 import polars as pl
 import re
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from src.modules.validation import valider, marquer_rejets, separer_rejets
 
 
 def recup_marque_modele_generation(
@@ -46,12 +50,169 @@ def recup_marque_modele_generation(
     return None
 
 
+# Caractères spéciaux des expressions régulières : le motif d'un tel nom n'est pas une simple chaîne
+CARACTERES_REGEX = set(".^$*+?{}[]\\|()")
+
+
+@dataclass
+class ModeleIndexe:
+    modele: str
+    modele_espace: str
+    prefixe_generation: str
+    motif_seul: str
+
+
+@dataclass
+class MarqueIndexee:
+    marque: str
+    marque_espace: str
+    modeles: list[ModeleIndexe]
+    # Dernier mot du modèle -> positions des modèles (recherche de "MODELE " dans le nom)
+    modeles_par_dernier_mot: dict[str, list[int]]
+    # Modèle -> positions (recherche du modèle juste après la marque, en début de nom)
+    modeles_par_nom: dict[str, list[int]]
+    # Modèles toujours testés : nom vide ou motif contenant des caractères spéciaux
+    modeles_toujours: list[int]
+    longueur_max: int
+
+
+@dataclass
+class IndexMarques:
+    marques: list[MarqueIndexee]
+    # Dernier mot de la marque -> positions des marques (recherche de "MARQUE " dans le nom)
+    marques_par_dernier_mot: dict[str, list[int]]
+
+
+def _ajouter_position(index: dict[str, list[int]], cle: str, position: int) -> None:
+    index.setdefault(cle, []).append(position)
+
+
+def _indexer_modeles(marque: str, modeles: list[str]) -> MarqueIndexee:
+    indexees = []
+    par_dernier_mot: dict[str, list[int]] = {}
+    par_nom: dict[str, list[int]] = {}
+    toujours = []
+    for position, modele in enumerate(modeles):
+        modele = modele.upper()
+        indexees.append(
+            ModeleIndexe(
+                modele=modele,
+                modele_espace=modele + " ",
+                prefixe_generation=marque + " " + modele + " ",
+                motif_seul=f"{marque} {modele}(.*$)",
+            )
+        )
+        if modele == "" or CARACTERES_REGEX.intersection(marque + modele):
+            toujours.append(position)
+            continue
+        _ajouter_position(par_dernier_mot, modele.split(" ")[-1], position)
+        _ajouter_position(par_nom, modele, position)
+    return MarqueIndexee(
+        marque=marque,
+        marque_espace=marque + " ",
+        modeles=indexees,
+        modeles_par_dernier_mot=par_dernier_mot,
+        modeles_par_nom=par_nom,
+        modeles_toujours=toujours,
+        longueur_max=max((len(modele) for modele in par_nom), default=0),
+    )
+
+
+def indexer_marques_modeles(nom_marques_modeles: pl.DataFrame) -> IndexMarques:
+    """
+    Précalcule l'index des marques et des modèles utilisé par `resoudre_marque_modele_generation`.
+
+    Les marques et les modèles sont indexés par leur dernier mot : une chaîne "NOM " ne peut apparaître dans
+    le nom d'un véhicule que si son dernier mot termine un mot du nom. Les modèles sont aussi indexés par leur
+    nom complet, pour le cas où le modèle suit directement la marque. Chaque recherche ne teste donc que
+    quelques candidats, dans l'ordre du DataFrame : la première marque (puis le premier modèle) trouvée dans le
+    nom du véhicule l'emporte, exactement comme dans `recup_marque_modele_generation`.
+
+    ## Parameters:
+        nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et les modèles associés des véhicules.
+
+    ## Returns:
+        IndexMarques: Index des marques et de leurs modèles.
+    """
+    modeles_par_marque: dict[str, list[str]] = {}
+    for marque, modeles in nom_marques_modeles.select("marque", "modeles").iter_rows():
+        # Comme le filtre de `recup_marque_modele_generation`, seule la première ligne d'une marque compte
+        modeles_par_marque.setdefault(marque, modeles)
+    marques = [
+        _indexer_modeles(marque, modeles)
+        for marque, modeles in modeles_par_marque.items()
+    ]
+    par_dernier_mot: dict[str, list[int]] = {}
+    for position, marque in enumerate(marques):
+        _ajouter_position(par_dernier_mot, marque.marque.split(" ")[-1], position)
+    return IndexMarques(marques=marques, marques_par_dernier_mot=par_dernier_mot)
+
+
+def _candidats_dernier_mot(mots: list[str], index: dict[str, list[int]]) -> set[int]:
+    # Le premier mot d'une chaîne peut commencer au milieu d'un mot du nom : chaque suffixe est cherché
+    return {
+        position
+        for mot in mots
+        for debut in range(len(mot))
+        for position in index.get(mot[debut:], ())
+    }
+
+
+def resoudre_marque_modele_generation(
+    nom_vehicule: str, index: IndexMarques
+) -> tuple | None:
+    """
+    Récupère la marque, le modèle et la génération d'un nom de véhicule à partir d'un index précalculé.
+
+    Résultat identique à `recup_marque_modele_generation`, en ne testant que les marques et modèles candidats
+    trouvés dans l'index.
+
+    ## Parameters:
+        nom_vehicule (str): Nom du véhicule tel qu'il apparaît dans l'annonce.
+        index (IndexMarques): Index renvoyé par `indexer_marques_modeles`.
+
+    ## Returns:
+        tuple: Un tuple contenant la marque, le modèle et la génération du véhicule s'ils sont identifiés.
+
+    ## Example(s):
+        >>> index = indexer_marques_modeles(pl.DataFrame({"marque": ["CITROEN"], "modeles": [["C3"]]}))
+        >>> resoudre_marque_modele_generation("CITROEN C3 III", index)
+        ... ('CITROEN', 'C3', 'III')
+    """
+    # Seuls les mots suivis d'une espace peuvent terminer une chaîne "NOM "
+    mots = nom_vehicule.split(" ")[:-1]
+    for position_marque in sorted(
+        _candidats_dernier_mot(mots, index.marques_par_dernier_mot)
+    ):
+        marque = index.marques[position_marque]
+        if marque.marque_espace not in nom_vehicule:
+            continue
+        candidats = _candidats_dernier_mot(mots, marque.modeles_par_dernier_mot)
+        candidats.update(marque.modeles_toujours)
+        if nom_vehicule.startswith(marque.marque_espace):
+            suite = nom_vehicule[len(marque.marque_espace) :]
+            for longueur in range(1, min(len(suite), marque.longueur_max) + 1):
+                candidats.update(marque.modeles_par_nom.get(suite[:longueur], ()))
+        for position_modele in sorted(candidats):
+            modele = marque.modeles[position_modele]
+            if modele.modele_espace in nom_vehicule:
+                generation = nom_vehicule.replace(modele.prefixe_generation, "")
+                return (marque.marque, modele.modele, generation)
+            elif modele.modele in nom_vehicule:
+                if re.match(modele.motif_seul, nom_vehicule):
+                    return (marque.marque, modele.modele, "NA")
+    return None
+
+
 def get_marque_modele_generation(
     data: pl.DataFrame, nom_marques_modeles: pl.DataFrame
 ) -> pl.DataFrame:
     """
     Extrait les informations sur la marque, le modèle et la génération à partir des données fournies.
 
+    Chaque nom de véhicule distinct n'est analysé qu'une fois, avec un index des marques et modèles précalculé,
+    puis le résultat est rattaché à toutes les lignes par une jointure.
+
     ## Parameters:
         data (pl.DataFrame): DataFrame Polars contenant les caractéristiques des véhicules à traiter.
         nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et  les modèles associés des véhicules.
@@ -78,14 +239,67 @@ def get_marque_modele_generation(
         | MERCEDES  | 280    | SL 1971    |
 
     """
+    correspondances = get_correspondances_marques(
+        data["marque"].unique(maintain_order=True), nom_marques_modeles
+    )
+    return joindre_marque_modele_generation(data, correspondances)
+
+
+def get_correspondances_marques(
+    noms_vehicules: pl.Series, nom_marques_modeles: pl.DataFrame
+) -> pl.DataFrame:
+    """
+    Calcule la marque, le modèle et la génération de chaque nom de véhicule distinct.
+
+    ## Parameters:
+        noms_vehicules (pl.Series): Noms de véhicules distincts (colonne "marque" brute).
+        nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et les modèles associés des véhicules.
+
+    ## Returns:
+        pl.DataFrame: Table de correspondance avec les colonnes "nom_vehicule", "marque_resolue", "modele" et "generation".
+    """
+    index = indexer_marques_modeles(nom_marques_modeles)
+    resultats = [
+        resoudre_marque_modele_generation(nom_vehicule, index) or (None, None, None)
+        for nom_vehicule in noms_vehicules
+    ]
+    return pl.DataFrame(
+        {
+            "nom_vehicule": noms_vehicules,
+            "marque_resolue": [r[0] for r in resultats],
+            "modele": [r[1] for r in resultats],
+            "generation": [r[2] for r in resultats],
+        },
+        schema={
+            "nom_vehicule": noms_vehicules.dtype,
+            "marque_resolue": pl.Utf8,
+            "modele": pl.Utf8,
+            "generation": pl.Utf8,
+        },
+    )
+
+
+def joindre_marque_modele_generation(
+    data: pl.DataFrame | pl.LazyFrame, correspondances: pl.DataFrame
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Remplace la colonne "marque" brute par les colonnes "marque", "modele" et "generation" de la table de correspondance.
+
+    ## Parameters:
+        data (pl.DataFrame | pl.LazyFrame): Données contenant la colonne "marque" brute.
+        correspondances (pl.DataFrame): Table renvoyée par `get_correspondances_marques`.
+
+    ## Returns:
+        pl.DataFrame | pl.LazyFrame: Données avec la marque, le modèle et la génération, du même type que `data`.
+    """
+    if isinstance(data, pl.LazyFrame):
+        correspondances = correspondances.lazy()
     return (
-        data.with_columns(
-            data.select(pl.col("marque")).map_rows(
-                lambda row: recup_marque_modele_generation(row, nom_marques_modeles)
-            )
+        data.join(
+            correspondances, left_on="marque", right_on="nom_vehicule", how="left"
         )
         .drop("marque")
-        .rename({"column_0": "marque", "column_1": "modele", "column_2": "generation"})
+        .rename({"marque_resolue": "marque"})
     )
 
 
@@ -193,25 +407,37 @@ def split_cylindre(data: pl.DataFrame) -> pl.DataFrame:
         | "300ch 80kWh E-TECH 300"             | null       | null      | null      | null                | null        | "E-TECH"  | "300"       | "80kWh"        | null     | "300ch"    | "80kWh"          | "E-TECH"   |
 
     """
-    MOTIF1 = r"(?P<cylindre>\d+\.\d+)\s+(?:(?P<moteur>[\w-]+)\s+)?(?P<puissance>\d+)\s+(?P<finition>\w+.*)"
-    MOTIF2 = r"(?P<cylindre>\d+\.\d+)\s+(?P<puissance>\d+)"
-    MOTIF3 = r"(?P<cylindre>\d+\.\d+)\s+(?P<moteur>[\w-]+)\s+?(?P<puissance>\d+)"
-    MOTIF_ELEC = r"(?P<puissance>\d+ch)\s+(?P<batterie>\d+kWh)\s+(?P<finition>\w+.*)"
-    MOTIF_ELEC2 = r"(?P<puissance>\d+ch)\s+(?P<batterie>\d+kWh+)"
     MOTIF_CYLINDRE = r"(?P<cylindre>\d+\.\d+)"
-    return data.with_columns(
-        pl.col("cylindre").str.extract(MOTIF_CYLINDRE, 1).alias("cylindre_2"),
-        pl.col("cylindre").str.extract(MOTIF1, 2).alias("moteur"),
-        pl.col("cylindre").str.extract(MOTIF1, 3).alias("puissance"),
-        pl.col("cylindre").str.extract(MOTIF1, 4).alias("finition"),
-        pl.col("cylindre").str.extract(MOTIF2, 2).alias("puissance_2"),
-        pl.col("cylindre").str.extract(MOTIF3, 2).alias("moteur_2"),
-        pl.col("cylindre").str.extract(MOTIF3, 3).alias("puissance_3"),
-        pl.col("cylindre").str.extract(MOTIF_ELEC, 1).alias("puissance_elec"),
-        pl.col("cylindre").str.extract(MOTIF_ELEC, 2).alias("batterie"),
-        pl.col("cylindre").str.extract(MOTIF_ELEC, 3).alias("finition_2"),
-        pl.col("cylindre").str.extract(MOTIF_ELEC2, 1).alias("puissance_elec_2"),
-        pl.col("cylindre").str.extract(MOTIF_ELEC2, 2).alias("batterie_2"),
+    # Chaque motif n'est appliqué qu'une fois : ses groupes sont extraits ensemble dans une structure
+    motifs = {
+        "motif1": r"(?P<cylindre>\d+\.\d+)\s+(?:(?P<moteur>[\w-]+)\s+)?(?P<puissance>\d+)\s+(?P<finition>\w+.*)",
+        "motif2": r"(?P<cylindre>\d+\.\d+)\s+(?P<puissance>\d+)",
+        "motif3": r"(?P<cylindre>\d+\.\d+)\s+(?P<moteur>[\w-]+)\s+?(?P<puissance>\d+)",
+        "motif_elec": r"(?P<puissance>\d+ch)\s+(?P<batterie>\d+kWh)\s+(?P<finition>\w+.*)",
+        "motif_elec2": r"(?P<puissance>\d+ch)\s+(?P<batterie>\d+kWh+)",
+    }
+    return (
+        data.with_columns(
+            pl.col("cylindre").str.extract(MOTIF_CYLINDRE, 1).alias("cylindre_2"),
+            *[
+                pl.col("cylindre").str.extract_groups(motif).alias(nom)
+                for nom, motif in motifs.items()
+            ],
+        )
+        .with_columns(
+            pl.col("motif1").struct.field("moteur").alias("moteur"),
+            pl.col("motif1").struct.field("puissance").alias("puissance"),
+            pl.col("motif1").struct.field("finition").alias("finition"),
+            pl.col("motif2").struct.field("puissance").alias("puissance_2"),
+            pl.col("motif3").struct.field("moteur").alias("moteur_2"),
+            pl.col("motif3").struct.field("puissance").alias("puissance_3"),
+            pl.col("motif_elec").struct.field("puissance").alias("puissance_elec"),
+            pl.col("motif_elec").struct.field("batterie").alias("batterie"),
+            pl.col("motif_elec").struct.field("finition").alias("finition_2"),
+            pl.col("motif_elec2").struct.field("puissance").alias("puissance_elec_2"),
+            pl.col("motif_elec2").struct.field("batterie").alias("batterie_2"),
+        )
+        .drop(list(motifs))
     )
 
 
@@ -243,49 +469,19 @@ def clean_cylindre(data: pl.DataFrame) -> pl.DataFrame:
         | null     | null      | "320ch"   | null                | "75kWh"  |
         | null     | null      | "300ch"   | "E-TECH"            | "80kWh"  |
     """
+    # Toutes les colonnes sont complétées dans une seule projection
     return (
         data.with_columns(
-            pl.when(pl.col("puissance").is_null())
-            .then(pl.col("puissance_2"))
-            .otherwise(pl.col("puissance"))
-            .alias("puissance")
-        )
-        .with_columns(
-            pl.when(pl.col("puissance").is_null())
-            .then(pl.col("puissance_3"))
-            .otherwise(pl.col("puissance"))
-            .alias("puissance")
-        )
-        .with_columns(
-            pl.when(pl.col("puissance").is_null())
-            .then(pl.col("puissance_elec"))
-            .otherwise(pl.col("puissance"))
-            .alias("puissance")
-        )
-        .with_columns(
-            pl.when(pl.col("puissance").is_null())
-            .then(pl.col("puissance_elec_2"))
-            .otherwise(pl.col("puissance"))
-            .alias("puissance")
-        )
-        .with_columns(
-            pl.when(pl.col("finition").is_null())
-            .then(pl.col("finition_2"))
-            .otherwise(pl.col("finition"))
-            .alias("finition")
-        )
-        .drop(["cylindre", "puissance_2", "finition_2", "puissance_elec"])
-        .with_columns(
-            pl.when(pl.col("batterie").is_null())
-            .then(pl.col("batterie_2"))
-            .otherwise(pl.col("batterie"))
-            .alias("batterie")
-        )
-        .with_columns(
-            pl.when(pl.col("moteur").is_null())
-            .then(pl.col("moteur_2"))
-            .otherwise(pl.col("moteur"))
-            .alias("moteur")
+            pl.coalesce(
+                "puissance",
+                "puissance_2",
+                "puissance_3",
+                "puissance_elec",
+                "puissance_elec_2",
+            ).alias("puissance"),
+            pl.coalesce("finition", "finition_2").alias("finition"),
+            pl.coalesce("batterie", "batterie_2").alias("batterie"),
+            pl.coalesce("moteur", "moteur_2").alias("moteur"),
         )
         .drop(
             [
@@ -453,7 +649,11 @@ def supp_na(data: pl.DataFrame) -> pl.DataFrame:
     return data.drop_nulls(subset="marque")
 
 
-def gazoduc(data: pl.DataFrame, nom_marques_modeles: pl.DataFrame) -> pl.DataFrame:
+def gazoduc(
+    data: pl.DataFrame | pl.LazyFrame,
+    nom_marques_modeles: pl.DataFrame,
+    chemin_rejets: str | Path | None = None,
+) -> pl.DataFrame:
     """
     Applique un pipeline de traitement de données sur le DataFrame donné en utilisant plusieurs fonctions :
 
@@ -461,23 +661,150 @@ def gazoduc(data: pl.DataFrame, nom_marques_modeles: pl.DataFrame) -> pl.DataFra
     2. Conversion et extraction des informations sur le kilométrage, le prix et l'année.
     3. Traitement des données de garantie.
     4. Extraction et mise en forme des données sur les cylindres.
-    5. Filtrage des données basé sur des critères spécifiques.
-    6. Suppression des doublons.
-    7. Suppression des lignes ayant des valeurs manquantes dans la colonne 'marque'.
+    5. Suppression des doublons.
+    6. Validation du schéma et des valeurs (module `validation`) : lignes sans marque ou sans puissance, énergie
+       en erreur, année 2024 avec plus de 50 000 km, et valeurs hors des bornes de prix, kilométrage, année et
+       puissance. Les lignes rejetées sont enregistrées.
 
     ## Parameters:
-        data (pl.DataFrame): DataFrame Polars contenant les caractéristiques des véhicules à traiter.
+        data (pl.DataFrame | pl.LazyFrame): DataFrame Polars contenant les caractéristiques des véhicules à traiter,
+            ou LazyFrame (par exemple `lire_voitures_parquet`) lu directement depuis les fichiers.
         nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et les modèles associés des véhicules.
+        chemin_rejets (str | Path | None): Fichier Parquet des lignes rejetées par la validation, avec leurs motifs.
+            Les rejets ne sont pas enregistrés si None.
 
     ## Returns:
         pl.DataFrame: DataFrame Polars suite au traitement de pipeline, après avoir appliqué plusieurs étapes de transformation et de nettoyage.
+
+    ## Raises:
+        ErreurSchema: Si les données converties ne respectent pas le schéma déclaré (colonne absente ou d'un autre type).
     """
+    if isinstance(data, pl.LazyFrame):
+        if chemin_rejets is None:
+            return gazoduc_lazy(data, nom_marques_modeles).collect(streaming=True)
+        # Une seule exécution du pipeline, lignes valides et rejetées séparées ensuite
+        valides, rejets = separer_rejets(
+            gazoduc_lazy(data, nom_marques_modeles, avec_rejets=True).collect(
+                streaming=True
+            )
+        )
+        rejets.write_parquet(chemin_rejets)
+        return valides
     return (
         data.pipe(get_marque_modele_generation, nom_marques_modeles)
         .pipe(get_km_prix_annee)
         .pipe(get_garantie)
         .pipe(get_cylindre)
-        .pipe(filter_data)
         .pipe(supp_doublons)
-        .pipe(supp_na)
+        .pipe(valider, chemin_rejets)
+    )
+
+
+def gazoduc_lazy(
+    data: pl.LazyFrame | pl.DataFrame,
+    nom_marques_modeles: pl.DataFrame,
+    avec_rejets: bool = False,
+) -> pl.LazyFrame:
+    """
+    Construit le pipeline de `gazoduc` sous forme de LazyFrame, sans rien calculer.
+
+    Toutes les étapes de `gazoduc` sont des expressions Polars : l'optimiseur fusionne les extractions
+    du cylindre et ne lit que les colonnes utiles. Seuls les noms de véhicules distincts sont lus au
+    préalable pour calculer la table des marques et modèles.
+
+    ## Parameters:
+        data (pl.LazyFrame | pl.DataFrame): Voitures brutes (par exemple `charger_voitures` ou `pl.scan_parquet`).
+        nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et les modèles associés des véhicules.
+        avec_rejets (bool): Si True, les lignes rejetées par la validation sont gardées avec la colonne "motifs"
+            (`marquer_rejets`), à séparer des lignes valides avec `separer_rejets` après l'exécution.
+
+    ## Returns:
+        pl.LazyFrame: Le pipeline de nettoyage, à exécuter avec `collect(streaming=True)`.
+
+    ## Example(s):
+        >>> gazoduc_lazy(pl.scan_parquet("data/brut/*.parquet"), nom_marques_modeles).collect(streaming=True)
+    """
+    data = data.lazy()
+    noms_vehicules = data.select(pl.col("marque").unique()).collect(streaming=True)
+    correspondances = get_correspondances_marques(
+        noms_vehicules["marque"], nom_marques_modeles
+    )
+    return (
+        data.pipe(joindre_marque_modele_generation, correspondances)
+        .pipe(get_km_prix_annee)
+        .pipe(get_garantie)
+        .pipe(get_cylindre)
+        .pipe(supp_doublons)
+        .pipe(marquer_rejets if avec_rejets else valider)
     )
+
+
+def gazoduc_vers_parquet(
+    data: pl.LazyFrame,
+    nom_marques_modeles: pl.DataFrame,
+    chemin_sortie: str | Path,
+    chemin_rejets: str | Path | None = None,
+) -> None:
+    """
+    Nettoie des voitures brutes et écrit le résultat dans un fichier Parquet en mémoire bornée.
+
+    Le pipeline est exécuté en deux passes par le moteur streaming de Polars :
+
+    1. Étapes ligne à ligne de `gazoduc` (marques, conversions, cylindre), écrites dans un fichier
+       temporaire avec le numéro de ligne d'origine.
+    2. Suppression des doublons sur "lien" (première occurrence gardée, comme `supp_doublons`), remise
+       dans l'ordre d'origine, puis validation, écrites dans le fichier de sortie. Si `chemin_rejets` est
+       donné, les lignes marquées par `marquer_rejets` sont écrites dans un second fichier temporaire,
+       relu pour écrire séparément les lignes valides et les lignes rejetées.
+
+    Le résultat est identique à celui de `gazoduc`. Si le plan ne peut pas être exécuté en streaming
+    (source qui n'est pas une lecture directe de fichiers), le résultat est calculé en mémoire.
+
+    ## Parameters:
+        data (pl.LazyFrame): Voitures brutes, idéalement `pl.scan_parquet` ou `pl.scan_ndjson`.
+        nom_marques_modeles (pl.DataFrame): DataFrame Polars contenant la liste des marques et les modèles associés des véhicules.
+        chemin_sortie (str | Path): Chemin du fichier Parquet nettoyé.
+        chemin_rejets (str | Path | None): Fichier Parquet des lignes rejetées par la validation, avec leurs motifs.
+
+    ## Example(s):
+        >>> gazoduc_vers_parquet(pl.scan_parquet("data/brut/*.parquet"), nom_marques_modeles, "data/database.parquet")
+    """
+    chemin_sortie = Path(chemin_sortie)
+    noms_vehicules = data.select(pl.col("marque").unique()).collect(streaming=True)
+    correspondances = get_correspondances_marques(
+        noms_vehicules["marque"], nom_marques_modeles
+    )
+    lignes = (
+        data.with_row_index("ordre_origine")
+        .pipe(joindre_marque_modele_generation, correspondances)
+        .pipe(get_km_prix_annee)
+        .pipe(get_garantie)
+        .pipe(get_cylindre)
+    )
+    with tempfile.TemporaryDirectory(dir=chemin_sortie.parent) as dossier:
+        chemin_lignes = Path(dossier) / "lignes.parquet"
+        try:
+            # Toutes les colonnes brutes sont utilisées : la projection à la lecture, incompatible avec
+            # le numéro de ligne dans le moteur streaming de Polars 0.20, est désactivée
+            lignes.sink_parquet(chemin_lignes, projection_pushdown=False)
+        except pl.InvalidOperationError:
+            gazoduc(data, nom_marques_modeles, chemin_rejets).write_parquet(
+                chemin_sortie
+            )
+            return None
+        lignes = pl.scan_parquet(chemin_lignes)
+        premieres = lignes.group_by("lien").agg(pl.col("ordre_origine").min())
+        dedoublonnees = (
+            lignes.join(premieres, on=["lien", "ordre_origine"], how="inner")
+            .sort("ordre_origine")
+            .drop("ordre_origine")
+        )
+        if chemin_rejets is None:
+            dedoublonnees.pipe(valider).sink_parquet(chemin_sortie)
+            return None
+        chemin_marquees = Path(dossier) / "marquees.parquet"
+        dedoublonnees.pipe(marquer_rejets).sink_parquet(chemin_marquees)
+        valides, rejets = separer_rejets(pl.scan_parquet(chemin_marquees))
+        valides.sink_parquet(chemin_sortie)
+        rejets.sink_parquet(chemin_rejets)
+    return None
@@ -0,0 +1,193 @@
+"""
+Module de dédoublonnage des annonces d'un scraping à l'autre.
+
+`supp_doublons` ne supprime que les annonces ayant le même lien dans un même DataFrame. Une voiture
+remise en vente sous un nouveau lien n'est pas détectée. Ce module garde un index DuckDB sur disque
+des empreintes des annonces déjà intégrées : l'empreinte (MD5, stable d'une version à l'autre des
+bibliothèques) est calculée sur la marque, le modèle, l'année, le kilométrage, la puissance et le prix
+normalisés.
+
+Chaque nouveau lot est comparé à l'index sans recharger l'historique : une annonce dont l'empreinte est
+déjà connue sous un autre lien est un doublon. Une annonce déjà connue sous le même lien (annonce
+modifiée ou revue) n'en est pas un.
+"""
+
+import time
+from contextlib import contextmanager
+from pathlib import Path
+import duckdb
+import polars as pl
+
+
+COLONNES_EMPREINTE = ["marque", "modele", "annee", "kilometrage", "puissance", "prix"]
+
+
+def cle_empreinte() -> pl.Expr:
+    """
+    Renvoie l'expression de la clé normalisée d'une annonce nettoyée : textes en majuscules sans espaces
+    superflus, nombres entiers, valeurs manquantes vides, séparés par "|".
+    """
+    return pl.concat_str(
+        [
+            pl.col(colonne)
+            .cast(pl.Utf8)
+            .str.strip_chars()
+            .str.to_uppercase()
+            .fill_null("")
+            for colonne in COLONNES_EMPREINTE
+        ],
+        separator="|",
+    )
+
+
+class IndexEmpreintes:
+    """
+    Index des empreintes des annonces déjà intégrées, enregistré dans une base DuckDB.
+
+    ## Example(s):
+        >>> with IndexEmpreintes("data/empreintes.duckdb") as empreintes:
+        ...     with empreintes.transaction():
+        ...         nouvelles = empreintes.filtrer(gazoduc(lot, nom_marques_modeles))
+        ...         base.ajouter(nouvelles)
+    """
+
+    def __init__(self, chemin: str | Path) -> None:
+        """
+        ## Parameters:
+            chemin (str | Path): Fichier DuckDB de l'index.
+        """
+        self.chemin = Path(chemin)
+        self.connexion = duckdb.connect(str(self.chemin))
+        self._transactions = 0
+        self.connexion.execute(
+            """
+            CREATE TABLE IF NOT EXISTS empreintes (
+                empreinte VARCHAR PRIMARY KEY,
+                lien VARCHAR NOT NULL,
+                premiere_vue VARCHAR NOT NULL
+            )
+            """
+        )
+
+    def __len__(self) -> int:
+        return self.connexion.execute("SELECT count(*) FROM empreintes").fetchone()[0]
+
+    @contextmanager
+    def transaction(self):
+        """
+        Regroupe les mises à jour de l'index dans une transaction : elles ne sont enregistrées qu'à la sortie
+        du bloc, et annulées si le bloc lève une exception (par exemple si l'écriture des annonces gardées
+        dans la base échoue). Les transactions imbriquées font partie de la transaction englobante.
+        """
+        if self._transactions == 0:
+            self.connexion.execute("BEGIN TRANSACTION")
+        self._transactions += 1
+        try:
+            yield self
+        except BaseException:
+            self._transactions -= 1
+            if self._transactions == 0:
+                self.connexion.execute("ROLLBACK")
+            raise
+        self._transactions -= 1
+        if self._transactions == 0:
+            self.connexion.execute("COMMIT")
+
+    def filtrer(self, nettoyees: pl.DataFrame, date: str | None = None) -> pl.DataFrame:
+        """
+        Retire d'un lot d'annonces nettoyées les doublons d'annonces déjà intégrées (ou d'une annonce
+        précédente du lot), puis enregistre les empreintes des annonces gardées.
+
+        Appelée dans un bloc `transaction()`, les empreintes ne sont enregistrées qu'à la fin du bloc.
+
+        ## Parameters:
+            nettoyees (pl.DataFrame): Annonces nettoyées par `gazoduc`.
+            date (str | None): Date d'intégration (AAAA-MM-JJ). Date du jour si None.
+
+        ## Returns:
+            pl.DataFrame: Les annonces gardées, dans l'ordre du lot.
+        """
+        if nettoyees.height == 0:
+            return nettoyees
+        if date is None:
+            date = time.strftime("%Y-%m-%d")
+        lot = nettoyees.select(
+            pl.int_range(0, pl.len(), dtype=pl.UInt32).alias("position"),
+            "lien",
+            cle_empreinte().alias("cle"),
+        ).to_arrow()
+        self.connexion.register("lot_empreintes", lot)
+        try:
+            with self.transaction():
+                self.connexion.execute(
+                    """
+                    CREATE OR REPLACE TEMPORARY TABLE gardees AS
+                    SELECT position, lien, md5(cle) AS empreinte
+                    FROM lot_empreintes AS l
+                    WHERE NOT EXISTS (
+                        SELECT 1 FROM empreintes AS e
+                        WHERE e.empreinte = md5(l.cle) AND e.lien <> l.lien
+                    )
+                    QUALIFY row_number() OVER (PARTITION BY md5(cle) ORDER BY position) = 1
+                    """
+                )
+                # L'ancienne empreinte d'une annonce modifiée est remplacée par la nouvelle ; une empreinte
+                # déjà connue sous le même lien garde sa date de première vue
+                self.connexion.execute(
+                    """
+                    DELETE FROM empreintes
+                    WHERE lien IN (SELECT lien FROM gardees)
+                    AND empreinte NOT IN (SELECT empreinte FROM gardees)
+                    """
+                )
+                self.connexion.execute(
+                    """
+                    INSERT INTO empreintes SELECT empreinte, lien, ? FROM gardees
+                    ON CONFLICT (empreinte) DO UPDATE SET lien = excluded.lien
+                    """,
+                    [date],
+                )
+                positions = self.connexion.execute(
+                    "SELECT position FROM gardees ORDER BY position"
+                ).fetchall()
+        finally:
+            self.connexion.unregister("lot_empreintes")
+        gardees = pl.Series([position for (position,) in positions], dtype=pl.UInt32)
+        return nettoyees.filter(
+            pl.int_range(0, pl.len(), dtype=pl.UInt32).is_in(gardees)
+        )
+
+    def oublier(self, liens: list[str] | pl.Series) -> int:
+        """
+        Retire de l'index les empreintes d'annonces supprimées : une remise en vente ne sera plus un doublon.
+
+        ## Parameters:
+            liens (list[str] | pl.Series): Liens des annonces supprimées.
+
+        ## Returns:
+            int: Nombre d'empreintes retirées.
+        """
+        avant = len(self)
+        self.connexion.register(
+            "liens_oublies",
+            pl.DataFrame({"lien": pl.Series(liens, dtype=pl.Utf8)}).to_arrow(),
+        )
+        try:
+            self.connexion.execute(
+                "DELETE FROM empreintes WHERE lien IN (SELECT lien FROM liens_oublies)"
+            )
+        finally:
+            self.connexion.unregister("liens_oublies")
+        return avant - len(self)
+
+    def fermer(self) -> None:
+        """
+        Ferme l'index DuckDB.
+        """
+        self.connexion.close()
+
+    def __enter__(self) -> "IndexEmpreintes":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.fermer()
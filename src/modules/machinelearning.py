@@ -4,24 +4,68 @@ Module de prédiction de prix de véhicules.
 Ce module contient des fonctions pour l'entraînement de modèles de régression, la prédiction des prix de véhicules,
 et la gestion des modèles sauvegardés.
 
+Les marques sont entraînées en parallèle dans des pools de processus (`get_all_models`) : les plus grosses marques
+d'abord, avec plus de threads chacune, chaque processus limitant ses propres threads (`n_jobs` des recherches sur
+grille et des bibliothèques de calcul) pour ne pas dépasser le nombre de cœurs.
 """
 
+import hashlib
+import io
+import tempfile
+import threading
+import time
+import traceback
 import polars as pl
 import pandas as pd
 import numpy as np
 import warnings
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from dataclasses import dataclass
 from sklearn.linear_model import LinearRegression
 from sklearn.neighbors import KNeighborsRegressor
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import GridSearchCV
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+from sklearn.model_selection import HalvingGridSearchCV
 from sklearn.metrics import mean_absolute_error
 from sklearn.pipeline import Pipeline
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
-from joblib import dump
+from joblib import Parallel, cpu_count, delayed, parallel_backend
+from joblib import hash as hash_joblib
 import duckdb
-from src.modules.app.import_mm import import_marques_modeles
+from src.modules.base_donnees import SOURCE_BASE, get_empreintes_donnees
+from src.modules.registre import CHEMIN_REGISTRE, publier_modele
+
+
+NOMBRE_MARQUES = 40
+RECHERCHES = ["grille", "halving"]
+# Ressource des recherches par divisions successives (défaut : nombre d'observations)
+RESSOURCES_HALVING = {"RandomForest": "n_estimators"}
+# Nombre minimal d'observations de la première itération quand la ressource est le nombre d'observations
+OBSERVATIONS_MIN_HALVING = 100
+
+
+@dataclass
+class ResultatEntrainement:
+    marque: str
+    lignes: int
+    modele: str | None = None
+    mae: float | None = None
+    version: str | None = None
+    duree: float = 0.0
+    journal: str = ""
+    erreur: str | None = None
+
+
+@dataclass
+class LotEntrainement:
+    marques: list[str]
+    n_workers: int
+    n_jobs: int
 
 
 def split_data(
@@ -104,10 +148,113 @@ def get_preprocessor() -> ColumnTransformer:
     )
 
 
-def set_models() -> tuple[dict, dict]:
+class MemoirePreprocesseurs:
+    """
+    Cache en mémoire des préprocesseurs ajustés, utilisable comme `memory` d'un pipeline scikit-learn
+    (même interface `cache` que `joblib.Memory`).
+
+    Un préprocesseur ajusté est réutilisé lorsque ses paramètres et ses données d'entraînement sont identiques,
+    comme les plis d'une validation croisée d'une combinaison de paramètres à l'autre. Les données sont
+    identifiées par `pd.util.hash_pandas_object`, bien plus rapide que le hachage de `joblib.Memory` sur des
+    colonnes de texte, et rien n'est écrit sur disque.
+
+    Le cache est propre au processus : il n'est pas copié avec le pipeline vers les processus d'une recherche
+    parallèle (voir `find_best_model`, qui utilise alors `joblib.Memory`). Au-delà de `taille_max` résultats,
+    les moins récemment utilisés sont retirés.
+
+    ## Example(s):
+        >>> memoire = MemoirePreprocesseurs()
+        >>> GridSearchCV(get_pipeline(KNeighborsRegressor(), memoire=memoire), grille, cv=5).fit(X_train, y_train)
+    """
+
+    def __init__(self, taille_max: int = 32) -> None:
+        """
+        ## Parameters:
+            taille_max (int): Nombre maximal de préprocesseurs ajustés gardés en mémoire.
+        """
+        self.taille_max = taille_max
+        self.resultats: OrderedDict[str, tuple] = OrderedDict()
+        self.verrou = threading.Lock()
+
+    def __deepcopy__(self, memo: dict) -> "MemoirePreprocesseurs":
+        # `clone` copie les paramètres des pipelines : le cache doit rester partagé
+        return self
+
+    def __getstate__(self) -> dict:
+        # Un processus qui reçoit le pipeline démarre avec un cache vide : les résultats ne sont pas copiés
+        return {"taille_max": self.taille_max}
+
+    def __setstate__(self, etat: dict) -> None:
+        self.__init__(etat["taille_max"])
+
+    def cache(self, fonction):
+        """
+        Renvoie `fonction` (`_fit_transform_one` du pipeline) avec ses résultats mis en cache.
+        """
+
+        def fonction_en_cache(transformer, X, y, *args, **kwargs):
+            empreinte = hashlib.md5(
+                pd.util.hash_pandas_object(X, index=True).to_numpy().tobytes()
+            )
+            empreinte.update(repr(list(X.columns)).encode())
+            empreinte.update(
+                hash_joblib((transformer.get_params(), y, args, kwargs)).encode()
+            )
+            cle = empreinte.hexdigest()
+            with self.verrou:
+                resultat = self.resultats.get(cle)
+                if resultat is not None:
+                    self.resultats.move_to_end(cle)
+            if resultat is None:
+                resultat = fonction(transformer, X, y, *args, **kwargs)
+                with self.verrou:
+                    self.resultats[cle] = resultat
+                    while len(self.resultats) > self.taille_max:
+                        self.resultats.popitem(last=False)
+            return resultat
+
+        return fonction_en_cache
+
+
+def get_pipeline(
+    model: LinearRegression | KNeighborsRegressor | RandomForestRegressor,
+    preprocessor: ColumnTransformer | None = None,
+    memoire: MemoirePreprocesseurs | str | None = None,
+) -> Pipeline:
+    """
+    Retourne un pipeline scikit-learn enchaînant le préprocesseur et le modèle de régression.
+
+    Avec `memoire`, le préprocesseur ajusté est mis en cache : dans une validation croisée, il n'est ajusté qu'une
+    fois par pli, puis réutilisé par toutes les combinaisons de paramètres et tous les modèles.
+
+    ## Parameters:
+        model (LinearRegression | KNeighborsRegressor | RandomForestRegressor): Modèle de régression (étape "model").
+        preprocessor (ColumnTransformer | None): Préprocesseur (étape "preprocessor"). `get_preprocessor()` si None.
+        memoire (MemoirePreprocesseurs | str | None): Cache des préprocesseurs ajustés, en mémoire ou dans un dossier
+            (`joblib.Memory`). Pas de cache si None.
+
+    ## Returns:
+        Pipeline: Le pipeline préprocesseur + modèle.
+
+    ## Example(s):
+        >>> memoire = MemoirePreprocesseurs()
+        >>> pipeline = get_pipeline(KNeighborsRegressor(), memoire=memoire).fit(X_train, y_train)
+    """
+    if preprocessor is None:
+        preprocessor = get_preprocessor()
+    return Pipeline(
+        steps=[("preprocessor", clone(preprocessor)), ("model", model)], memory=memoire
+    )
+
+
+def set_models(n_jobs: int | None = -1) -> tuple[dict, dict]:
     """
     Définit les modèles de régression et les grilles de paramètres associées pour la recherche sur grille.
 
+    ## Parameters:
+        n_jobs (int | None): Nombre de threads de la forêt aléatoire (-1 : tous les cœurs). Mettre 1 lorsque
+            la recherche sur grille est elle-même parallèle.
+
     ## Returns:
         tuple[dict, dict]: Un tuple contenant un dictionnaire de modèles (models) et un dictionnaire de grilles de paramètres (param_grids).
 
@@ -136,7 +283,7 @@ def set_models() -> tuple[dict, dict]:
     models = {
         "LinearRegression": LinearRegression(),
         "KNeighbors": KNeighborsRegressor(),
-        "RandomForest": RandomForestRegressor(n_jobs=-1),
+        "RandomForest": RandomForestRegressor(n_jobs=n_jobs),
     }
 
     param_grids = {
@@ -155,6 +302,72 @@ def set_models() -> tuple[dict, dict]:
     return models, param_grids
 
 
+def get_recherche(
+    pipeline: Pipeline,
+    param_grid: dict,
+    model_name: str,
+    recherche: str = "grille",
+    n_jobs: int | None = None,
+    nombre_observations: int | None = None,
+) -> GridSearchCV | HalvingGridSearchCV:
+    """
+    Retourne la recherche d'hyperparamètres (validation croisée à 5 plis) d'un pipeline préprocesseur + modèle.
+
+    - "grille" : toutes les combinaisons sont évaluées avec toutes les données (`GridSearchCV`).
+    - "halving" : divisions successives (`HalvingGridSearchCV`, facteur 3). Toutes les combinaisons sont d'abord
+      évaluées avec peu de ressources, puis seul le meilleur tiers passe à l'itération suivante avec trois fois
+      plus de ressources. La ressource est le nombre d'arbres pour la forêt aléatoire (`RESSOURCES_HALVING`),
+      jusqu'au maximum de sa grille, et le nombre d'observations pour les autres modèles. Une grille d'une seule
+      combinaison, ou une marque dont la première itération aurait moins de `OBSERVATIONS_MIN_HALVING`
+      observations, est évaluée comme avec "grille".
+
+    ## Parameters:
+        pipeline (Pipeline): Pipeline préprocesseur + modèle (`get_pipeline`).
+        param_grid (dict): Grille de paramètres du modèle (sans le préfixe de l'étape du pipeline).
+        model_name (str): Nom du modèle (clé de `set_models`).
+        recherche (str): "grille" ou "halving".
+        n_jobs (int | None): Nombre de combinaisons évaluées en parallèle (None : une à la fois).
+        nombre_observations (int | None): Nombre d'observations de X_train (None : non limité).
+
+    ## Returns:
+        GridSearchCV | HalvingGridSearchCV: La recherche, à ajuster sur X_train.
+
+    ## Raises:
+        ValueError: Si la recherche est inconnue.
+    """
+    if recherche not in RECHERCHES:
+        raise ValueError(f"Recherche inconnue : {recherche} (attendu : {RECHERCHES}).")
+    grille = {f"model__{param}": valeurs for param, valeurs in param_grid.items()}
+    nombre_combinaisons = int(np.prod([len(valeurs) for valeurs in grille.values()]))
+    if recherche == "grille" or nombre_combinaisons <= 1:
+        return GridSearchCV(pipeline, grille, cv=5, n_jobs=n_jobs, refit=False)
+    ressource = RESSOURCES_HALVING.get(model_name)
+    if ressource is None:
+        # Une combinaison sur trois est gardée à chaque itération, la dernière utilisant toutes les observations
+        iterations = 1 + int(np.floor(np.log(nombre_combinaisons) / np.log(3)))
+        if (
+            nombre_observations is not None
+            and nombre_observations // 3 ** (iterations - 1) < OBSERVATIONS_MIN_HALVING
+        ):
+            return GridSearchCV(pipeline, grille, cv=5, n_jobs=n_jobs, refit=False)
+        return HalvingGridSearchCV(
+            pipeline, grille, factor=3, cv=5, n_jobs=n_jobs, refit=False
+        )
+    # La ressource n'est plus un paramètre de la grille : son maximum est le budget de la dernière itération
+    max_resources = max(grille.pop(f"model__{ressource}"))
+    return HalvingGridSearchCV(
+        pipeline,
+        grille,
+        factor=3,
+        resource=f"model__{ressource}",
+        max_resources=max_resources,
+        min_resources="exhaust",
+        cv=5,
+        n_jobs=n_jobs,
+        refit=False,
+    )
+
+
 def find_best_model(
     models: dict,
     param_grids: dict,
@@ -162,10 +375,17 @@ def find_best_model(
     X_train: pd.DataFrame,
     y_train: np.ndarray,
     marque: str,
-) -> tuple[LinearRegression | KNeighborsRegressor | RandomForestRegressor, str]:
+    n_jobs: int | None = None,
+    memoire: MemoirePreprocesseurs | str | None = None,
+    recherche: str = "grille",
+) -> tuple[Pipeline, str]:
     """
     Recherche et retourne le meilleur modèle de régression pour une marque donnée en utilisant la validation croisée.
 
+    Chaque combinaison est évaluée sur un pipeline préprocesseur + modèle (`get_pipeline`) : le préprocesseur est
+    ajusté sur les seuls plis d'entraînement. Seul le meilleur pipeline, tous modèles confondus, est réentraîné
+    sur tout X_train.
+
     ## Parameters:
         models (dict): Dictionnaire des modèles de régression à évaluer.
         param_grids (dict): Dictionnaire des grilles de paramètres associées aux modèles.
@@ -173,32 +393,72 @@ def find_best_model(
         X_train (pd.DataFrame): DataFrame d'entraînement des features.
         y_train (np.ndarray): Array numpy d'entraînement de la cible.
         marque (str): Nom de la marque pour laquelle le meilleur modèle est recherché.
+        n_jobs (int | None): Nombre de combinaisons de paramètres évaluées en parallèle (None : une à la fois).
+        memoire (MemoirePreprocesseurs | str | None): Cache des préprocesseurs ajustés (voir `get_pipeline`).
+            Pas de cache si None. Un cache en mémoire n'étant pas partagé entre processus, il est remplacé par un
+            cache `joblib.Memory` dans un dossier temporaire lorsque les combinaisons sont évaluées en parallèle.
+        recherche (str): "grille" (recherche sur grille complète) ou "halving" (divisions successives,
+            voir `get_recherche`).
 
     ## Returns:
-        tuple[LinearRegression | KNeighborsRegressor | RandomForestRegressor, str]:
-        Un tuple contenant le meilleur modèle sélectionné et le nom du modèle.
+        tuple[Pipeline, str]: Un tuple contenant le meilleur pipeline (préprocesseur + modèle), entraîné sur X_train,
+        et le nom du modèle.
 
     ## Example(s):
         >>> models, param_grids = set_models()
-        >>> best_model, best_model_name = find_best_model(models, param_grids, preprocessor, X_train, y_train, 'CITROEN')
-        >>> # Utilisation du meilleur modèle dans la suite de l'analyse
+        >>> best_pipeline, best_model_name = find_best_model(models, param_grids, preprocessor, X_train, y_train, 'CITROEN')
+        >>> # Utilisation du meilleur pipeline dans la suite de l'analyse
 
     ## Notes:
         Les résultats de la recherche sur grille sont exportés dans un fichier JSON dans le répertoire 'cv_results'
-        sous le format "{marque}_{model_name}_results.json".
+        sous le format "{marque}_{model_name}_results.json". Avec "halving", toutes les évaluations sont exportées,
+        avec l'itération ("iter") et les ressources utilisées ("n_resources").
     """
+    if isinstance(memoire, MemoirePreprocesseurs) and n_jobs not in (None, 1):
+        with tempfile.TemporaryDirectory(prefix="preprocesseurs-") as dossier_cache:
+            best_pipeline, best_model_name = find_best_model(
+                models,
+                param_grids,
+                preprocessor,
+                X_train,
+                y_train,
+                marque,
+                n_jobs,
+                dossier_cache,
+                recherche,
+            )
+        # Les réentraînements suivants du pipeline utilisent le cache en mémoire, le dossier étant supprimé
+        return best_pipeline.set_params(memory=memoire), best_model_name
+
     best_score = float("-inf")
 
     for model_name, model in models.items():
+        grid_search = get_recherche(
+            get_pipeline(model, preprocessor, memoire),
+            param_grids[model_name],
+            model_name,
+            recherche,
+            n_jobs,
+            len(X_train),
+        )
+        grid_search.fit(X_train, y_train)
 
-        grid_search = GridSearchCV(model, param_grids[model_name], cv=5)
-        grid_search.fit(preprocessor.fit_transform(X_train), y_train)
-
-        results = (
-            pd.DataFrame(grid_search.cv_results_)
-            .sort_values(by="rank_test_score")
-            .head(5)
+        # Les paramètres sont exportés sans le préfixe de l'étape du pipeline
+        results = pd.DataFrame(grid_search.cv_results_).rename(
+            columns=lambda colonne: colonne.replace("param_model__", "param_")
         )
+        if isinstance(grid_search, HalvingGridSearchCV):
+            # Le meilleur candidat est celui de la dernière itération : rangs par itération puis par score
+            results = results.sort_values(
+                by=["iter", "mean_test_score"], ascending=False
+            )
+            results["rank_test_score"] = range(1, len(results) + 1)
+        else:
+            results = results.sort_values(by="rank_test_score").head(5)
+        results["params"] = [
+            {param.removeprefix("model__"): valeur for param, valeur in params.items()}
+            for params in results["params"]
+        ]
 
         results.to_json(
             f"cv_results/{marque}_{model_name}_results.json",
@@ -208,10 +468,13 @@ def find_best_model(
 
         if grid_search.best_score_ > best_score:
             best_score = grid_search.best_score_
-            best_model = grid_search.best_estimator_
+            best_params = grid_search.best_params_
             best_model_name = model_name
 
-    return best_model, best_model_name
+    best_pipeline = get_pipeline(
+        clone(models[best_model_name]), preprocessor, memoire
+    ).set_params(**best_params)
+    return best_pipeline.fit(X_train, y_train), best_model_name
 
 
 def print_best_results(
@@ -249,41 +512,57 @@ def export_models(
     model: LinearRegression | KNeighborsRegressor | RandomForestRegressor,
     preprocessor: ColumnTransformer,
     marque: str,
-) -> None:
+    metadonnees: dict | None = None,
+    registre: str = CHEMIN_REGISTRE,
+) -> str:
     """
-    Exporte le modèle de régression et le préprocesseur associé pour une marque donnée.
+    Exporte le modèle de régression et le préprocesseur associé pour une marque donnée, en publiant une nouvelle
+    version dans le registre des modèles (voir le module `registre`).
 
     ## Parameters:
         model (Union[LinearRegression, KNeighborsRegressor, RandomForestRegressor]): Modèle de régression à exporter.
         preprocessor (ColumnTransformer): Préprocesseur associé au modèle.
         marque (str): Nom de la marque pour laquelle le modèle est exporté.
+        metadonnees (dict | None): Métriques et empreinte des données enregistrées dans le manifeste de la version.
+        registre (str): Dossier du registre des modèles.
 
     ## Returns:
-        None
+        str: La version publiée, devenue la version courante de la marque.
 
     ## Example(s):
-        >>> export_models(KNeighborsRegressor(), preprocessor, 'PORSCHE')
-        # Exporte le modèle KNeighborsRegressor et le préprocesseur associé pour la marque PORSCHE.
-        # Les fichiers sont sauvegardés dans le répertoire 'models'.
+        >>> export_models(KNeighborsRegressor(), preprocessor, 'PORSCHE', {"mae": 8737.2})
+        'v0004'
+        # Publie le modèle KNeighborsRegressor et le préprocesseur associé pour la marque PORSCHE.
 
     ## Notes:
-        Les fichiers sont sauvegardés dans le répertoire 'models' avec les noms '{marque}_best_model.joblib'
-        et '{marque}_preprocessor.joblib'.
+        La version est écrite entièrement avant de devenir la version courante : l'application ne peut pas
+        charger un modèle à moitié écrit pendant un réentraînement.
     """
-    dump(model, f"models/{marque}_best_model.joblib")
-    dump(preprocessor, f"models/{marque}_preprocessor.joblib")
+    return publier_modele(marque, model, preprocessor, metadonnees, registre)
 
 
-def preprocess_train_and_evaluate_model(data: pl.DataFrame, marque: str) -> None:
+def preprocess_train_and_evaluate_model(
+    data: pl.DataFrame,
+    marque: str,
+    n_jobs: int | None = None,
+    recherche: str = "grille",
+    empreinte_donnees: str | None = None,
+    registre: str = CHEMIN_REGISTRE,
+) -> tuple[str, float, str]:
     """
     Préprocesse les données, entraîne et évalue le meilleur modèle de régression pour une marque donnée.
 
     ## Parameters:
         data (pl.DataFrame): DataFrame Polars contenant les données des véhicules.
         marque (str): Nom de la marque pour laquelle le modèle est entraîné et évalué.
+        n_jobs (int | None): Nombre de threads de la recherche sur grille (None : tous les cœurs pour la forêt
+            aléatoire seulement, comme auparavant).
+        recherche (str): Recherche des hyperparamètres, "grille" ou "halving" (voir `get_recherche`).
+        empreinte_donnees (str | None): Empreinte des données de la marque, enregistrée avec le modèle publié.
+        registre (str): Dossier du registre des modèles.
 
     ## Returns:
-        None
+        tuple[str, float, str]: Nom du meilleur modèle, MAE sur l'ensemble de test et version publiée.
 
     ## Example(s):
         >>> preprocess_train_and_evaluate_model(data, 'PORSCHE')
@@ -293,37 +572,253 @@ def preprocess_train_and_evaluate_model(data: pl.DataFrame, marque: str) -> None
     ## Notes:
         Les résultats de la recherche sur grille et les informations du meilleur modèle sont exportés
         dans le répertoire 'cv_results' avec les noms '{marque}_{model_name}_results.json'.
-        Le meilleur modèle et le préprocesseur associé sont sauvegardés dans le répertoire 'models' avec les noms '{marque}_best_model.joblib'
-        et '{marque}_preprocessor.joblib'.
+        Le meilleur modèle et le préprocesseur associé sont publiés dans le registre des modèles.
     """
     X, y, X_train, X_test, y_train, y_test = split_data(data, marque)
 
     preprocessor = get_preprocessor()
 
-    models, param_grids = set_models()
-
-    best_model, best_model_name = find_best_model(
-        models, param_grids, preprocessor, X_train, y_train, marque
+    # Une seule couche de parallélisme : la recherche sur grille ou la forêt aléatoire
+    models, param_grids = set_models(-1 if n_jobs is None else 1)
+
+    # Cache des préprocesseurs ajustés, partagé par les plis de toutes les recherches sur grille de la marque
+    best_pipeline, best_model_name = find_best_model(
+        models,
+        param_grids,
+        preprocessor,
+        X_train,
+        y_train,
+        marque,
+        n_jobs,
+        MemoirePreprocesseurs(),
+        recherche,
     )
 
-    y_pred = best_model.predict(preprocessor.transform(X_test))
+    y_pred = best_pipeline.predict(X_test)
 
-    best_model.fit(preprocessor.fit_transform(X.to_pandas()), y.to_numpy())
-    preprocessor.fit(X.to_pandas())
+    best_pipeline.fit(X.to_pandas(), y.to_numpy())
 
     mae = mean_absolute_error(y_test, y_pred)
+    best_model = best_pipeline.named_steps["model"]
+    preprocessor = best_pipeline.named_steps["preprocessor"]
 
     print_best_results(marque, best_model_name, best_model, mae)
 
-    export_models(best_model, preprocessor, marque)
+    version = export_models(
+        best_model,
+        preprocessor,
+        marque,
+        {
+            "modele": best_model_name,
+            "mae": mae,
+            "lignes": data.height,
+            "recherche": recherche,
+            "empreinte_donnees": empreinte_donnees,
+            "parametres": best_model.get_params(),
+        },
+        registre,
+    )
+
+    return best_model_name, mae, version
+
+
+def get_effectifs_marques(nombre_marques: int = NOMBRE_MARQUES) -> dict[str, int]:
+    """
+    Renvoie le nombre d'annonces des marques ayant le plus d'observations, par ordre décroissant.
+
+    ## Parameters:
+        nombre_marques (int): Nombre de marques.
+
+    ## Returns:
+        dict[str, int]: Marque -> nombre d'annonces.
+    """
+    return dict(
+        duckdb.execute(
+            f"""
+            SELECT marque, COUNT(*) AS lignes
+            FROM {SOURCE_BASE}
+            WHERE marque IS NOT NULL
+            GROUP BY marque
+            ORDER BY lignes DESC, marque
+            LIMIT ?
+            """,
+            [nombre_marques],
+        ).fetchall()
+    )
+
+
+def planifier_entrainements(
+    effectifs: dict[str, int], n_workers: int | None = None, n_coeurs: int | None = None
+) -> list[LotEntrainement]:
+    """
+    Planifie l'entraînement des marques en lots, chaque lot étant exécuté dans son propre pool de processus.
+
+    Le coût d'une marque croît avec son nombre d'annonces : les marques sont lancées de la plus grosse à la plus
+    petite. Une marque plus grosse que la part de travail d'un processus (total des annonces / `n_workers`)
+    prolongerait seule l'entraînement avec `n_coeurs // n_workers` threads : les grosses marques forment un
+    premier lot, entraîné avec moins de processus et plus de threads chacun. Les autres marques sont
+    ensuite réparties sur `n_workers` processus. Chaque lot utilise tous les cœurs, sans dépassement.
 
+    ## Parameters:
+        effectifs (dict[str, int]): Marque -> nombre d'annonces.
+        n_workers (int | None): Nombre de processus (None : un par cœur, au plus un par marque).
+        n_coeurs (int | None): Nombre de cœurs disponibles (None : tous).
 
-def get_all_models() -> None:
+    ## Returns:
+        list[LotEntrainement]: Lots dans l'ordre de lancement : marques, nombre de processus et nombre de
+        threads par processus.
+
+    ## Example(s):
+        >>> planifier_entrainements({"AUDI": 500, "PEUGEOT": 3000, "BMW": 800}, n_coeurs=8)
+        [LotEntrainement(marques=['PEUGEOT'], n_workers=1, n_jobs=8),
+         LotEntrainement(marques=['BMW', 'AUDI'], n_workers=2, n_jobs=4)]
+    """
+    if effectifs == {}:
+        return []
+    if n_coeurs is None:
+        n_coeurs = cpu_count()
+    if n_workers is None:
+        n_workers = n_coeurs
+    n_workers = max(1, min(n_workers, n_coeurs, len(effectifs)))
+    ordre = sorted(effectifs, key=lambda marque: (-effectifs[marque], marque))
+    part = sum(effectifs.values()) / n_workers
+    grosses = [marque for marque in ordre if effectifs[marque] > part]
+    petites = ordre[len(grosses) :]
+    lots = []
+    for marques in (grosses, petites):
+        if marques != []:
+            n_workers_lot = min(n_workers, len(marques))
+            lots.append(
+                LotEntrainement(
+                    marques, n_workers_lot, max(1, n_coeurs // n_workers_lot)
+                )
+            )
+    return lots
+
+
+def entrainer_marque(
+    marque: str,
+    n_jobs: int,
+    recherche: str = "grille",
+    empreinte_donnees: str | None = None,
+    registre: str = CHEMIN_REGISTRE,
+) -> ResultatEntrainement:
+    """
+    Entraîne une marque dans un processus du pool : lit sa partition, entraîne et exporte son meilleur modèle.
+
+    Les affichages sont capturés dans le journal du résultat et une erreur n'interrompt pas les autres marques.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        n_jobs (int): Nombre de threads de la recherche sur grille.
+        recherche (str): Recherche des hyperparamètres, "grille" ou "halving".
+        empreinte_donnees (str | None): Empreinte des données de la marque, enregistrée avec le modèle publié.
+        registre (str): Dossier du registre des modèles.
+
+    ## Returns:
+        ResultatEntrainement: Modèle retenu, MAE, version publiée, durée, journal ou erreur de la marque.
+    """
+    warnings.filterwarnings("ignore")
+    debut = time.perf_counter()
+    journal = io.StringIO()
+    resultat = ResultatEntrainement(marque=marque, lignes=0)
+    try:
+        with redirect_stdout(journal):
+            # Seule la partition de la marque est lue
+            data = duckdb.execute(
+                f"""
+                SELECT *
+                FROM {SOURCE_BASE}
+                WHERE marque = ?
+                """,
+                [marque],
+            ).pl()
+            resultat.lignes = data.height
+            (
+                resultat.modele,
+                resultat.mae,
+                resultat.version,
+            ) = preprocess_train_and_evaluate_model(
+                data, marque, n_jobs, recherche, empreinte_donnees, registre
+            )
+    except Exception:
+        resultat.erreur = traceback.format_exc()
+    resultat.journal = journal.getvalue()
+    resultat.duree = time.perf_counter() - debut
+    return resultat
+
+
+def entrainer_marques(
+    effectifs: dict[str, int],
+    n_workers: int | None = None,
+    recherche: str = "grille",
+    empreintes: dict[str, str] | None = None,
+    registre: str = CHEMIN_REGISTRE,
+) -> list[ResultatEntrainement]:
+    """
+    Entraîne les marques données dans des pools de processus, un par lot (voir `planifier_entrainements`).
+
+    Les journaux de chaque marque sont affichés d'un bloc, dans l'ordre de lancement, et enregistrés dans
+    'cv_results/{marque}.log'.
+
+    ## Parameters:
+        effectifs (dict[str, int]): Marque -> nombre d'annonces des marques à entraîner.
+        n_workers (int | None): Nombre de processus (None : un par cœur).
+        recherche (str): Recherche des hyperparamètres, "grille" ou "halving".
+        empreintes (dict[str, str] | None): Marque -> empreinte de ses données, enregistrée avec chaque modèle
+            publié (calculée si None, voir `get_empreintes_donnees`).
+        registre (str): Dossier du registre des modèles.
+
+    ## Returns:
+        list[ResultatEntrainement]: Résultat de chaque marque, dans l'ordre de lancement.
+    """
+    if effectifs == {}:
+        return []
+    if empreintes is None:
+        empreintes = get_empreintes_donnees(list(effectifs))
+    resultats = []
+    for lot in planifier_entrainements(effectifs, n_workers):
+        # Chaque processus limite aussi les threads des bibliothèques de calcul (BLAS, OpenMP)
+        with parallel_backend("loky", inner_max_num_threads=lot.n_jobs):
+            resultats += Parallel(n_jobs=lot.n_workers)(
+                delayed(entrainer_marque)(
+                    marque, lot.n_jobs, recherche, empreintes.get(marque), registre
+                )
+                for marque in lot.marques
+            )
+    for resultat in resultats:
+        with open(f"cv_results/{resultat.marque}.log", "w", encoding="utf-8") as log:
+            log.write(resultat.journal)
+            if resultat.erreur is not None:
+                log.write(resultat.erreur)
+        print(resultat.journal, end="")
+        if resultat.erreur is not None:
+            print(
+                f"--- {resultat.marque} --- Échec de l'entraînement :\n{resultat.erreur}"
+            )
+    return resultats
+
+
+def get_all_models(
+    n_workers: int | None = None,
+    nombre_marques: int = NOMBRE_MARQUES,
+    recherche: str = "grille",
+) -> list[ResultatEntrainement]:
     """
     Entraîne, évalue et exporte le meilleur modèle pour chaque marque parmis les 40 marques avec le plus d'observations.
 
+    Les marques sont entraînées en parallèle dans des pools de processus (voir `entrainer_marques`). Pour ne réentraîner
+    que les marques dont les données ont changé, voir `reentrainer_modeles` (module `reentrainement`).
+
+    ## Parameters:
+        n_workers (int | None): Nombre de processus (None : un par cœur). Avec 1, les marques sont entraînées
+            l'une après l'autre.
+        nombre_marques (int): Nombre de marques à entraîner.
+        recherche (str): Recherche des hyperparamètres, "grille" ou "halving" (divisions successives, bien moins
+            de calculs pour la forêt aléatoire, voir `get_recherche`).
+
     ## Returns:
-        None
+        list[ResultatEntrainement]: Résultat de chaque marque, dans l'ordre de lancement.
 
     ## Example(s):
         >>> get_all_models()
@@ -333,19 +828,13 @@ def get_all_models() -> None:
         Les résultats de la recherche sur grille et les informations des meilleurs modèles sont exportés
         dans le répertoire 'cv_results' avec les noms '{marque}_{model_name}_results.json'.
 
-        Les meilleurs modèles et preprocesseur associés sont exporté dans le dossier src/models avec les noms
-        '{marque}_best_model.joblib' et '{marque}_preprocessor.joblib' respectivement.
+        Les meilleurs modèles et preprocesseur associés sont publiés dans le registre des modèles
+        (src/models/registre), une nouvelle version par marque.
     """
     warnings.filterwarnings("ignore")
-    nom_marques_modeles = pl.DataFrame(import_marques_modeles()).head(40)
-    data = duckdb.sql(
-        """
-        SELECT *
-        FROM 'data/database.parquet'
-        """
-    ).pl()
-    for marque in nom_marques_modeles["marque"].to_numpy():
-        preprocess_train_and_evaluate_model(data, marque)
+    return entrainer_marques(
+        get_effectifs_marques(nombre_marques), n_workers, recherche
+    )
 
 
 def cv_result_into_df(modele: str, marques_array: np.ndarray) -> pl.DataFrame:
@@ -0,0 +1,221 @@
+"""
+Module de réentraînement incrémental des modèles par marque.
+
+`get_all_models` réentraîne toutes les marques. `reentrainer_modeles` calcule d'abord une empreinte par marque :
+
+- empreinte des données : MD5 (DuckDB) des annonces de la partition de la marque dans la base nettoyée, triées
+  par lien. Elle change dès qu'une annonce est ajoutée, supprimée ou modifiée.
+- empreinte de la configuration : MD5 des modèles, grilles de paramètres, préprocesseur, type de recherche et
+  version de scikit-learn.
+
+Seules les marques dont une empreinte diffère du dernier entraînement réussi (ou sans version courante dans le
+registre des modèles) sont réentraînées. Le manifeste JSON enregistre, pour chaque marque, les empreintes et le résultat du
+dernier entraînement réussi, et pour chaque exécution les marques entraînées (avec la raison), ignorées ou en échec.
+"""
+
+import datetime
+import hashlib
+import json
+import os
+from pathlib import Path
+import sklearn
+from src.modules.base_donnees import get_empreintes_donnees
+from src.modules.registre import CHEMIN_REGISTRE, version_courante
+from src.modules.machinelearning import (
+    NOMBRE_MARQUES,
+    ResultatEntrainement,
+    entrainer_marques,
+    get_effectifs_marques,
+    get_preprocessor,
+    set_models,
+)
+
+
+CHEMIN_MANIFESTE = f"{CHEMIN_REGISTRE}/manifeste_entrainement.json"
+
+
+def get_empreinte_configuration(recherche: str = "grille") -> str:
+    """
+    Calcule l'empreinte de la configuration d'entraînement : modèles et grilles de `set_models`, préprocesseur,
+    recherche et version de scikit-learn. Le nombre de threads (`n_jobs`) n'en fait pas partie.
+
+    ## Parameters:
+        recherche (str): Recherche des hyperparamètres, "grille" ou "halving".
+
+    ## Returns:
+        str: Empreinte MD5 de la configuration.
+    """
+    models, param_grids = set_models()
+    configuration = {
+        "models": {
+            nom: {
+                parametre: valeur
+                for parametre, valeur in model.get_params().items()
+                if parametre != "n_jobs"
+            }
+            for nom, model in models.items()
+        },
+        "param_grids": param_grids,
+        "preprocessor": get_preprocessor().get_params(deep=True),
+        "recherche": recherche,
+        "scikit-learn": sklearn.__version__,
+    }
+    texte = json.dumps(configuration, sort_keys=True, default=repr)
+    return hashlib.md5(texte.encode()).hexdigest()
+
+
+def lire_manifeste(chemin_manifeste: str | Path = CHEMIN_MANIFESTE) -> dict:
+    """
+    Lit le manifeste des entraînements (vide s'il n'existe pas encore).
+
+    ## Parameters:
+        chemin_manifeste (str | Path): Fichier JSON du manifeste.
+
+    ## Returns:
+        dict: {"marques": {marque: dernier entraînement réussi}, "executions": [exécutions]}.
+    """
+    if not Path(chemin_manifeste).exists():
+        return {"marques": {}, "executions": []}
+    with open(chemin_manifeste, "r", encoding="utf-8") as fichier:
+        return json.load(fichier)
+
+
+def ecrire_manifeste(
+    manifeste: dict, chemin_manifeste: str | Path = CHEMIN_MANIFESTE
+) -> None:
+    """
+    Écrit le manifeste sous un nom temporaire puis le renomme : un arrêt pendant l'écriture garde l'ancien manifeste.
+
+    ## Parameters:
+        manifeste (dict): Manifeste à écrire.
+        chemin_manifeste (str | Path): Fichier JSON du manifeste.
+    """
+    chemin_temporaire = f"{chemin_manifeste}.tmp"
+    with open(chemin_temporaire, "w", encoding="utf-8") as fichier:
+        json.dump(manifeste, fichier, ensure_ascii=False, indent=2)
+    os.replace(chemin_temporaire, chemin_manifeste)
+
+
+def get_raison_entrainement(
+    marque: str,
+    empreinte_donnees: str,
+    empreinte_configuration: str,
+    manifeste: dict,
+    registre: str | Path = CHEMIN_REGISTRE,
+) -> str | None:
+    """
+    Renvoie la raison de réentraîner une marque, ou None si son dernier entraînement réussi est à jour.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        empreinte_donnees (str): Empreinte actuelle des données de la marque.
+        empreinte_configuration (str): Empreinte actuelle de la configuration.
+        manifeste (dict): Manifeste des entraînements.
+        registre (str | Path): Dossier du registre des modèles.
+
+    ## Returns:
+        str | None: "jamais entraînée", "configuration modifiée", "données modifiées", "modèle absent" ou None.
+    """
+    precedent = manifeste["marques"].get(marque)
+    if precedent is None:
+        return "jamais entraînée"
+    if precedent["empreinte_configuration"] != empreinte_configuration:
+        return "configuration modifiée"
+    if precedent["empreinte_donnees"] != empreinte_donnees:
+        return "données modifiées"
+    if version_courante(marque, registre) is None:
+        return "modèle absent"
+    return None
+
+
+def reentrainer_modeles(
+    n_workers: int | None = None,
+    nombre_marques: int = NOMBRE_MARQUES,
+    recherche: str = "grille",
+    forcer: bool = False,
+    chemin_manifeste: str | Path = CHEMIN_MANIFESTE,
+    registre: str | Path = CHEMIN_REGISTRE,
+) -> list[ResultatEntrainement]:
+    """
+    Réentraîne uniquement les marques dont les données ou la configuration ont changé depuis leur dernier
+    entraînement réussi, puis met à jour le manifeste.
+
+    Les empreintes sont calculées avant l'entraînement : une marque dont les données changent pendant
+    l'entraînement sera réentraînée à la prochaine exécution. Une marque en échec garde son dernier entraînement
+    réussi dans le manifeste et sera réessayée.
+
+    ## Parameters:
+        n_workers (int | None): Nombre de processus (None : un par cœur).
+        nombre_marques (int): Nombre de marques (celles qui ont le plus d'annonces).
+        recherche (str): Recherche des hyperparamètres, "grille" ou "halving".
+        forcer (bool): Réentraîne toutes les marques, quelles que soient leurs empreintes.
+        chemin_manifeste (str | Path): Fichier JSON du manifeste.
+        registre (str | Path): Dossier du registre où les modèles sont publiés.
+
+    ## Returns:
+        list[ResultatEntrainement]: Résultat de chaque marque réentraînée.
+
+    ## Example(s):
+        >>> reentrainer_modeles(recherche="halving")
+        # Après un scraping quotidien, seules les marques dont les annonces ont changé sont réentraînées.
+    """
+    effectifs = get_effectifs_marques(nombre_marques)
+    empreintes = get_empreintes_donnees(list(effectifs))
+    empreinte_configuration = get_empreinte_configuration(recherche)
+    manifeste = lire_manifeste(chemin_manifeste)
+    raisons = {}
+    for marque in effectifs:
+        raison = (
+            "forcé"
+            if forcer
+            else get_raison_entrainement(
+                marque,
+                empreintes[marque],
+                empreinte_configuration,
+                manifeste,
+                registre,
+            )
+        )
+        if raison is not None:
+            raisons[marque] = raison
+
+    resultats = entrainer_marques(
+        {marque: effectifs[marque] for marque in raisons},
+        n_workers,
+        recherche,
+        {marque: empreintes[marque] for marque in raisons},
+        registre,
+    )
+
+    date = datetime.datetime.now().isoformat(timespec="seconds")
+    for resultat in resultats:
+        if resultat.erreur is None:
+            manifeste["marques"][resultat.marque] = {
+                "empreinte_donnees": empreintes[resultat.marque],
+                "empreinte_configuration": empreinte_configuration,
+                "date": date,
+                "raison": raisons[resultat.marque],
+                "lignes": resultat.lignes,
+                "recherche": recherche,
+                "modele": resultat.modele,
+                "mae": resultat.mae,
+                "version": resultat.version,
+                "duree": round(resultat.duree, 1),
+            }
+    manifeste["executions"].append(
+        {
+            "date": date,
+            "recherche": recherche,
+            "entrainees": {
+                resultat.marque: raisons[resultat.marque]
+                for resultat in resultats
+                if resultat.erreur is None
+            },
+            "echecs": [
+                resultat.marque for resultat in resultats if resultat.erreur is not None
+            ],
+            "ignorees": [marque for marque in effectifs if marque not in raisons],
+        }
+    )
+    ecrire_manifeste(manifeste, chemin_manifeste)
+    return resultats
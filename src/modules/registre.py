@@ -0,0 +1,286 @@
+"""
+Module du registre local des modèles par marque.
+
+Chaque entraînement publie une nouvelle version d'une marque dans `src/models/registre/{MARQUE}/vNNNN/` : le
+modèle, le préprocesseur et un manifeste JSON (métriques, paramètres, empreinte des données). Une version est
+écrite dans un dossier temporaire puis renommée : elle n'est jamais visible à moitié écrite, et n'est plus
+modifiée ensuite.
+
+Le fichier `COURANT` de la marque désigne la version utilisée pour les prédictions. Il est remplacé en une seule
+opération (`os.replace`) : une application en cours d'exécution lit soit l'ancienne version, soit la nouvelle.
+`revenir_version` repasse à une version précédente.
+"""
+
+import datetime
+import functools
+import json
+import os
+import shutil
+from pathlib import Path
+from joblib import dump, load
+
+
+CHEMIN_REGISTRE = "src/models/registre"
+VERSIONS_CONSERVEES = 5
+
+
+class ErreurRegistre(LookupError):
+    """
+    Marque ou version absente du registre.
+    """
+
+
+def lister_versions(marque: str, registre: str | Path = CHEMIN_REGISTRE) -> list[str]:
+    """
+    Renvoie les versions publiées d'une marque, de la plus ancienne à la plus récente.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        registre (str | Path): Dossier du registre.
+
+    ## Returns:
+        list[str]: Versions ("v0001", "v0002", ...).
+    """
+    dossier = Path(registre) / marque
+    if not dossier.is_dir():
+        return []
+    return sorted(
+        chemin.name
+        for chemin in dossier.iterdir()
+        if chemin.is_dir() and chemin.name.startswith("v") and chemin.name[1:].isdigit()
+    )
+
+
+def version_courante(marque: str, registre: str | Path = CHEMIN_REGISTRE) -> str | None:
+    """
+    Renvoie la version courante d'une marque, ou None si aucune version n'a été publiée.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        registre (str | Path): Dossier du registre.
+
+    ## Returns:
+        str | None: Version désignée par le fichier `COURANT`.
+    """
+    chemin = Path(registre) / marque / "COURANT"
+    if not chemin.exists():
+        return None
+    return chemin.read_text(encoding="utf-8").strip()
+
+
+def definir_version_courante(
+    marque: str, version: str, registre: str | Path = CHEMIN_REGISTRE
+) -> None:
+    """
+    Désigne la version courante d'une marque, en remplaçant le fichier `COURANT` en une seule opération.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        version (str): Version publiée.
+        registre (str | Path): Dossier du registre.
+
+    ## Raises:
+        ErreurRegistre: Si la version n'existe pas.
+    """
+    if version not in lister_versions(marque, registre):
+        raise ErreurRegistre(f"Version {version} absente du registre pour {marque}.")
+    chemin = Path(registre) / marque / "COURANT"
+    chemin_temporaire = chemin.with_name(f"COURANT.{os.getpid()}.tmp")
+    chemin_temporaire.write_text(version, encoding="utf-8")
+    os.replace(chemin_temporaire, chemin)
+
+
+def publier_modele(
+    marque: str,
+    model,
+    preprocessor,
+    metadonnees: dict | None = None,
+    registre: str | Path = CHEMIN_REGISTRE,
+    conserver: int | None = VERSIONS_CONSERVEES,
+) -> str:
+    """
+    Publie une nouvelle version d'une marque et en fait la version courante.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        model: Modèle de régression entraîné.
+        preprocessor: Préprocesseur ajusté associé.
+        metadonnees (dict | None): Informations enregistrées dans le manifeste de la version (MAE, nombre
+            d'annonces, empreinte des données, paramètres...).
+        registre (str | Path): Dossier du registre.
+        conserver (int | None): Nombre de versions gardées, les plus anciennes étant supprimées (la version
+            courante est toujours gardée). Toutes les versions sont gardées si None.
+
+    ## Returns:
+        str: La version publiée.
+
+    ## Example(s):
+        >>> publier_modele("PORSCHE", best_model, preprocessor, {"mae": 8737.2})
+        'v0004'
+    """
+    dossier_marque = Path(registre) / marque
+    dossier_marque.mkdir(parents=True, exist_ok=True)
+    dossier_temporaire = dossier_marque / f".publication-{os.getpid()}.tmp"
+    shutil.rmtree(dossier_temporaire, ignore_errors=True)
+    dossier_temporaire.mkdir()
+    dump(model, dossier_temporaire / "best_model.joblib")
+    dump(preprocessor, dossier_temporaire / "preprocessor.joblib")
+    versions = lister_versions(marque, registre)
+    numero = int(versions[-1][1:]) + 1 if versions != [] else 1
+    while True:
+        version = f"v{numero:04d}"
+        manifeste = {
+            "marque": marque,
+            "version": version,
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            **(metadonnees or {}),
+        }
+        with open(
+            dossier_temporaire / "manifeste.json", "w", encoding="utf-8"
+        ) as fichier:
+            json.dump(manifeste, fichier, ensure_ascii=False, indent=2, default=repr)
+        try:
+            # Le renommage échoue si une publication simultanée a déjà pris ce numéro
+            os.rename(dossier_temporaire, dossier_marque / version)
+            break
+        except OSError:
+            if not (dossier_marque / version).exists():
+                raise
+            numero += 1
+    definir_version_courante(marque, version, registre)
+    if conserver is not None:
+        supprimer_anciennes_versions(marque, conserver, registre)
+    return version
+
+
+def supprimer_anciennes_versions(
+    marque: str,
+    conserver: int = VERSIONS_CONSERVEES,
+    registre: str | Path = CHEMIN_REGISTRE,
+) -> list[str]:
+    """
+    Supprime les versions les plus anciennes d'une marque, sauf la version courante.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        conserver (int): Nombre de versions les plus récentes gardées.
+        registre (str | Path): Dossier du registre.
+
+    ## Returns:
+        list[str]: Versions supprimées.
+    """
+    courante = version_courante(marque, registre)
+    anciennes = [
+        version
+        for version in lister_versions(marque, registre)[:-conserver]
+        if version != courante
+    ]
+    for version in anciennes:
+        shutil.rmtree(Path(registre) / marque / version)
+    return anciennes
+
+
+def revenir_version(
+    marque: str, version: str | None = None, registre: str | Path = CHEMIN_REGISTRE
+) -> str:
+    """
+    Revient à une version précédente d'une marque (retour arrière).
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        version (str | None): Version à rétablir. Si None, la version publiée juste avant la version courante.
+        registre (str | Path): Dossier du registre.
+
+    ## Returns:
+        str: La nouvelle version courante.
+
+    ## Raises:
+        ErreurRegistre: Si la version n'existe pas, ou s'il n'y a pas de version précédente.
+
+    ## Example(s):
+        >>> revenir_version("PORSCHE")
+        'v0003'
+    """
+    if version is None:
+        versions = lister_versions(marque, registre)
+        courante = version_courante(marque, registre)
+        precedentes = [v for v in versions if courante is None or v < courante]
+        if precedentes == []:
+            raise ErreurRegistre(
+                f"Aucune version antérieure à {courante} pour {marque}."
+            )
+        version = precedentes[-1]
+    definir_version_courante(marque, version, registre)
+    return version
+
+
+def lire_manifeste_version(
+    marque: str, version: str | None = None, registre: str | Path = CHEMIN_REGISTRE
+) -> dict:
+    """
+    Lit le manifeste d'une version d'une marque.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        version (str | None): Version. La version courante si None.
+        registre (str | Path): Dossier du registre.
+
+    ## Returns:
+        dict: Le manifeste (version, date, métriques, empreinte des données...).
+
+    ## Raises:
+        ErreurRegistre: Si la marque n'a pas de version courante ou si la version n'existe pas.
+    """
+    dossier = get_dossier_version(marque, version, registre)
+    with open(dossier / "manifeste.json", "r", encoding="utf-8") as fichier:
+        return json.load(fichier)
+
+
+def get_dossier_version(
+    marque: str, version: str | None = None, registre: str | Path = CHEMIN_REGISTRE
+) -> Path:
+    """
+    Renvoie le dossier d'une version d'une marque (la version courante si `version` est None).
+
+    ## Raises:
+        ErreurRegistre: Si la marque n'a pas de version courante ou si la version n'existe pas.
+    """
+    if version is None:
+        version = version_courante(marque, registre)
+        if version is None:
+            raise ErreurRegistre(f"Aucune version publiée pour {marque}.")
+    dossier = Path(registre) / marque / version
+    if not dossier.is_dir():
+        raise ErreurRegistre(f"Version {version} absente du registre pour {marque}.")
+    return dossier
+
+
+def charger_version(
+    marque: str, version: str | None = None, registre: str | Path = CHEMIN_REGISTRE
+) -> tuple:
+    """
+    Charge le modèle et le préprocesseur d'une version d'une marque (la version courante si `version` est None).
+
+    Une version n'étant jamais modifiée, les derniers chargements sont gardés en mémoire.
+
+    ## Parameters:
+        marque (str): Nom de la marque.
+        version (str | None): Version. La version courante si None.
+        registre (str | Path): Dossier du registre.
+
+    ## Returns:
+        tuple: Le modèle et le préprocesseur.
+
+    ## Raises:
+        ErreurRegistre: Si la marque n'a pas de version courante ou si la version n'existe pas.
+    """
+    return _charger_dossier(
+        str(get_dossier_version(marque, version, registre).resolve())
+    )
+
+
+@functools.lru_cache(maxsize=8)
+def _charger_dossier(dossier: str) -> tuple:
+    return load(Path(dossier) / "best_model.joblib"), load(
+        Path(dossier) / "preprocessor.joblib"
+    )
@@ -8,6 +8,7 @@ comme la marque, le modèle, l'année, le kilométrage, la boîte de vitesses, l
 
 import duckdb
 from polars import DataFrame
+from src.modules.base_donnees import SOURCE_BASE
 
 
 def get_dataframe(
@@ -69,7 +70,7 @@ def get_dataframe(
                 ELSE position_marché
             END as Position_marché,
             lien
-            FROM 'data/database.parquet'
+            FROM {SOURCE_BASE}
             WHERE annee BETWEEN {annee_min} AND {annee_max}
             AND kilometrage BETWEEN {km_min} AND {km_max}
             AND boite IN ({', '.join(f"'{b}'" for b in boite)})
@@ -95,7 +96,7 @@ def get_dataframe(
                 ELSE position_marché
             END as Position_marché,
             lien
-            FROM 'data/database.parquet'
+            FROM {SOURCE_BASE}
             WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)})
             AND annee BETWEEN {annee_min} AND {annee_max}
             AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -122,7 +123,7 @@ def get_dataframe(
                 ELSE position_marché
             END as Position_marché,
             lien
-            FROM 'data/database.parquet'
+            FROM {SOURCE_BASE}
             WHERE modele IN ({', '.join(f"'{modele.upper()}'" for modele in modeles)})
             AND annee BETWEEN {annee_min} AND {annee_max}
             AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -149,7 +150,7 @@ def get_dataframe(
                 ELSE position_marché
             END as Position_marché,
             lien
-            FROM 'data/database.parquet'
+            FROM {SOURCE_BASE}
             WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)}) 
             AND modele IN ({', '.join(f"'{modele.upper()}'" for modele in modeles)})
             AND annee BETWEEN {annee_min} AND {annee_max}
@@ -4,6 +4,7 @@ Module contenant des fonctions pour récupérer des statistiques sur les donnée
 """
 
 import duckdb
+from src.modules.base_donnees import SOURCE_BASE
 
 
 def get_count_car(
@@ -42,7 +43,7 @@ def get_count_car(
                 duckdb.sql(
                     f"""
                 SELECT COUNT(*)
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 WHERE annee BETWEEN {annee_min} AND {annee_max}
                 AND kilometrage BETWEEN {km_min} AND {km_max}
                 AND boite IN ({', '.join(f"'{b}'" for b in boite)})
@@ -58,7 +59,7 @@ def get_count_car(
                 duckdb.sql(
                     f"""
                 SELECT COUNT(*)
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)})
                 AND annee BETWEEN {annee_min} AND {annee_max}
                 AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -75,7 +76,7 @@ def get_count_car(
                 duckdb.sql(
                     f"""
                 SELECT COUNT(*)
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 WHERE modele IN ({', '.join(f"'{modele.upper()}'" for modele in modeles)})
                 AND annee BETWEEN {annee_min} AND {annee_max}
                 AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -92,7 +93,7 @@ def get_count_car(
                 duckdb.sql(
                     f"""
                 SELECT COUNT(*)
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)}) 
                 AND modele IN ({', '.join(f"'{modele.upper()}'" for modele in modeles)})
                 AND annee BETWEEN {annee_min} AND {annee_max}
@@ -153,7 +154,7 @@ def get_avg_price(
                     duckdb.sql(
                         f"""
                     SELECT ROUND(AVG(prix),2)
-                    FROM 'data/database.parquet'
+                    FROM {SOURCE_BASE}
                     WHERE annee BETWEEN {annee_min} AND {annee_max}
                     AND kilometrage BETWEEN {km_min} AND {km_max}
                     AND boite IN ({', '.join(f"'{b}'" for b in boite)})
@@ -170,7 +171,7 @@ def get_avg_price(
                     duckdb.sql(
                         f"""
                     SELECT ROUND(AVG(prix),2)
-                    FROM 'data/database.parquet'
+                    FROM {SOURCE_BASE}
                     WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)})
                     AND annee BETWEEN {annee_min} AND {annee_max}
                     AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -188,7 +189,7 @@ def get_avg_price(
                     duckdb.sql(
                         f"""
                     SELECT ROUND(AVG(prix),2)
-                    FROM 'data/database.parquet'
+                    FROM {SOURCE_BASE}
                     WHERE modele IN ({', '.join(f"'{modele.upper()}'" for modele in modeles)})
                     AND annee BETWEEN {annee_min} AND {annee_max}
                     AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -206,7 +207,7 @@ def get_avg_price(
                     duckdb.sql(
                         f"""
                     SELECT ROUND(AVG(prix),2)
-                    FROM 'data/database.parquet'
+                    FROM {SOURCE_BASE}
                     WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)}) 
                     AND modele IN ({', '.join(f"'{modele.upper()}'" for modele in modeles)})
                     AND annee BETWEEN {annee_min} AND {annee_max}
@@ -231,7 +232,7 @@ def get_avg_price(
                 duckdb.sql(
                     f"""
                 SELECT ROUND(AVG(prix),2)
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 WHERE marque = '{marques}' 
                 AND modele = '{modeles}'
                 AND annee = {annee_max}
@@ -291,7 +292,7 @@ def calcul_delta(
             duckdb.sql(
                 f"""
                 SELECT COUNT(*)
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)}) 
                 AND annee BETWEEN {annee_min} AND {annee_max}
                 AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -305,7 +306,7 @@ def calcul_delta(
             - duckdb.sql(
                 f"""
                     SELECT COUNT(*)
-                    FROM 'data/database.parquet'
+                    FROM {SOURCE_BASE}
                     WHERE annee BETWEEN {annee_min} AND {annee_max}
                     AND kilometrage BETWEEN {km_min} AND {km_max}
                     AND boite IN ({', '.join(f"'{b}'" for b in boite)})
@@ -321,7 +322,7 @@ def calcul_delta(
             duckdb.sql(
                 f"""
                 SELECT COUNT(*)
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 WHERE modele IN ({', '.join(f"'{modele.upper()}'" for modele in modeles)})
                 AND annee BETWEEN {annee_min} AND {annee_max}
                 AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -335,7 +336,7 @@ def calcul_delta(
             - duckdb.sql(
                 f"""
                     SELECT COUNT(*)
-                    FROM 'data/database.parquet'
+                    FROM {SOURCE_BASE}
                     WHERE annee BETWEEN {annee_min} AND {annee_max}
                     AND kilometrage BETWEEN {km_min} AND {km_max}
                     AND boite IN ({', '.join(f"'{b}'" for b in boite)})
@@ -351,7 +352,7 @@ def calcul_delta(
             duckdb.sql(
                 f"""
                 SELECT COUNT(*)
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)}) 
                 AND modele IN ({', '.join(f"'{modele.upper()}'" for modele in modeles)})
                 AND annee BETWEEN {annee_min} AND {annee_max}
@@ -366,7 +367,7 @@ def calcul_delta(
             - duckdb.sql(
                 f"""
                     SELECT COUNT(*)
-                    FROM 'data/database.parquet'
+                    FROM {SOURCE_BASE}
                     WHERE marque IN ({', '.join(f"'{marque}'" for marque in marques)})
                     AND annee BETWEEN {annee_min} AND {annee_max}
                     AND kilometrage BETWEEN {km_min} AND {km_max}
@@ -5,6 +5,7 @@ telles que la plage d'années, les noms de marques, de modèles, les différente
 
 import duckdb
 from typing import cast
+from src.modules.base_donnees import SOURCE_BASE
 
 
 def get_plage_annee(
@@ -34,10 +35,10 @@ def get_plage_annee(
             tuple[int, int],
             tuple(
                 duckdb.sql(
-                    """
+                    f"""
                 SELECT MIN(annee) as annee_min,
                 MAX(annee) as annee_max
-                FROM 'data/database.parquet'
+                FROM {SOURCE_BASE}
                 """
                 )
                 .pl()
@@ -53,7 +54,7 @@ def get_plage_annee(
                         f"""
                     SELECT MIN(annee) as annee_min,
                     MAX(annee) as annee_max
-                    FROM 'data/database.parquet'
+                    FROM {SOURCE_BASE}
                     WHERE marque == '{marque.upper()}' 
                     AND modele == '{modele.upper()}'
                     """
@@ -80,9 +81,9 @@ def get_unique_marque(user_role: str) -> list:
     """
     if user_role == "Acheteur":
         marques = duckdb.sql(
-            """
+            f"""
             SELECT DISTINCT(marque) as unique_mar
-            FROM 'data/database.parquet'
+            FROM {SOURCE_BASE}
             WHERE marque IS NOT NULL
             ORDER BY unique_mar
             """
@@ -90,10 +91,10 @@ def get_unique_marque(user_role: str) -> list:
     if user_role == "Vendeur":
         marques = (
             duckdb.sql(
-                """
+                f"""
             SELECT COUNT(*) as nb_annonces, 
             marque as unique_mar
-            FROM 'data/database.parquet'
+            FROM {SOURCE_BASE}
             WHERE marque IS NOT NULL
             GROUP BY marque
             ORDER BY COUNT(*) DESC
@@ -123,7 +124,7 @@ def get_unique_modele(marque: str) -> list:
     modeles = duckdb.sql(
         f"""
         SELECT DISTINCT(modele) as unique_mod
-        FROM 'data/database.parquet'
+        FROM {SOURCE_BASE}
         WHERE marque == '{marque.upper()}'
         AND modele IS NOT NULL
         ORDER BY unique_mod
@@ -150,7 +151,7 @@ def get_unique_generation(marque: str, modele: str) -> list:
     generations = duckdb.sql(
         f"""
         SELECT DISTINCT(generation) as unique_gen
-        FROM 'data/database.parquet'
+        FROM {SOURCE_BASE}
         WHERE marque == '{marque.upper()}' 
         AND modele == '{modele.upper()}'
         AND generation IS NOT NULL
@@ -174,7 +175,7 @@ def get_unique_moteur(marque: str, modele: str) -> list:
     moteurs = duckdb.sql(
         f"""
         SELECT DISTINCT(moteur) as unique_mot
-        FROM 'data/database.parquet'
+        FROM {SOURCE_BASE}
         WHERE marque == '{marque.upper()}' 
         AND modele == '{modele.upper()}'
         AND moteur IS NOT NULL
@@ -200,7 +201,7 @@ def get_unique_cylindre(marque: str, modele: str) -> list:
     cylindres = duckdb.sql(
         f"""
         SELECT DISTINCT(cylindre) as unique_cyl
-        FROM 'data/database.parquet'
+        FROM {SOURCE_BASE}
         WHERE marque == '{marque.upper()}' 
         AND modele == '{modele.upper()}'
         AND cylindre IS NOT NULL
@@ -224,7 +225,7 @@ def get_unique_finition(marque: str, modele: str) -> list:
     finitions = duckdb.sql(
         f"""
         SELECT DISTINCT(finition) as unique_fin
-        FROM 'data/database.parquet'
+        FROM {SOURCE_BASE}
         WHERE marque == '{marque.upper()}' 
         AND modele == '{modele.upper()}'
         AND finition IS NOT NULL
@@ -242,9 +243,9 @@ def get_unique_batterie() -> list:
         - list: Liste des types de batteries uniques.
     """
     batteries = duckdb.sql(
-        """
+        f"""
         SELECT DISTINCT(batterie) as unique_bat
-        FROM 'data/database.parquet'
+        FROM {SOURCE_BASE}
         WHERE batterie IS NOT NULL
         ORDER BY unique_bat
         """
@@ -0,0 +1,169 @@
+"""
+Module d'archivage des pages HTML brutes.
+
+Chaque page téléchargée est compressée (gzip) et stockée sous le nom de son empreinte SHA-256 :
+une page identique n'est stockée qu'une fois. Un index NDJSON en ajout seul garde, dans l'ordre
+du scraping, la correspondance entre (marque, modèle, page) et l'empreinte du contenu, ainsi que
+l'identifiant de l'exécution (un scraping) qui a téléchargé la page : une exécution se relit seule,
+sans mélanger les pages d'exécutions plus anciennes.
+
+Structure du dossier d'archive :
+    index.ndjson
+    objets/ab/abcdef....html.gz
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from collections.abc import Iterator
+from pathlib import Path
+
+
+class ArchivePages:
+    """
+    Archive locale des pages HTML, compressée et adressée par contenu.
+
+    ## Example(s):
+        >>> archive = ArchivePages("archive")
+        >>> contenu = telecharger_page(1, "CITROEN", "C3", client, archive)
+        >>> voitures = list(rejouer_archive(archive))
+    """
+
+    def __init__(
+        self,
+        dossier: str | Path,
+        niveau_compression: int = 6,
+        execution: str | None = None,
+    ) -> None:
+        """
+        Ouvre (ou crée) l'archive.
+
+        ## Parameters:
+            dossier (str | Path): Dossier de l'archive.
+            niveau_compression (int): Niveau de compression gzip.
+            execution (str | None): Identifiant de l'exécution enregistré avec chaque page. Un identifiant
+                daté et unique est créé si None ; l'ordre alphabétique des identifiants créés suit leur date.
+        """
+        self.dossier = Path(dossier)
+        if execution is None:
+            execution = f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.execution = execution
+        self.niveau_compression = niveau_compression
+        self.chemin_index = self.dossier / "index.ndjson"
+        (self.dossier / "objets").mkdir(parents=True, exist_ok=True)
+        self._verrou = threading.Lock()
+
+    def chemin_objet(self, empreinte: str) -> Path:
+        """
+        Renvoie le chemin du fichier compressé correspondant à une empreinte.
+        """
+        return self.dossier / "objets" / empreinte[:2] / f"{empreinte}.html.gz"
+
+    def enregistrer(
+        self,
+        contenu: bytes,
+        marque: str,
+        modele: str,
+        numero_page: int,
+        adresse: str = "",
+    ) -> str:
+        """
+        Archive le contenu d'une page (s'il n'est pas déjà stocké) et l'ajoute à l'index.
+
+        ## Parameters:
+            contenu (bytes): Contenu HTML de la page.
+            marque (str): Nom de la marque.
+            modele (str): Nom du modèle de véhicule.
+            numero_page (int): Numéro de la page.
+            adresse (str): Url de la page.
+
+        ## Returns:
+            str: Empreinte SHA-256 du contenu.
+        """
+        empreinte = hashlib.sha256(contenu).hexdigest()
+        chemin = self.chemin_objet(empreinte)
+        if not chemin.exists():
+            chemin.parent.mkdir(exist_ok=True)
+            # Écriture dans un fichier temporaire puis renommage : un objet n'est jamais lu à moitié écrit
+            chemin_temporaire = chemin.with_name(
+                f"{chemin.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+            )
+            chemin_temporaire.write_bytes(
+                gzip.compress(contenu, compresslevel=self.niveau_compression)
+            )
+            os.replace(chemin_temporaire, chemin)
+        entree = {
+            "sha256": empreinte,
+            "marque": marque,
+            "modele": modele,
+            "page": numero_page,
+            "adresse": adresse,
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "execution": self.execution,
+        }
+        with self._verrou:
+            with open(self.chemin_index, "a", encoding="utf-8") as index:
+                index.write(json.dumps(entree, ensure_ascii=False) + "\n")
+        return empreinte
+
+    def lire(self, empreinte: str) -> bytes:
+        """
+        Renvoie le contenu décompressé d'une page archivée.
+
+        ## Raises:
+            FileNotFoundError: Si aucune page ne correspond à l'empreinte.
+        """
+        return gzip.decompress(self.chemin_objet(empreinte).read_bytes())
+
+    def _lire_index(self) -> Iterator[dict]:
+        if not self.chemin_index.exists():
+            return None
+        with open(self.chemin_index, "r", encoding="utf-8") as index:
+            for ligne in index:
+                if ligne.strip() != "":
+                    entree = json.loads(ligne)
+                    # Pages archivées avant l'identifiant d'exécution : une seule exécution
+                    entree.setdefault("execution", "")
+                    yield entree
+
+    def executions(self) -> list[str]:
+        """
+        Renvoie les identifiants des exécutions présentes dans l'archive, dans l'ordre de leur première page.
+        """
+        return list(dict.fromkeys(entree["execution"] for entree in self._lire_index()))
+
+    def entrees(
+        self, derniere_version: bool = True, execution: str | None = None
+    ) -> Iterator[dict]:
+        """
+        Parcourt l'index de l'archive dans l'ordre du scraping.
+
+        ## Parameters:
+            derniere_version (bool): Ne garde que la dernière version archivée de chaque (marque, modèle, page)
+                de l'exécution.
+            execution (str | None): Identifiant de l'exécution relue (voir `executions`). Si None, toutes
+                les exécutions avec `derniere_version=False`, la plus récente sinon.
+
+        ## Returns:
+            Iterator[dict]: Les entrées de l'index.
+        """
+        if not derniere_version and execution is None:
+            yield from self._lire_index()
+            return None
+        if execution is None:
+            executions = self.executions()
+            if executions == []:
+                return None
+            execution = executions[-1]
+        entrees = (e for e in self._lire_index() if e["execution"] == execution)
+        if not derniere_version:
+            yield from entrees
+            return None
+        versions: dict[tuple, dict] = {}
+        for entree in entrees:
+            versions[(entree["marque"], entree["modele"], entree["page"])] = entree
+        yield from versions.values()
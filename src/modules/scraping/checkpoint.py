@@ -0,0 +1,171 @@
+"""
+Module de reprise du scraping.
+
+Le journal de reprise est un fichier NDJSON en ajout seul : chaque ligne enregistre une page déjà extraite
+(marque, modèle, numéro de page et voitures obtenues, plus le nombre de pages annoncé pour la première page)
+ou la fin d'un modèle. Un scraping relancé avec le
+même journal reprend là où il s'est arrêté, sans retélécharger les pages déjà extraites.
+
+Seule la position de chaque page dans le fichier est gardée en mémoire : les voitures d'une page reprise sont
+relues sur disque au moment de la reprise.
+"""
+
+import json
+import os
+from dataclasses import asdict
+from pathlib import Path
+from src.modules.scraping.webscraping import voiture
+
+
+class JournalReprise:
+    """
+    Journal de reprise en ajout seul d'un scraping.
+
+    ## Example(s):
+        >>> with JournalReprise("json/journal.ndjson") as journal:
+        ...     voitures = extraire_toutes_voitures(100, import_marques_modeles(), journal=journal)
+    """
+
+    def __init__(self, chemin: str | Path, fsync_toutes_les: int = 0) -> None:
+        """
+        Charge le journal existant et l'ouvre en ajout.
+
+        ## Parameters:
+            chemin (str | Path): Chemin du fichier journal.
+            fsync_toutes_les (int): Force l'écriture sur disque toutes les n pages (0 : laisse le système décider).
+        """
+        self.chemin = Path(chemin)
+        self.fsync_toutes_les = fsync_toutes_les
+        # (marque, modèle) -> numéro de page -> position de la ligne de la page dans le fichier
+        self._pages: dict[tuple[str, str], dict[int, int]] = {}
+        self._modeles_termines: set[tuple[str, str]] = set()
+        # (marque, modèle) -> nombre de pages annoncé par la première page
+        self._nombres_pages: dict[tuple[str, str], int] = {}
+        self._ecritures = 0
+        self._charger()
+        self._fichier = open(self.chemin, "ab")
+        self._lecture = open(self.chemin, "rb")
+
+    def _charger(self) -> None:
+        if not self.chemin.exists():
+            return None
+        # Lecture ligne par ligne : seule la ligne en cours est gardée en mémoire
+        position = 0
+        with open(self.chemin, "rb") as fichier:
+            for ligne in fichier:
+                if not ligne.endswith(b"\n"):
+                    break
+                if ligne.strip() != b"":
+                    entree = json.loads(ligne)
+                    cle_modele = (entree["marque"], entree["modele"])
+                    if entree["type"] == "page":
+                        self._pages.setdefault(cle_modele, {})[
+                            entree["page"]
+                        ] = position
+                        if entree.get("nombre_pages") is not None:
+                            self._nombres_pages[cle_modele] = entree["nombre_pages"]
+                    elif entree["type"] == "fin":
+                        self._modeles_termines.add(cle_modele)
+                position += len(ligne)
+        if position < self.chemin.stat().st_size:
+            # Ligne incomplète écrite au moment de l'arrêt : on la supprime
+            with open(self.chemin, "r+b") as fichier:
+                fichier.truncate(position)
+        return None
+
+    def _ecrire(self, entree: dict) -> int:
+        position = self._fichier.tell()
+        self._fichier.write(
+            (json.dumps(entree, ensure_ascii=False) + "\n").encode("utf-8")
+        )
+        self._fichier.flush()
+        self._ecritures += 1
+        if self.fsync_toutes_les > 0 and self._ecritures % self.fsync_toutes_les == 0:
+            os.fsync(self._fichier.fileno())
+        return position
+
+    def page_faite(self, marque: str, modele: str, numero_page: int) -> bool:
+        """
+        Indique si une page a déjà été extraite.
+        """
+        return numero_page in self._pages.get((marque, modele), {})
+
+    def modele_termine(self, marque: str, modele: str) -> bool:
+        """
+        Indique si toutes les pages d'un modèle ont déjà été extraites.
+        """
+        return (marque, modele) in self._modeles_termines
+
+    def voitures_page(
+        self, marque: str, modele: str, numero_page: int
+    ) -> list[voiture]:
+        """
+        Renvoie les voitures enregistrées pour une page déjà extraite (relues dans le fichier journal).
+        """
+        self._lecture.seek(self._pages[(marque, modele)][numero_page])
+        entree = json.loads(self._lecture.readline())
+        return [voiture(**donnees) for donnees in entree["voitures"]]
+
+    def nombre_pages_annonce(self, marque: str, modele: str) -> int | None:
+        """
+        Renvoie le nombre de pages annoncé par la première page d'un modèle (None s'il n'a pas été enregistré).
+        """
+        return self._nombres_pages.get((marque, modele))
+
+    def pages_modele(self, marque: str, modele: str) -> list[int]:
+        """
+        Renvoie les numéros des pages déjà extraites d'un modèle, dans l'ordre.
+        """
+        return sorted(self._pages.get((marque, modele), {}))
+
+    def enregistrer_page(
+        self,
+        marque: str,
+        modele: str,
+        numero_page: int,
+        voitures: list[voiture],
+        nombre_pages: int | None = None,
+    ) -> None:
+        """
+        Ajoute au journal une page extraite et les voitures obtenues.
+
+        ## Parameters:
+            marque (str): Nom de la marque.
+            modele (str): Nom du modèle de véhicule.
+            numero_page (int): Numéro de la page.
+            voitures (list[voiture]): Voitures extraites de la page.
+            nombre_pages (int | None): Nombre de pages annoncé par la page (première page), relu à la reprise
+                pour ne pas demander de pages au-delà de la dernière.
+        """
+        entree = {
+            "type": "page",
+            "marque": marque,
+            "modele": modele,
+            "page": numero_page,
+            "voitures": [asdict(v) for v in voitures],
+        }
+        if nombre_pages is not None:
+            entree["nombre_pages"] = nombre_pages
+            self._nombres_pages[(marque, modele)] = nombre_pages
+        position = self._ecrire(entree)
+        self._pages.setdefault((marque, modele), {})[numero_page] = position
+
+    def enregistrer_fin_modele(self, marque: str, modele: str) -> None:
+        """
+        Ajoute au journal la fin d'un modèle (toutes ses pages ont été extraites).
+        """
+        self._ecrire({"type": "fin", "marque": marque, "modele": modele})
+        self._modeles_termines.add((marque, modele))
+
+    def fermer(self) -> None:
+        """
+        Ferme le fichier journal.
+        """
+        self._fichier.close()
+        self._lecture.close()
+
+    def __enter__(self) -> "JournalReprise":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.fermer()
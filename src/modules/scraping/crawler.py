@@ -0,0 +1,425 @@
+"""
+Module de scraping asynchrone des annonces.
+
+Les pages d'annonces sont téléchargées en parallèle à l'aide d'`asyncio`, avec une limite globale
+de requêtes simultanées et un budget de politesse par hôte. La première page de chaque modèle donne
+son nombre de pages : les pages restantes de tous les modèles sont ensuite demandées, entrelacées d'un
+modèle à l'autre. Les pages passent par une file bornée traitée par un nombre fixe de tâches : le nombre de
+tâches en mémoire ne dépend pas du nombre de pages. Les requêtes HTTP (bloquantes) et l'analyse HTML sont
+exécutées dans deux pools de threads propres au crawler, dimensionnés selon la concurrence configurée : les
+téléchargements ne sont pas limités par le pool par défaut d'`asyncio` et l'analyse ne leur prend pas de threads.
+Les objets "voiture" obtenus sont identiques, et dans le même ordre, que ceux du scraping séquentiel.
+"""
+
+import asyncio
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from collections.abc import Awaitable, Callable, Iterable
+from dataclasses import dataclass
+from urllib.parse import urlparse
+import requests as rq
+from src.modules.scraping.webscraping import (
+    URL_LACENTRALE,
+    NomMarquesModeles,
+    ClientScraping,
+    ParametresClient,
+    voiture,
+    construire_adresse,
+    recup_nombre_pages,
+    ErreurRalentissement,
+    est_ralentissement,
+    get_retry_after,
+    print_info_scraping,
+)
+from src.modules.scraping.extraction import get_extracteur
+from src.modules.scraping.regulation import ParametresRegulateur, RegulateurDebit
+
+
+@dataclass
+class ParametresCrawl:
+    concurrence: int = 8
+    concurrence_par_hote: int = 4
+    delai_min_par_hote: float = 0.0
+    max_tentatives: int = 3
+    base_url: str = URL_LACENTRALE
+    extracteur: str = "classique"
+    regulateur: ParametresRegulateur | None = None
+
+
+class LimiteurHotes:
+    """
+    Limite le nombre de requêtes simultanées et l'intervalle minimal entre deux requêtes pour chaque hôte.
+    """
+
+    def __init__(self, concurrence_par_hote: int, delai_min_par_hote: float) -> None:
+        self.concurrence_par_hote = concurrence_par_hote
+        self.delai_min_par_hote = delai_min_par_hote
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._verrous: dict[str, asyncio.Lock] = {}
+        self._derniers_departs: dict[str, float] = {}
+
+    @asynccontextmanager
+    async def reserver(self, adresse: str):
+        """
+        Réserve un emplacement pour l'hôte de l'adresse donnée en respectant le budget de politesse.
+
+        ## Parameters:
+            adresse (str): Url de la page à télécharger.
+        """
+        hote = urlparse(adresse).netloc
+        semaphore = self._semaphores.setdefault(
+            hote, asyncio.Semaphore(self.concurrence_par_hote)
+        )
+        verrou = self._verrous.setdefault(hote, asyncio.Lock())
+        async with semaphore:
+            async with verrou:
+                boucle = asyncio.get_running_loop()
+                attente = (
+                    self._derniers_departs.get(hote, float("-inf"))
+                    + self.delai_min_par_hote
+                    - boucle.time()
+                )
+                if attente > 0:
+                    await asyncio.sleep(attente)
+                self._derniers_departs[hote] = boucle.time()
+            yield
+
+
+class CrawlerAsync:
+    """
+    Crawler asynchrone : les premières pages de tous les modèles, puis leurs pages restantes entrelacées, sont
+    téléchargées par `concurrence` tâches alimentées par une file bornée.
+
+    À utiliser comme gestionnaire de contexte, qui ferme le client HTTP et les pools de threads.
+    """
+
+    def __init__(self, nombre_pages: int, parametres: ParametresCrawl) -> None:
+        self.nombre_pages = nombre_pages
+        self.parametres = parametres
+        self.pages_extraites = 0
+        self.temps_debut = time.time()
+        self._semaphore_global = asyncio.Semaphore(parametres.concurrence)
+        self._limiteur = LimiteurHotes(
+            parametres.concurrence_par_hote, parametres.delai_min_par_hote
+        )
+        self.extracteur = get_extracteur(parametres.extracteur)
+        self.client = ClientScraping(
+            ParametresClient(
+                connexions_par_hote=max(
+                    parametres.concurrence, parametres.concurrence_par_hote
+                ),
+                base_url=parametres.base_url,
+            ),
+            RegulateurDebit(parametres.regulateur),
+        )
+        # Un thread par requête simultanée : le pool par défaut d'asyncio est limité à min(32, coeurs + 4)
+        self._executeur_reseau = ThreadPoolExecutor(
+            parametres.concurrence, thread_name_prefix="crawler-reseau"
+        )
+        self._executeur_analyse = ThreadPoolExecutor(
+            parametres.concurrence, thread_name_prefix="crawler-analyse"
+        )
+
+    def fermer(self) -> None:
+        """
+        Ferme le client HTTP et les pools de threads du crawler.
+        """
+        self._executeur_reseau.shutdown()
+        self._executeur_analyse.shutdown()
+        self.client.fermer()
+
+    def __enter__(self) -> "CrawlerAsync":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.fermer()
+
+    async def analyser(self, contenu: bytes) -> list[voiture]:
+        """
+        Extrait les voitures d'une page dans le pool de threads d'analyse.
+        """
+        return await asyncio.get_running_loop().run_in_executor(
+            self._executeur_analyse, self.extracteur.extraire, contenu
+        )
+
+    async def telecharger_page(
+        self, numero_page: int, marque: str, modele: str
+    ) -> bytes:
+        """
+        Télécharge le contenu d'une page en respectant les limites de concurrence.
+
+        ## Parameters:
+            numero_page (int): Numéro de la page.
+            marque (str): Nom de la marque.
+            modele (str): Nom du modèle de véhicule.
+
+        ## Raises:
+            rq.ConnectionError: Erreur de connexion en cas d'échec après plusieurs tentatives.
+            ErreurRalentissement: Réponse 429 ou 5xx à la dernière tentative.
+
+        ## Returns:
+            bytes: Contenu HTML de la page.
+        """
+        adresse = construire_adresse(
+            numero_page, marque, modele, self.parametres.base_url
+        )
+        regulateur = self.client.regulateur
+        for tentative in range(self.parametres.max_tentatives):
+            try:
+                async with self._semaphore_global:
+                    async with self._limiteur.reserver(adresse):
+                        reponse = await asyncio.get_running_loop().run_in_executor(
+                            self._executeur_reseau, self.client.get, adresse
+                        )
+            except (rq.ConnectionError, rq.Timeout) as e:
+                print(f"Erreur de connexion : {e}")
+                print("Tentative de reconnexion...")
+                await asyncio.sleep(regulateur.delai_backoff(tentative))
+                continue
+            if est_ralentissement(reponse):
+                if tentative == self.parametres.max_tentatives - 1:
+                    raise ErreurRalentissement(
+                        f"Réponse {reponse.status_code} après {tentative + 1} tentatives.",
+                        response=reponse,
+                    )
+                await asyncio.sleep(
+                    regulateur.delai_backoff(tentative, get_retry_after(reponse))
+                )
+                continue
+            return reponse.content
+        raise rq.ConnectionError("Échec des tentatives de connexion.")
+
+    async def recup_voitures_page(
+        self, numero_page: int, marque: str, modele: str
+    ) -> list[voiture]:
+        """
+        Récupère les voitures d'une page en respectant les limites de concurrence.
+
+        ## Parameters:
+            numero_page (int): Numéro de la page.
+            marque (str): Nom de la marque.
+            modele (str): Nom du modèle de véhicule.
+
+        ## Raises:
+            rq.ConnectionError: Erreur de connexion en cas d'échec après plusieurs tentatives.
+
+        ## Returns:
+            list[voiture]: Liste des voitures présentes sur la page.
+        """
+        contenu = await self.telecharger_page(numero_page, marque, modele)
+        # L'analyse HTML se fait hors des limites de concurrence réseau
+        return await self.analyser(contenu)
+
+    def signaler_page(self) -> None:
+        """
+        Compte une page extraite et affiche l'avancement du scraping.
+        """
+        self.pages_extraites += 1
+        print_info_scraping(
+            self.pages_extraites,
+            time.time() - self.temps_debut,
+            self.client.connexions_reutilisees(),
+        )
+
+    async def executer(
+        self, travaux: Iterable[tuple[Callable[..., Awaitable], ...]]
+    ) -> dict[tuple, object]:
+        """
+        Exécute des travaux avec au plus `concurrence` tâches, alimentées par une file bornée : les travaux sont
+        lus au fur et à mesure, dans l'ordre, et aucune tâche n'est créée par travail.
+
+        ## Parameters:
+            travaux (Iterable[tuple[Callable[..., Awaitable], ...]]): Coroutine à appeler suivie de ses arguments.
+
+        ## Returns:
+            dict[tuple, object]: Résultat de chaque travail, indexé par le travail.
+        """
+        resultats: dict[tuple, object] = {}
+        nombre_taches = self.parametres.concurrence
+        file: asyncio.Queue = asyncio.Queue(maxsize=nombre_taches)
+
+        async def alimenter() -> None:
+            for travail in travaux:
+                await file.put(travail)
+            for _ in range(nombre_taches):
+                await file.put(None)
+
+        async def traiter() -> None:
+            while (travail := await file.get()) is not None:
+                fonction, *arguments = travail
+                resultats[travail] = await fonction(*arguments)
+
+        await asyncio.gather(alimenter(), *(traiter() for _ in range(nombre_taches)))
+        return resultats
+
+    async def decouvrir_modele(
+        self, marque: str, modele: str
+    ) -> tuple[list[voiture], int | None]:
+        """
+        Récupère la première page d'un modèle et le numéro de sa dernière page.
+
+        ## Parameters:
+            marque (str): Nom de la marque.
+            modele (str): Nom du modèle de véhicule.
+
+        ## Returns:
+            tuple[list[voiture], int | None]: Les voitures de la première page et le numéro de la dernière page
+            (0 en cas d'erreur de connexion ou si la première page est vide, None si le nombre de pages est introuvable).
+        """
+        if self.nombre_pages <= 1:
+            return [], 0
+        try:
+            contenu = await self.telecharger_page(1, marque, modele)
+        except rq.ConnectionError:
+            print(f"\nIl y a eu une erreur pour le modèle : {marque} {modele}.")
+            return [], 0
+        voitures_page = await self.analyser(contenu)
+        if voitures_page == []:
+            return [], 0
+        self.signaler_page()
+        nombre_pages_annonce = recup_nombre_pages(contenu)
+        if nombre_pages_annonce is None:
+            return voitures_page, None
+        return voitures_page, min(self.nombre_pages - 1, nombre_pages_annonce)
+
+    async def recup_voitures_page_ou_none(
+        self, numero_page: int, marque: str, modele: str
+    ) -> list[voiture] | None:
+        """
+        Récupère les voitures d'une page, ou None en cas d'erreur de connexion.
+        """
+        try:
+            voitures_page = await self.recup_voitures_page(numero_page, marque, modele)
+        except rq.ConnectionError:
+            print(f"\nIl y a eu une erreur pour le modèle : {marque} {modele}.")
+            return None
+        if voitures_page != []:
+            self.signaler_page()
+        return voitures_page
+
+    async def extraire_modele(
+        self, marque: str, modele: str, premiere_page: int = 1
+    ) -> list[voiture]:
+        """
+        Récupère les voitures d'un modèle, page par page, jusqu'à la première page vide.
+        Utilisé lorsque le nombre de pages du modèle ne peut pas être lu sur sa première page.
+
+        ## Parameters:
+            marque (str): Nom de la marque.
+            modele (str): Nom du modèle de véhicule.
+            premiere_page (int): Numéro de la première page à récupérer.
+
+        ## Returns:
+            list[voiture]: Liste des voitures du modèle, dans l'ordre des pages.
+        """
+        voitures_modele: list[voiture] = []
+        try:
+            for num_page in range(premiere_page, self.nombre_pages, 1):
+                voitures_page = await self.recup_voitures_page(num_page, marque, modele)
+                if voitures_page == []:
+                    break
+                voitures_modele.extend(voitures_page)
+                self.signaler_page()
+        except rq.ConnectionError:
+            print(f"\nIl y a eu une erreur pour le modèle : {marque} {modele}.")
+        return voitures_modele
+
+    async def extraire(
+        self, nom_marques_modeles: list[NomMarquesModeles]
+    ) -> list[voiture]:
+        """
+        Récupère toutes les voitures pour une liste de marques et de modèles.
+
+        Les premières pages de tous les modèles sont demandées d'abord ; les pages restantes sont ensuite
+        demandées entrelacées entre les modèles (page 2 de chaque modèle, puis page 3, ...), par une file
+        bornée (voir `executer`). Aucune requête n'est faite au-delà de la dernière page annoncée.
+
+        ## Parameters:
+            nom_marques_modeles (list[NomMarquesModeles]): Liste contenant les noms des marques et leurs modèles associés.
+
+        ## Returns:
+            list[voiture]: Liste des voitures, dans le même ordre que le scraping séquentiel.
+        """
+        modeles = [
+            (i.marque, modele) for i in nom_marques_modeles for modele in i.modeles
+        ]
+        decouvertes = await self.executer(
+            (self.decouvrir_modele, marque, modele) for marque, modele in modeles
+        )
+        premieres_pages = [
+            decouvertes[(self.decouvrir_modele, marque, modele)]
+            for marque, modele in modeles
+        ]
+        dernieres_pages = [derniere for _, derniere in premieres_pages]
+        derniere_page_max = max(
+            (derniere for derniere in dernieres_pages if derniere is not None),
+            default=0,
+        )
+        # Nombre de pages introuvable : le modèle est parcouru jusqu'à sa première page vide
+        modeles_sans_nombre = (
+            (self.extraire_modele, *modeles[index], 2)
+            for index, derniere in enumerate(dernieres_pages)
+            if derniere is None
+        )
+        pages_restantes = (
+            (self.recup_voitures_page_ou_none, num_page, *modeles[index])
+            for num_page in range(2, derniere_page_max + 1)
+            for index, derniere in enumerate(dernieres_pages)
+            if derniere is not None and num_page <= derniere
+        )
+        resultats = await self.executer(
+            itertools.chain(modeles_sans_nombre, pages_restantes)
+        )
+
+        voitures: list[voiture] = []
+        for (marque, modele), (voitures_premiere_page, derniere) in zip(
+            modeles, premieres_pages
+        ):
+            voitures.extend(voitures_premiere_page)
+            if derniere is None:
+                voitures.extend(resultats[(self.extraire_modele, marque, modele, 2)])
+                continue
+            for num_page in range(2, derniere + 1):
+                voitures_page = resultats[
+                    (self.recup_voitures_page_ou_none, num_page, marque, modele)
+                ]
+                # Comme le scraping séquentiel, un modèle s'arrête à la première page vide ou en erreur
+                if not voitures_page:
+                    break
+                voitures.extend(voitures_page)
+        return voitures
+
+
+def extraire_toutes_voitures_async(
+    nombre_pages: int,
+    nom_marques_modeles: list[NomMarquesModeles],
+    parametres: ParametresCrawl | None = None,
+) -> list[voiture]:
+    """
+    Récupère de manière asynchrone toutes les voitures pour une liste de marques et de modèles.
+
+    ## Parameters:
+        nombre_pages (int): Limite du nombre de pages extraites pour chaque marque et modèle.
+        nom_marques_modeles (list[NomMarquesModeles]): Liste contenant les noms des marques et leurs modèles associés.
+        parametres (ParametresCrawl | None): Limites de concurrence et de politesse. Valeurs par défaut si None.
+
+    ## Returns:
+        list[voiture]: Liste des voitures extraites, exportable avec `export_to_json`.
+
+    ## Example(s):
+        >>> parametres = ParametresCrawl(concurrence=16, concurrence_par_hote=8, delai_min_par_hote=0.05)
+        >>> voitures = extraire_toutes_voitures_async(10, import_marques_modeles(), parametres)
+        >>> export_to_json(voitures, "json/voitures.json")
+    """
+    if parametres is None:
+        parametres = ParametresCrawl()
+
+    async def lancer() -> list[voiture]:
+        with CrawlerAsync(nombre_pages, parametres) as crawler:
+            return await crawler.extraire(nom_marques_modeles)
+
+    voitures = asyncio.run(lancer())
+    print(f"\nNombre total d'annonces extraites : {len(voitures)}")
+    return voitures
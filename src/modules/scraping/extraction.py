@@ -0,0 +1,181 @@
+"""
+Module des moteurs d'extraction des annonces.
+
+Un moteur d'extraction transforme le contenu HTML d'une page d'annonces en une liste d'objets "voiture" :
+
+- `ExtracteurClassique` : analyse toute la page avec `html.parser` puis appelle chaque fonction `recup_*`
+  (une recherche `find_all` par champ).
+- `ExtracteurRapide` : n'analyse que les sous-arbres `searchCardContainer` (SoupStrainer), avec `lxml` s'il est
+  installé, et récupère tous les champs d'une annonce en un seul parcours.
+"""
+
+from abc import ABC, abstractmethod
+from bs4 import BeautifulSoup, SoupStrainer
+from bs4.element import Tag
+from src.modules.scraping.webscraping import (
+    URL_LACENTRALE,
+    voiture,
+    recup_annonces,
+    recup_data_voitures,
+)
+
+try:
+    import lxml  # noqa: F401
+
+    PARSER_RAPIDE = "lxml"
+except ImportError:
+    PARSER_RAPIDE = "html.parser"
+
+CLASSE_NOM = "Text_Text_text Vehiculecard_Vehiculecard_title Text_Text_subtitle2"
+CLASSE_CYLINDRE = "Text_Text_text Vehiculecard_Vehiculecard_subTitle Text_Text_body2"
+CLASSE_CARACTERISTIQUE = (
+    "Text_Text_text Vehiculecard_Vehiculecard_characteristicsItems Text_Text_body2"
+)
+CLASSE_PRIX = "Text_Text_text Vehiculecard_Vehiculecard_price Text_Text_subtitle2"
+CLASSE_LABEL = "Text_Text_text Text_Text_bold Text_Text_label2"
+CLASSE_LIEN = "Vehiculecard_Vehiculecard_vehiculeCard Containers_Containers_containers Containers_Containers_borderRadius Containers_Containers_darkShadowWide"
+
+
+class ExtracteurAnnonces(ABC):
+    """
+    Interface d'un moteur d'extraction : transforme le contenu d'une page en objets voiture.
+    """
+
+    nom = "abstrait"
+
+    @abstractmethod
+    def extraire(self, contenu: str | bytes) -> list[voiture]:
+        """
+        Extrait les voitures d'une page d'annonces.
+
+        ## Parameters:
+            contenu (str | bytes): Contenu HTML de la page.
+
+        ## Returns:
+            list[voiture]: Liste des voitures présentes sur la page, dans l'ordre de la page.
+        """
+
+
+class ExtracteurClassique(ExtracteurAnnonces):
+    """
+    Moteur d'extraction historique : `recup_annonces` puis `recup_data_voitures` sur toute la page.
+    """
+
+    nom = "classique"
+
+    def extraire(self, contenu: str | bytes) -> list[voiture]:
+        page = BeautifulSoup(contenu, "html.parser")
+        voitures = recup_data_voitures(recup_annonces(page))
+        page.decompose()
+        return voitures
+
+
+def extraire_carte(annonce: Tag) -> voiture:
+    """
+    Récupère tous les champs d'une annonce en un seul parcours de ses balises.
+
+    Le résultat est identique à `recup_informations_voiture`, y compris dans les cas dégradés
+    (caractéristiques incomplètes, garantie ou lien absents).
+
+    ## Parameters:
+        annonce (Tag): Balise HTML d'une annonce de vente de voiture.
+
+    ## Raises:
+        IndexError: Si le nom, le cylindre, le prix ou la position sur le marché sont absents de l'annonce.
+
+    ## Returns:
+        voiture: Objet représentant les informations extraites de l'annonce.
+    """
+    noms, cylindres, prix, labels, caracteristiques = [], [], [], [], []
+    lien = None
+    for balise in annonce.find_all(True):
+        classes = balise.get("class")
+        if not classes:
+            continue
+        classe = " ".join(classes)
+        if balise.name == "div":
+            if classe == CLASSE_CARACTERISTIQUE:
+                caracteristiques.append(balise.text)
+            elif classe == CLASSE_LABEL:
+                labels.append(balise.text)
+            elif classe == CLASSE_CYLINDRE:
+                cylindres.append(balise.text)
+        elif balise.name == "h2" and classe == CLASSE_NOM:
+            noms.append(balise.text)
+        elif balise.name == "span" and classe == CLASSE_PRIX:
+            prix.append(balise.text)
+        elif balise.name == "a" and lien is None and classe == CLASSE_LIEN:
+            lien = URL_LACENTRALE + str(balise.get("href"))
+
+    if len(caracteristiques) == 4:
+        annee, kilometrage, boite, energie = caracteristiques
+    else:
+        annee, kilometrage, boite = (
+            caracteristiques[0],
+            caracteristiques[1],
+            caracteristiques[2],
+        )
+        energie = "erreur"
+    return voiture(
+        marque=noms[0],
+        cylindre=cylindres[0],
+        annee=annee,
+        kilometrage=kilometrage,
+        boite=boite,
+        energie=energie,
+        prix=prix[0],
+        position_marché=labels[0],
+        garantie=str(labels[1]) if len(labels) >= 2 else "NA",
+        lien=lien if lien is not None else "NA",
+    )
+
+
+class ExtracteurRapide(ExtracteurAnnonces):
+    """
+    Moteur d'extraction rapide : seules les annonces sont analysées, chacune en un seul parcours.
+    """
+
+    nom = "rapide"
+
+    def __init__(self, parser: str = PARSER_RAPIDE) -> None:
+        self.parser = parser
+        self.filtre = SoupStrainer("div", class_="searchCardContainer")
+
+    def extraire(self, contenu: str | bytes) -> list[voiture]:
+        page = BeautifulSoup(contenu, self.parser, parse_only=self.filtre)
+        voitures = [
+            extraire_carte(annonce)
+            for annonce in page.find_all("div", class_="searchCardContainer")
+        ]
+        page.decompose()
+        return voitures
+
+
+EXTRACTEURS = {
+    ExtracteurClassique.nom: ExtracteurClassique,
+    ExtracteurRapide.nom: ExtracteurRapide,
+}
+
+
+def get_extracteur(nom: str = "rapide") -> ExtracteurAnnonces:
+    """
+    Renvoie le moteur d'extraction correspondant au nom donné.
+
+    ## Parameters:
+        nom (str): Nom du moteur ("classique" ou "rapide").
+
+    ## Raises:
+        ValueError: Si le nom ne correspond à aucun moteur.
+
+    ## Returns:
+        ExtracteurAnnonces: Le moteur d'extraction.
+
+    ## Example(s):
+        >>> get_extracteur("rapide").extraire(Path("pages/exemple_annonces.html").read_bytes())
+        ... [voiture(marque='CITROEN C3 III', ...), ...]
+    """
+    if nom not in EXTRACTEURS:
+        raise ValueError(
+            f"Moteur d'extraction inconnu : {nom}. Moteurs disponibles : {list(EXTRACTEURS)}."
+        )
+    return EXTRACTEURS[nom]()
@@ -0,0 +1,312 @@
+"""
+Module de scraping incrémental.
+
+Un index des annonces connues (clé : `lien`) garde pour chaque annonce la marque et le modèle recherchés,
+le prix, la position sur le marché et la date de dernière observation. Un scraping incrémental arrête
+de parcourir un modèle dès qu'une page ne contient que des annonces déjà connues et inchangées, et écrit
+les différences avec l'index dans un fichier delta NDJSON :
+
+- `ajout` : nouvelle annonce (objet voiture complet) ;
+- `modification` : prix ou position sur le marché modifiés (objet voiture complet) ;
+- `suppression` : annonce de l'index absente d'un modèle parcouru jusqu'à sa dernière page.
+
+Un modèle n'est parcouru jusqu'à sa dernière page que si la page vide qui suit la dernière page a été atteinte,
+ou si le nombre de pages annoncé par la première page ne dépasse pas la limite `nombre_pages`. Un modèle
+arrêté par la limite ou par une erreur de téléchargement ne produit aucune suppression.
+
+L'arrêt anticipé ne voit jamais les annonces des pages suivantes : une annonce retirée n'y serait jamais
+supprimée. Un modèle dont une annonce de l'index n'a pas été vue depuis `jours_passage_complet` jours est donc
+parcouru sans arrêt anticipé, ce qui rafraîchit la date de ses annonces et supprime celles qui ont disparu.
+"""
+
+import datetime
+import json
+import os
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+import polars as pl
+import requests as rq
+from src.modules.scraping.webscraping import (
+    NomMarquesModeles,
+    ClientScraping,
+    telecharger_page,
+    get_derniere_page,
+    recup_nombre_pages,
+    print_info_scraping,
+)
+from src.modules.scraping.extraction import ExtracteurAnnonces, ExtracteurClassique
+
+
+@dataclass
+class EntreeIndex:
+    marque: str
+    modele: str
+    prix: str
+    position_marché: str
+    derniere_vue: str
+
+
+@dataclass
+class BilanIncremental:
+    ajouts: int = 0
+    modifications: int = 0
+    suppressions: int = 0
+    pages_extraites: int = 0
+    modeles_complets: int = 0
+
+
+class IndexAnnonces:
+    """
+    Index des annonces connues, enregistré au format Parquet.
+
+    ## Example(s):
+        >>> index = IndexAnnonces("data/index_annonces.parquet")
+        >>> bilan = scraping_incremental(100, import_marques_modeles(), index, "json/delta.ndjson")
+        >>> index.sauvegarder()
+    """
+
+    def __init__(self, chemin: str | Path) -> None:
+        """
+        Charge l'index existant.
+
+        ## Parameters:
+            chemin (str | Path): Chemin du fichier Parquet de l'index.
+        """
+        self.chemin = Path(chemin)
+        self.annonces: dict[str, EntreeIndex] = {}
+        # Liens de chaque (marque, modèle), dans l'ordre d'ajout (dictionnaire utilisé comme ensemble ordonné)
+        self._liens_modeles: dict[tuple[str, str], dict[str, None]] = {}
+        if self.chemin.exists():
+            for ligne in pl.read_parquet(self.chemin).iter_rows(named=True):
+                lien = ligne.pop("lien")
+                self.ajouter(lien, EntreeIndex(**ligne))
+
+    def __len__(self) -> int:
+        return len(self.annonces)
+
+    def __contains__(self, lien: str) -> bool:
+        return lien in self.annonces
+
+    def ajouter(self, lien: str, entree: EntreeIndex) -> None:
+        """
+        Ajoute une annonce à l'index.
+        """
+        self.annonces[lien] = entree
+        self._liens_modeles.setdefault((entree.marque, entree.modele), {})[lien] = None
+
+    def supprimer(self, lien: str) -> None:
+        """
+        Retire une annonce de l'index.
+        """
+        entree = self.annonces.pop(lien)
+        del self._liens_modeles[(entree.marque, entree.modele)][lien]
+
+    def liens_modele(self, marque: str, modele: str) -> list[str]:
+        """
+        Renvoie les liens des annonces connues d'un modèle, sans parcourir tout l'index.
+        """
+        return list(self._liens_modeles.get((marque, modele), {}))
+
+    def plus_ancienne_vue(self, marque: str, modele: str) -> str | None:
+        """
+        Renvoie la date de dernière observation la plus ancienne des annonces d'un modèle (None si aucune annonce).
+        """
+        return min(
+            (
+                self.annonces[lien].derniere_vue
+                for lien in self.liens_modele(marque, modele)
+            ),
+            default=None,
+        )
+
+    def sauvegarder(self) -> None:
+        """
+        Écrit l'index sur disque (fichier temporaire puis renommage, pour ne jamais laisser un index à moitié écrit).
+        """
+        donnees = pl.DataFrame(
+            [
+                {"lien": lien, **asdict(entree)}
+                for lien, entree in self.annonces.items()
+            ],
+            schema={
+                "lien": pl.Utf8,
+                "marque": pl.Utf8,
+                "modele": pl.Utf8,
+                "prix": pl.Utf8,
+                "position_marché": pl.Utf8,
+                "derniere_vue": pl.Utf8,
+            },
+        )
+        chemin_temporaire = self.chemin.with_name(self.chemin.name + ".tmp")
+        donnees.write_parquet(chemin_temporaire)
+        os.replace(chemin_temporaire, self.chemin)
+
+
+def scraping_incremental(
+    nombre_pages: int,
+    nom_marques_modeles: list[NomMarquesModeles],
+    index: IndexAnnonces,
+    chemin_delta: str | Path,
+    client: ClientScraping | None = None,
+    extracteur: ExtracteurAnnonces | None = None,
+    date: str | None = None,
+    jours_passage_complet: int = 7,
+) -> BilanIncremental:
+    """
+    Met à jour l'index des annonces en ne téléchargeant que les pages contenant des annonces nouvelles ou modifiées.
+
+    Un modèle est parcouru jusqu'à la première page dont toutes les annonces sont déjà connues et inchangées,
+    sauf si une de ses annonces n'a pas été vue depuis `jours_passage_complet` jours : il est alors parcouru
+    en entier (dans la limite `nombre_pages`).
+    Les suppressions ne sont détectées que pour les modèles parcourus jusqu'à leur dernière page : jamais pour
+    un modèle arrêté par la limite `nombre_pages` ou par une erreur de téléchargement.
+    Les annonces sans lien ne peuvent pas être indexées : elles sont toujours écrites comme des ajouts.
+
+    ## Parameters:
+        nombre_pages (int): Limite du nombre de pages extraites pour chaque marque et modèle.
+        nom_marques_modeles (list[NomMarquesModeles]): Liste contenant les noms des marques et leurs modèles associés.
+        index (IndexAnnonces): Index des annonces connues, mis à jour en mémoire (à sauvegarder ensuite).
+        chemin_delta (str | Path): Chemin du fichier delta NDJSON.
+        client (ClientScraping | None): Client HTTP partagé par toutes les requêtes. Un client est créé si None.
+        extracteur (ExtracteurAnnonces | None): Moteur d'extraction des annonces. `ExtracteurClassique` si None.
+        date (str | None): Date du scraping (AAAA-MM-JJ). Date du jour si None.
+        jours_passage_complet (int): Ancienneté (en jours) de la dernière observation d'une annonce à partir de
+            laquelle son modèle est parcouru sans arrêt anticipé.
+
+    ## Returns:
+        BilanIncremental: Nombre d'ajouts, de modifications, de suppressions et de pages extraites.
+
+    ## Example(s):
+        >>> index = IndexAnnonces("data/index_annonces.parquet")
+        >>> scraping_incremental(100, import_marques_modeles(), index, "json/delta.ndjson")
+        ... BilanIncremental(ajouts=1250, modifications=310, suppressions=980, pages_extraites=412, modeles_complets=35)
+        >>> index.sauvegarder()
+    """
+    if client is None:
+        with ClientScraping() as client_temporaire:
+            return scraping_incremental(
+                nombre_pages,
+                nom_marques_modeles,
+                index,
+                chemin_delta,
+                client_temporaire,
+                extracteur,
+                date,
+                jours_passage_complet,
+            )
+    if extracteur is None:
+        extracteur = ExtracteurClassique()
+    if date is None:
+        date = time.strftime("%Y-%m-%d")
+    limite_vue = (
+        datetime.date.fromisoformat(date)
+        - datetime.timedelta(days=jours_passage_complet)
+    ).isoformat()
+    bilan = BilanIncremental()
+    temps_debut = time.time()
+
+    with open(chemin_delta, "w", encoding="utf-8") as delta:
+
+        def ecrire(operation: str, donnees: dict) -> None:
+            delta.write(
+                json.dumps({"operation": operation, **donnees}, ensure_ascii=False)
+                + "\n"
+            )
+
+        try:
+            for i in nom_marques_modeles:
+                marque = i.marque
+                for modele in i.modeles:
+                    # Liens ajoutés pendant ce scraping : une annonce qui réapparaît sur une page suivante
+                    # (décalage des résultats) n'est pas considérée comme connue
+                    nouveaux: set[str] = set()
+                    vus: set[str] = set()
+                    complet = False
+                    # Dates au format AAAA-MM-JJ : l'ordre des chaînes est celui des dates
+                    plus_ancienne_vue = index.plus_ancienne_vue(marque, modele)
+                    passage_complet = (
+                        plus_ancienne_vue is not None
+                        and plus_ancienne_vue <= limite_vue
+                    )
+                    derniere_page = nombre_pages - 1
+                    nombre_pages_annonce = None
+                    num_page = 1
+                    while num_page <= derniere_page:
+                        # Une erreur de téléchargement lève une exception : le modèle reste incomplet
+                        contenu = telecharger_page(num_page, marque, modele, client)
+                        if num_page == 1:
+                            nombre_pages_annonce = recup_nombre_pages(contenu)
+                            derniere_page = get_derniere_page(contenu, nombre_pages)
+                        voitures_page = extracteur.extraire(contenu)
+                        if voitures_page == []:
+                            complet = True
+                            break
+                        bilan.pages_extraites += 1
+                        print_info_scraping(
+                            bilan.pages_extraites,
+                            time.time() - temps_debut,
+                            client.connexions_reutilisees(),
+                        )
+                        page_connue = True
+                        for v in voitures_page:
+                            if v.lien == "NA":
+                                page_connue = False
+                                ecrire("ajout", asdict(v))
+                                bilan.ajouts += 1
+                                continue
+                            vus.add(v.lien)
+                            entree = index.annonces.get(v.lien)
+                            if entree is None:
+                                page_connue = False
+                                nouveaux.add(v.lien)
+                                ecrire("ajout", asdict(v))
+                                bilan.ajouts += 1
+                                entree = EntreeIndex(
+                                    marque, modele, v.prix, v.position_marché, date
+                                )
+                                index.ajouter(v.lien, entree)
+                            elif (entree.prix, entree.position_marché) != (
+                                v.prix,
+                                v.position_marché,
+                            ):
+                                page_connue = False
+                                ecrire("modification", asdict(v))
+                                bilan.modifications += 1
+                                entree.prix = v.prix
+                                entree.position_marché = v.position_marché
+                            elif v.lien in nouveaux:
+                                page_connue = False
+                            entree.derniere_vue = date
+                        if page_connue and not passage_complet:
+                            break
+                        num_page += 1
+                    else:
+                        # Sans page vide, la dernière page parcourue n'est la dernière du modèle
+                        # que si le site annonce au plus `nombre_pages - 1` pages
+                        complet = (
+                            nombre_pages_annonce is not None
+                            and nombre_pages_annonce <= nombre_pages - 1
+                        )
+
+                    if complet:
+                        bilan.modeles_complets += 1
+                        for lien in index.liens_modele(marque, modele):
+                            if lien not in vus:
+                                ecrire(
+                                    "suppression",
+                                    {"lien": lien, "marque": marque, "modele": modele},
+                                )
+                                bilan.suppressions += 1
+                                index.supprimer(lien)
+        except rq.ConnectionError:
+            print(
+                f"""
+                \nIl y a eu une erreur au bout de : {bilan.pages_extraites + 1} extraites.
+                """
+            )
+
+    print(
+        f"\nAjouts : {bilan.ajouts} | Modifications : {bilan.modifications} | Suppressions : {bilan.suppressions}"
+    )
+    return bilan
@@ -0,0 +1,381 @@
+"""
+Module de scraping des voitures en pipeline.
+
+Contrairement à `extraire_toutes_annonces` qui conserve les balises HTML de toutes les pages, les fonctions de ce module
+forment un pipeline de générateurs (téléchargement → analyse → extraction des objets "voiture") : chaque page est
+libérée dès que ses voitures sont extraites, et la progression peut être enregistrée dans un journal de reprise.
+
+Le mode `generer_voitures_parallele` découple le réseau de l'analyse HTML : un thread télécharge les pages
+et les dépose dans une file, et un pool de processus analyse les pages en parallèle.
+
+Le mode `rejouer_archive` relit les pages d'une archive locale (`ArchivePages`) sans aucune requête réseau.
+"""
+
+import os
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+import requests as rq
+from src.modules.scraping.webscraping import (
+    NomMarquesModeles,
+    ClientScraping,
+    voiture,
+    telecharger_page,
+    get_derniere_page,
+    recup_nombre_pages,
+    print_info_scraping,
+)
+from src.modules.scraping.checkpoint import JournalReprise
+from src.modules.scraping.archive import ArchivePages
+from src.modules.scraping.extraction import (
+    ExtracteurAnnonces,
+    ExtracteurClassique,
+    get_extracteur,
+)
+
+MARQUEUR_ANNONCE = b'class="searchCardContainer'
+
+
+def generer_voitures(
+    nombre_pages: int,
+    nom_marques_modeles: list[NomMarquesModeles],
+    client: ClientScraping | None = None,
+    journal: JournalReprise | None = None,
+    extracteur: ExtracteurAnnonces | None = None,
+    archive: ArchivePages | None = None,
+) -> Iterator[voiture]:
+    """
+    Génère au fur et à mesure les voitures pour une liste de marques et de modèles sur un certain nombre de pages.
+
+    Une seule page est gardée en mémoire à la fois : l'arbre HTML est libéré dès que ses voitures sont extraites.
+    Le nombre de pages de chaque modèle est lu sur sa première page : seules les pages annoncées sont demandées.
+    Ce nombre est enregistré dans le journal avec la première page et relu lorsqu'elle est reprise.
+    Si un journal de reprise est fourni, chaque page extraite y est enregistrée et les pages déjà présentes
+    dans le journal ne sont pas retéléchargées : un scraping interrompu reprend exactement là où il s'est arrêté.
+
+    ## Parameters:
+        nombre_pages (int): Limite du nombre de pages extraites pour chaque marque et modèle.
+        nom_marques_modeles (list[NomMarquesModeles]): Liste contenant les noms des marques et leurs modèles associés.
+        client (ClientScraping | None): Client HTTP partagé par toutes les requêtes. Un client est créé si None.
+        journal (JournalReprise | None): Journal de reprise. Aucune reprise possible si None.
+        extracteur (ExtracteurAnnonces | None): Moteur d'extraction des annonces. `ExtracteurClassique` si None.
+        archive (ArchivePages | None): Archive locale où les pages téléchargées sont enregistrées.
+
+    ## Returns:
+        Iterator[voiture]: Les voitures extraites (y compris celles reprises du journal), page par page.
+
+    ## Example(s):
+        >>> voitures = generer_voitures(100, import_marques_modeles())
+        >>> exporter_ndjson(voitures, "json/voitures.ndjson")
+    """
+    if client is None:
+        with ClientScraping() as client_temporaire:
+            yield from generer_voitures(
+                nombre_pages,
+                nom_marques_modeles,
+                client_temporaire,
+                journal,
+                extracteur,
+                archive,
+            )
+        return None
+    if extracteur is None:
+        extracteur = ExtracteurClassique()
+    nombre_voitures = 0
+    pages_extraites = 0
+    temps_debut = time.time()
+    try:
+        for i in nom_marques_modeles:
+            marque = i.marque
+            for modele in i.modeles:
+                if journal is not None and journal.modele_termine(marque, modele):
+                    for num_page in journal.pages_modele(marque, modele):
+                        voitures_page = journal.voitures_page(marque, modele, num_page)
+                        nombre_voitures += len(voitures_page)
+                        yield from voitures_page
+                    continue
+                derniere_page = nombre_pages - 1
+                num_page = 1
+                while num_page <= derniere_page:
+                    if journal is not None and journal.page_faite(
+                        marque, modele, num_page
+                    ):
+                        if num_page == 1:
+                            # Première page reprise : le nombre de pages annoncé est relu dans le journal
+                            nombre_pages_annonce = journal.nombre_pages_annonce(
+                                marque, modele
+                            )
+                            if nombre_pages_annonce is not None:
+                                derniere_page = min(
+                                    nombre_pages - 1, nombre_pages_annonce
+                                )
+                        voitures_page = journal.voitures_page(marque, modele, num_page)
+                        nombre_voitures += len(voitures_page)
+                        yield from voitures_page
+                        num_page += 1
+                        continue
+                    # Une réponse en erreur lève une exception : le modèle n'est pas marqué terminé
+                    # et sera repris au prochain lancement
+                    contenu = telecharger_page(
+                        num_page, marque, modele, client, archive
+                    )
+                    nombre_pages_annonce = None
+                    if num_page == 1:
+                        # Seules les pages annoncées par la première page sont demandées
+                        nombre_pages_annonce = recup_nombre_pages(contenu)
+                        if nombre_pages_annonce is not None:
+                            derniere_page = min(nombre_pages - 1, nombre_pages_annonce)
+                    voitures_page = extracteur.extraire(contenu)
+                    if voitures_page == []:
+                        break
+                    if journal is not None:
+                        journal.enregistrer_page(
+                            marque,
+                            modele,
+                            num_page,
+                            voitures_page,
+                            nombre_pages_annonce,
+                        )
+                    pages_extraites += 1
+                    print_info_scraping(
+                        pages_extraites,
+                        time.time() - temps_debut,
+                        client.connexions_reutilisees(),
+                    )
+                    nombre_voitures += len(voitures_page)
+                    yield from voitures_page
+                    num_page += 1
+                # Page vide ou dernière page atteinte
+                if journal is not None:
+                    journal.enregistrer_fin_modele(marque, modele)
+    except rq.ConnectionError:
+        print(
+            f"""
+            \nIl y a eu une erreur au bout de : {pages_extraites + 1} extraites.
+            """
+        )
+
+    print(f"\nNombre total d'annonces extraites : {nombre_voitures}")
+
+
+def extraire_toutes_voitures(
+    nombre_pages: int,
+    nom_marques_modeles: list[NomMarquesModeles],
+    client: ClientScraping | None = None,
+    journal: JournalReprise | None = None,
+    extracteur: ExtracteurAnnonces | None = None,
+    archive: ArchivePages | None = None,
+) -> list[voiture]:
+    """
+    Récupère toutes les voitures pour une liste de marques et de modèles sur un certain nombre de pages.
+
+    ## Parameters:
+        nombre_pages (int): Limite du nombre de pages extraites pour chaque marque et modèle.
+        nom_marques_modeles (list[NomMarquesModeles]): Liste contenant les noms des marques et leurs modèles associés.
+        client (ClientScraping | None): Client HTTP partagé par toutes les requêtes. Un client est créé si None.
+        journal (JournalReprise | None): Journal de reprise. Aucune reprise possible si None.
+        extracteur (ExtracteurAnnonces | None): Moteur d'extraction des annonces. `ExtracteurClassique` si None.
+        archive (ArchivePages | None): Archive locale où les pages téléchargées sont enregistrées.
+
+    ## Returns:
+        list[voiture]: Liste des voitures extraites (y compris celles reprises du journal).
+
+    ## Example(s):
+        >>> with JournalReprise("json/journal.ndjson") as journal:
+        ...     voitures = extraire_toutes_voitures(100, import_marques_modeles(), journal=journal)
+        >>> export_to_json(voitures, "json/voitures.json")
+    """
+    return list(
+        generer_voitures(
+            nombre_pages, nom_marques_modeles, client, journal, extracteur, archive
+        )
+    )
+
+
+def analyser_page(contenu: bytes, nom_extracteur: str = "classique") -> list[voiture]:
+    """
+    Extrait les voitures d'une page téléchargée. Fonction exécutée dans les processus du pool.
+
+    ## Parameters:
+        contenu (bytes): Contenu HTML de la page.
+        nom_extracteur (str): Nom du moteur d'extraction ("classique" : `recup_annonces` puis `recup_data_voitures`).
+
+    ## Returns:
+        list[voiture]: Liste des voitures présentes sur la page.
+    """
+    return get_extracteur(nom_extracteur).extraire(contenu)
+
+
+def telecharger_pages(
+    nombre_pages: int,
+    nom_marques_modeles: list[NomMarquesModeles],
+    client: ClientScraping,
+    file_pages: queue.Queue,
+    arret: threading.Event,
+    archive: ArchivePages | None = None,
+) -> None:
+    """
+    Télécharge les pages de chaque modèle et dépose leur contenu brut dans la file. Exécutée dans un thread dédié.
+
+    Le nombre de pages de chaque modèle est lu sur sa première page ; un modèle s'arrête aussi
+    à la première page sans annonce, détectée sans analyser le HTML.
+    `None` est déposé dans la file à la fin du téléchargement.
+
+    ## Parameters:
+        nombre_pages (int): Limite du nombre de pages extraites pour chaque marque et modèle.
+        nom_marques_modeles (list[NomMarquesModeles]): Liste contenant les noms des marques et leurs modèles associés.
+        client (ClientScraping): Client HTTP partagé par toutes les requêtes.
+        file_pages (queue.Queue): File des contenus de pages à analyser.
+        arret (threading.Event): Événement signalant que le consommateur s'est arrêté.
+        archive (ArchivePages | None): Archive locale où les pages téléchargées sont enregistrées.
+    """
+    pages_extraites = 0
+    temps_debut = time.time()
+    try:
+        for i in nom_marques_modeles:
+            for modele in i.modeles:
+                derniere_page = nombre_pages - 1
+                for num_page in range(1, nombre_pages, 1):
+                    if arret.is_set():
+                        return None
+                    if num_page > derniere_page:
+                        break
+                    contenu = telecharger_page(
+                        num_page, i.marque, modele, client, archive
+                    )
+                    if num_page == 1:
+                        derniere_page = get_derniere_page(contenu, nombre_pages)
+                    if MARQUEUR_ANNONCE not in contenu:
+                        break
+                    file_pages.put(contenu)
+                    pages_extraites += 1
+                    print_info_scraping(
+                        pages_extraites,
+                        time.time() - temps_debut,
+                        client.connexions_reutilisees(),
+                    )
+    except rq.ConnectionError:
+        print(
+            f"""
+            \nIl y a eu une erreur au bout de : {pages_extraites + 1} extraites.
+            """
+        )
+    finally:
+        file_pages.put(None)
+    return None
+
+
+def generer_voitures_parallele(
+    nombre_pages: int,
+    nom_marques_modeles: list[NomMarquesModeles],
+    client: ClientScraping | None = None,
+    nombre_workers: int | None = None,
+    nom_extracteur: str = "classique",
+    archive: ArchivePages | None = None,
+) -> Iterator[voiture]:
+    """
+    Génère les voitures en analysant les pages dans un pool de processus pendant que le réseau reste occupé.
+
+    Les voitures sont renvoyées dans l'ordre des pages, quel que soit l'ordre de fin des analyses :
+    le résultat est identique à celui de `generer_voitures`.
+
+    ## Parameters:
+        nombre_pages (int): Limite du nombre de pages extraites pour chaque marque et modèle.
+        nom_marques_modeles (list[NomMarquesModeles]): Liste contenant les noms des marques et leurs modèles associés.
+        client (ClientScraping | None): Client HTTP partagé par toutes les requêtes. Un client est créé si None.
+        nombre_workers (int | None): Nombre de processus d'analyse. Nombre de coeurs si None.
+        nom_extracteur (str): Nom du moteur d'extraction utilisé par les processus.
+        archive (ArchivePages | None): Archive locale où les pages téléchargées sont enregistrées.
+
+    ## Returns:
+        Iterator[voiture]: Les voitures extraites, page par page.
+
+    ## Example(s):
+        >>> voitures = generer_voitures_parallele(100, import_marques_modeles(), nombre_workers=4)
+        >>> exporter_ndjson(voitures, "json/voitures.ndjson")
+    """
+    if client is None:
+        with ClientScraping() as client_temporaire:
+            yield from generer_voitures_parallele(
+                nombre_pages,
+                nom_marques_modeles,
+                client_temporaire,
+                nombre_workers,
+                nom_extracteur,
+                archive,
+            )
+        return None
+    if nombre_workers is None:
+        nombre_workers = os.cpu_count() or 1
+    # La file bornée limite le nombre de pages téléchargées en attente d'analyse
+    file_pages: queue.Queue = queue.Queue(maxsize=2 * nombre_workers)
+    arret = threading.Event()
+    telechargement = threading.Thread(
+        target=telecharger_pages,
+        args=(nombre_pages, nom_marques_modeles, client, file_pages, arret, archive),
+        daemon=True,
+    )
+    nombre_voitures = 0
+    with ProcessPoolExecutor(max_workers=nombre_workers) as pool:
+        telechargement.start()
+        analyses: deque[Future] = deque()
+        try:
+            while True:
+                contenu = file_pages.get()
+                if contenu is None:
+                    break
+                analyses.append(pool.submit(analyser_page, contenu, nom_extracteur))
+                while len(analyses) > nombre_workers or (
+                    analyses and analyses[0].done()
+                ):
+                    voitures_page = analyses.popleft().result()
+                    nombre_voitures += len(voitures_page)
+                    yield from voitures_page
+            while analyses:
+                voitures_page = analyses.popleft().result()
+                nombre_voitures += len(voitures_page)
+                yield from voitures_page
+        finally:
+            arret.set()
+            # Libère le thread de téléchargement s'il attend une place dans la file
+            while telechargement.is_alive():
+                try:
+                    file_pages.get(timeout=0.1)
+                except queue.Empty:
+                    pass
+    print(f"\nNombre total d'annonces extraites : {nombre_voitures}")
+
+
+def rejouer_archive(
+    archive: ArchivePages,
+    extracteur: ExtracteurAnnonces | None = None,
+    execution: str | None = None,
+) -> Iterator[voiture]:
+    """
+    Génère les voitures des pages d'une exécution archivée, sans aucune requête réseau.
+
+    Seules les pages d'une exécution sont relues : une page qu'une exécution plus ancienne (et plus longue)
+    a été seule à télécharger n'est pas mélangée à une exécution récente. Les pages sont relues dans l'ordre
+    du scraping, en ne gardant que la dernière version de chaque page ; les pages sans annonce sont ignorées.
+
+    ## Parameters:
+        archive (ArchivePages): Archive des pages HTML brutes.
+        extracteur (ExtracteurAnnonces | None): Moteur d'extraction des annonces. `ExtracteurClassique` si None
+            (`recup_annonces` puis `recup_data_voitures`).
+        execution (str | None): Identifiant de l'exécution relue (voir `ArchivePages.executions`). La plus
+            récente si None.
+
+    ## Returns:
+        Iterator[voiture]: Les voitures extraites, page par page.
+
+    ## Example(s):
+        >>> voitures = rejouer_archive(ArchivePages("archive"), get_extracteur("rapide"))
+        >>> exporter_ndjson(voitures, "json/voitures.ndjson")
+    """
+    if extracteur is None:
+        extracteur = ExtracteurClassique()
+    for entree in archive.entrees(execution=execution):
+        yield from extracteur.extraire(archive.lire(entree["sha256"]))
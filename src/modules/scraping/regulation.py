@@ -0,0 +1,176 @@
+"""
+Module de régulation adaptative du débit de requêtes.
+
+Le régulateur combine un seau à jetons (débit maximal de requêtes par seconde) et un contrôle AIMD :
+le débit augmente de façon additive tant que le site répond vite, et diminue de façon multiplicative
+en cas de latence élevée, de réponse HTTP 429/5xx ou d'erreur de connexion. Les nouvelles tentatives
+attendent un délai exponentiel avec gigue.
+"""
+
+import random
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass
+class ParametresRegulateur:
+    debit_initial: float = 5.0
+    debit_min: float = 0.1
+    debit_max: float = 50.0
+    capacite: float = 5.0
+    increment: float = 0.2
+    facteur_reduction: float = 0.5
+    latence_cible: float = 2.0
+    delai_reduction: float = 2.0
+    lissage_latence: float = 0.2
+    delai_base: float = 1.0
+    delai_max: float = 120.0
+
+
+@dataclass
+class EtatRegulateur:
+    debit: float
+    jetons: float
+    latence_moyenne: float | None
+    succes: int
+    ralentissements: int
+    erreurs: int
+
+
+class RegulateurDebit:
+    """
+    Régulateur de débit adaptatif (seau à jetons + AIMD), partagé entre les threads d'un scraping.
+
+    ## Example(s):
+        >>> regulateur = RegulateurDebit(ParametresRegulateur(debit_initial=2, debit_max=10))
+        >>> client = ClientScraping(regulateur=regulateur)
+        >>> regulateur.etat()
+        ... EtatRegulateur(debit=2.0, jetons=5.0, latence_moyenne=None, succes=0, ralentissements=0, erreurs=0)
+    """
+
+    def __init__(
+        self,
+        parametres: ParametresRegulateur | None = None,
+        horloge: Callable[[], float] = time.monotonic,
+        dormir: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.parametres = (
+            parametres if parametres is not None else ParametresRegulateur()
+        )
+        self._horloge = horloge
+        self._dormir = dormir
+        self._verrou = threading.Lock()
+        self._debit = self.parametres.debit_initial
+        self._jetons = self.parametres.capacite
+        self._dernier_remplissage = horloge()
+        self._derniere_reduction = float("-inf")
+        self._latence_moyenne: float | None = None
+        self._succes = 0
+        self._ralentissements = 0
+        self._erreurs = 0
+
+    def _remplir(self) -> None:
+        maintenant = self._horloge()
+        self._jetons = min(
+            self.parametres.capacite,
+            self._jetons + (maintenant - self._dernier_remplissage) * self._debit,
+        )
+        self._dernier_remplissage = maintenant
+
+    def _reduire(self) -> None:
+        # Une seule réduction par intervalle `delai_reduction`, pour ne pas effondrer le débit
+        # quand plusieurs requêtes simultanées signalent le même ralentissement
+        maintenant = self._horloge()
+        if maintenant - self._derniere_reduction >= self.parametres.delai_reduction:
+            self._debit = max(
+                self.parametres.debit_min,
+                self._debit * self.parametres.facteur_reduction,
+            )
+            self._derniere_reduction = maintenant
+
+    def attendre(self) -> None:
+        """
+        Bloque jusqu'à ce qu'un jeton soit disponible, puis le consomme.
+        """
+        while True:
+            with self._verrou:
+                self._remplir()
+                if self._jetons >= 1:
+                    self._jetons -= 1
+                    return None
+                attente = (1 - self._jetons) / self._debit
+            self._dormir(attente)
+
+    def signaler_succes(self, latence: float) -> None:
+        """
+        Signale une réponse valide : le débit augmente si la latence moyenne reste sous la cible.
+
+        ## Parameters:
+            latence (float): Durée de la requête en secondes.
+        """
+        with self._verrou:
+            self._succes += 1
+            if self._latence_moyenne is None:
+                self._latence_moyenne = latence
+            else:
+                self._latence_moyenne += self.parametres.lissage_latence * (
+                    latence - self._latence_moyenne
+                )
+            if self._latence_moyenne > self.parametres.latence_cible:
+                self._reduire()
+            else:
+                self._debit = min(
+                    self.parametres.debit_max, self._debit + self.parametres.increment
+                )
+
+    def signaler_ralentissement(self) -> None:
+        """
+        Signale une réponse HTTP 429 ou 5xx : le débit est réduit.
+        """
+        with self._verrou:
+            self._ralentissements += 1
+            self._reduire()
+
+    def signaler_erreur(self) -> None:
+        """
+        Signale une erreur de connexion ou un timeout : le débit est réduit.
+        """
+        with self._verrou:
+            self._erreurs += 1
+            self._reduire()
+
+    def delai_backoff(self, tentative: int, retry_after: float | None = None) -> float:
+        """
+        Calcule le délai avant une nouvelle tentative : exponentiel avec gigue complète, plafonné.
+
+        ## Parameters:
+            tentative (int): Numéro de la tentative échouée (0 pour la première).
+            retry_after (float | None): Délai minimal demandé par le site (en-tête Retry-After).
+
+        ## Returns:
+            float: Délai en secondes.
+        """
+        plafond = min(
+            self.parametres.delai_max, self.parametres.delai_base * 2**tentative
+        )
+        delai = random.uniform(0, plafond)
+        if retry_after is not None:
+            delai = max(delai, min(retry_after, self.parametres.delai_max))
+        return delai
+
+    def etat(self) -> EtatRegulateur:
+        """
+        Renvoie l'état courant du régulateur.
+        """
+        with self._verrou:
+            self._remplir()
+            return EtatRegulateur(
+                debit=self._debit,
+                jetons=self._jetons,
+                latence_moyenne=self._latence_moyenne,
+                succes=self._succes,
+                ralentissements=self._ralentissements,
+                erreurs=self._erreurs,
+            )
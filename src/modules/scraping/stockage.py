@@ -0,0 +1,313 @@
+"""
+Module d'écriture et de lecture des données brutes du scraping.
+
+Les voitures sont écrites au fur et à mesure de leur extraction, sans jamais construire en mémoire
+la liste complète des annonces : en NDJSON (une voiture par ligne) ou en Parquet (par groupes de lignes,
+avec un schéma explicite), lisible ensuite sans passer par des objets Python.
+"""
+
+import glob
+import json
+import os
+from collections.abc import Iterable
+from dataclasses import asdict, fields
+from pathlib import Path
+import duckdb
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+from src.modules.scraping.webscraping import voiture
+
+COLONNES_VOITURE = [champ.name for champ in fields(voiture)]
+# Toutes les colonnes brutes sont des chaînes : la conversion des types est faite par le nettoyage (gazoduc)
+SCHEMA_VOITURE = pa.schema([(colonne, pa.string()) for colonne in COLONNES_VOITURE])
+SCHEMA_POLARS = {colonne: pl.Utf8 for colonne in COLONNES_VOITURE}
+EXTENSIONS_NDJSON = (".ndjson", ".jsonl")
+
+
+class EcrivainNDJSON:
+    """
+    Écrit des objets voiture dans un fichier NDJSON (une voiture par ligne), au fur et à mesure.
+
+    ## Example(s):
+        >>> with EcrivainNDJSON("json/voitures.ndjson") as ecrivain:
+        ...     for v in generer_voitures(100, import_marques_modeles()):
+        ...         ecrivain.ecrire(v)
+    """
+
+    def __init__(self, chemin_sortie: str | Path, ajout: bool = False) -> None:
+        """
+        ## Parameters:
+            chemin_sortie (str | Path): Chemin du fichier NDJSON.
+            ajout (bool): Ajoute les voitures à la fin d'un fichier existant au lieu de l'écraser.
+        """
+        self.chemin_sortie = Path(chemin_sortie)
+        self.nombre_ecrites = 0
+        self._fichier = open(
+            self.chemin_sortie, "a" if ajout else "w", encoding="utf-8"
+        )
+
+    def ecrire(self, v: voiture) -> None:
+        """
+        Écrit une voiture sur une nouvelle ligne du fichier.
+        """
+        self._fichier.write(json.dumps(asdict(v), ensure_ascii=False) + "\n")
+        self.nombre_ecrites += 1
+
+    def fermer(self) -> None:
+        """
+        Ferme le fichier NDJSON.
+        """
+        self._fichier.close()
+
+    def __enter__(self) -> "EcrivainNDJSON":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.fermer()
+
+
+def exporter_ndjson(voitures: Iterable[voiture], chemin_sortie: str | Path) -> int:
+    """
+    Exporte un flux d'objets voiture vers un fichier NDJSON, sans les accumuler en mémoire.
+
+    ## Parameters:
+        voitures (Iterable[voiture]): Voitures à exporter (liste ou générateur).
+        chemin_sortie (str | Path): Chemin de sortie du fichier NDJSON.
+
+    ## Returns:
+        int: Nombre de voitures écrites.
+
+    ## Example(s):
+        >>> exporter_ndjson(generer_voitures(100, import_marques_modeles()), "json/voitures.ndjson")
+        ... 48000
+    """
+    with EcrivainNDJSON(chemin_sortie) as ecrivain:
+        for v in voitures:
+            ecrivain.ecrire(v)
+    return ecrivain.nombre_ecrites
+
+
+class EcrivainParquet:
+    """
+    Écrit des objets voiture dans un fichier Parquet, par groupes de lignes, au fur et à mesure.
+
+    Seul le groupe de lignes en cours est gardé en mémoire, sous forme de colonnes.
+
+    ## Example(s):
+        >>> with EcrivainParquet("data/voitures.parquet") as ecrivain:
+        ...     for v in generer_voitures(100, import_marques_modeles()):
+        ...         ecrivain.ecrire(v)
+    """
+
+    def __init__(
+        self,
+        chemin_sortie: str | Path,
+        taille_groupe: int = 50_000,
+        compression: str = "zstd",
+    ) -> None:
+        """
+        ## Parameters:
+            chemin_sortie (str | Path): Chemin du fichier Parquet.
+            taille_groupe (int): Nombre de voitures par groupe de lignes.
+            compression (str): Algorithme de compression des pages Parquet.
+        """
+        self.chemin_sortie = Path(chemin_sortie)
+        self.taille_groupe = taille_groupe
+        self.nombre_ecrites = 0
+        self._colonnes: dict[str, list[str]] = {c: [] for c in COLONNES_VOITURE}
+        self._ecrivain = pq.ParquetWriter(
+            self.chemin_sortie, SCHEMA_VOITURE, compression=compression
+        )
+
+    def ecrire(self, v: voiture) -> None:
+        """
+        Ajoute une voiture au groupe de lignes en cours, écrit sur disque lorsqu'il est plein.
+        """
+        for colonne in COLONNES_VOITURE:
+            valeur = getattr(v, colonne)
+            self._colonnes[colonne].append(None if valeur is None else str(valeur))
+        self.nombre_ecrites += 1
+        if len(self._colonnes["lien"]) >= self.taille_groupe:
+            self._vider()
+
+    def _vider(self) -> None:
+        if len(self._colonnes["lien"]) == 0:
+            return None
+        self._ecrivain.write_table(
+            pa.Table.from_pydict(self._colonnes, schema=SCHEMA_VOITURE)
+        )
+        self._colonnes = {c: [] for c in COLONNES_VOITURE}
+
+    def fermer(self) -> None:
+        """
+        Écrit le dernier groupe de lignes et ferme le fichier Parquet.
+        """
+        self._vider()
+        self._ecrivain.close()
+
+    def __enter__(self) -> "EcrivainParquet":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.fermer()
+
+
+def exporter_parquet(
+    voitures: Iterable[voiture], chemin_sortie: str | Path, taille_groupe: int = 50_000
+) -> int:
+    """
+    Exporte un flux d'objets voiture vers un fichier Parquet, par groupes de lignes.
+
+    ## Parameters:
+        voitures (Iterable[voiture]): Voitures à exporter (liste ou générateur).
+        chemin_sortie (str | Path): Chemin de sortie du fichier Parquet.
+        taille_groupe (int): Nombre de voitures par groupe de lignes.
+
+    ## Returns:
+        int: Nombre de voitures écrites.
+
+    ## Example(s):
+        >>> exporter_parquet(generer_voitures(100, import_marques_modeles()), "data/voitures.parquet")
+        ... 48000
+    """
+    with EcrivainParquet(chemin_sortie, taille_groupe) as ecrivain:
+        for v in voitures:
+            ecrivain.ecrire(v)
+    return ecrivain.nombre_ecrites
+
+
+def lire_voitures_parquet(chemin: str | Path) -> pl.LazyFrame:
+    """
+    Lit paresseusement un ou plusieurs fichiers Parquet de voitures brutes (motif glob accepté).
+
+    ## Parameters:
+        chemin (str | Path): Chemin ou motif glob des fichiers Parquet.
+
+    ## Returns:
+        pl.LazyFrame: Les voitures brutes, prêtes à être nettoyées avec `gazoduc`.
+
+    ## Example(s):
+        >>> gazoduc(lire_voitures_parquet("data/voitures_*.parquet"), nom_marques_modeles)
+    """
+    return pl.scan_parquet(chemin)
+
+
+def trouver_fichiers(motifs: str | Path | list[str | Path]) -> list[str]:
+    """
+    Renvoie la liste triée et sans doublon des fichiers correspondant à un ou plusieurs motifs glob.
+
+    ## Raises:
+        ValueError: Si la liste de motifs est vide.
+        FileNotFoundError: Si aucun fichier ne correspond aux motifs.
+    """
+    if isinstance(motifs, (str, Path)):
+        motifs = [motifs]
+    if len(motifs) == 0:
+        raise ValueError("La liste de motifs ne doit pas être vide.")
+    fichiers = []
+    for motif in motifs:
+        for fichier in sorted(glob.glob(str(motif), recursive=True)):
+            if os.path.isfile(fichier) and fichier not in fichiers:
+                fichiers.append(fichier)
+    if fichiers == []:
+        raise FileNotFoundError(f"Aucun fichier ne correspond aux motifs : {motifs}.")
+    return fichiers
+
+
+def lire_tableaux_json(
+    fichiers: list[str], nombre_threads: int | None = None
+) -> dict[str, pl.DataFrame]:
+    """
+    Lit des fichiers JSON contenant un tableau de voitures (format de `export_to_json`) avec le lecteur natif
+    de DuckDB, en une seule requête parallélisée entre les fichiers, sans passer par des objets Python.
+
+    ## Parameters:
+        fichiers (list[str]): Chemins des fichiers JSON.
+        nombre_threads (int | None): Nombre de threads de DuckDB. Nombre de coeurs si None.
+
+    ## Returns:
+        dict[str, pl.DataFrame]: Chemin du fichier -> ses voitures (colonnes de l'objet voiture, de type chaîne),
+        dans l'ordre du fichier.
+
+    ## Raises:
+        duckdb.InvalidInputException: Si un fichier n'est pas un tableau JSON complet.
+    """
+    if fichiers == []:
+        return {}
+    with duckdb.connect() as connexion:
+        if nombre_threads is not None:
+            connexion.execute(f"SET threads = {int(nombre_threads)}")
+        voitures = connexion.execute(
+            """
+            SELECT * FROM read_json(?, format = 'array', columns = ?, filename = true)
+            """,
+            [fichiers, {colonne: "VARCHAR" for colonne in COLONNES_VOITURE}],
+        ).pl()
+    return {
+        fichier: voitures.filter(pl.col("filename") == fichier).drop("filename")
+        for fichier in fichiers
+    }
+
+
+def charger_voitures(
+    motifs: str | Path | list[str | Path],
+    dedoublonner: bool = True,
+    nombre_threads: int | None = None,
+) -> pl.LazyFrame:
+    """
+    Charge les voitures brutes de plusieurs fichiers de scraping dans un seul LazyFrame Polars.
+
+    Les formats sont reconnus par extension : NDJSON (`.ndjson`, `.jsonl`) et Parquet sont lus par les lecteurs
+    natifs de Polars. Les tableaux JSON (`.json`), que Polars ne sait pas lire paresseusement, sont lus en mémoire
+    par le lecteur natif de DuckDB (voir `lire_tableaux_json`) : pour des données plus grandes que la mémoire,
+    préférer le NDJSON ou le Parquet.
+    Les fichiers sont concaténés dans l'ordre des motifs puis des noms de fichiers, et les annonces en double
+    (même `lien`) sont supprimées pendant la lecture : seule la première occurrence est gardée. Les annonces
+    sans lien (`"NA"` ou valeur manquante) sont toutes conservées.
+
+    ## Parameters:
+        motifs (str | Path | list[str | Path]): Chemin(s) ou motif(s) glob des fichiers à charger.
+        dedoublonner (bool): Supprime les annonces en double sur la colonne `lien`.
+        nombre_threads (int | None): Nombre de threads de lecture des tableaux JSON. Nombre de coeurs si None.
+
+    ## Raises:
+        ValueError: Si la liste de motifs est vide ou si un fichier a une extension inconnue.
+        FileNotFoundError: Si aucun fichier ne correspond aux motifs.
+
+    ## Returns:
+        pl.LazyFrame: Les voitures brutes (colonnes de l'objet voiture, de type chaîne), prêtes pour `gazoduc`.
+
+    ## Example(s):
+        >>> voitures = charger_voitures(["json/voitures_*.json", "data/scraping/*.parquet"])
+        >>> gazoduc(voitures, pl.DataFrame(import_marques_modeles()))
+    """
+    fichiers = trouver_fichiers(motifs)
+    extensions = [Path(fichier).suffix.lower() for fichier in fichiers]
+    for fichier, extension in zip(fichiers, extensions):
+        if extension not in (*EXTENSIONS_NDJSON, ".json", ".parquet"):
+            raise ValueError(f"Format de fichier non pris en charge : {fichier}.")
+
+    fichiers_json = [f for f, e in zip(fichiers, extensions) if e == ".json"]
+    tableaux_json = lire_tableaux_json(fichiers_json, nombre_threads)
+
+    sources = []
+    for fichier, extension in zip(fichiers, extensions):
+        if extension == ".json":
+            source = tableaux_json[fichier].lazy()
+        elif extension == ".parquet":
+            source = pl.scan_parquet(fichier)
+        else:
+            source = pl.scan_ndjson(fichier, schema=SCHEMA_POLARS)
+        sources.append(
+            source.select(
+                [pl.col(colonne).cast(pl.Utf8) for colonne in COLONNES_VOITURE]
+            )
+        )
+    voitures = pl.concat(sources, how="vertical")
+    if dedoublonner:
+        voitures = voitures.filter(
+            pl.col("lien").is_first_distinct()
+            | (pl.col("lien").fill_null("NA") == "NA")
+        )
+    return voitures
@@ -1,12 +1,18 @@
 import requests as rq
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from bs4 import BeautifulSoup
 from bs4.element import Tag, ResultSet
 from pathlib import Path
 import json
+import math
+import re
 from dataclasses import dataclass
 import time
 import random
 from serde.json import to_json
+from src.modules.scraping.regulation import RegulateurDebit
+from src.modules.scraping.archive import ArchivePages
 
 
 def recup_nom_vehicule(annonce: Tag) -> str:
@@ -265,40 +271,324 @@ def get_random_user_agent() -> str:
     return user_agent
 
 
-def recup_page(numero_page: int, marque: str, modele: str) -> BeautifulSoup:
+URL_LACENTRALE = "https://www.lacentrale.fr"
+
+
+def construire_adresse(
+    numero_page: int, marque: str, modele: str, base_url: str = URL_LACENTRALE
+) -> str:
     """
-    Récupère les informations d'une page spécifique.
+    Construit l'url d'une page d'annonces pour une marque et un modèle donnés.
 
     ## Parameters:
         numero_page (int): Numéro de la page.
         marque (str): Nom de la marque.
         modele (str): Nom du modèle de véhicule.
+        base_url (str): Adresse du site à interroger (par défaut lacentrale.fr).
+
+    ## Returns:
+        str: L'url de la page d'annonces.
+
+    ## Example(s):
+        >>> construire_adresse(2, "Citroen", "c3")
+        ... "https://www.lacentrale.fr/listing?makesModelsCommercialNames=CITROEN%3AC3&options=&page=2"
+    """
+    return f"{base_url}/listing?makesModelsCommercialNames={marque.upper()}%3A{modele.upper()}&options=&page={numero_page}"
+
+
+TAILLE_PAGE = 16
+MOTIF_TOTAL = re.compile(rb'<span class="total">([^<]*)</span>')
+MOTIF_TOTAL_ETAT = re.compile(rb'"total":(\d+)')
+MOTIF_TAILLE_PAGE = re.compile(rb'"pageSize":(\d+)')
+
+
+def recup_nombre_pages(contenu: str | bytes) -> int | None:
+    """
+    Récupère le nombre de pages de résultats annoncé par une page d'annonces.
+
+    Le nombre total d'annonces est lu dans l'en-tête de la page (repli sur l'état JSON embarqué),
+    le nombre d'annonces par page dans l'état JSON (16 par défaut).
+
+    ## Parameters:
+        contenu (str | bytes): Contenu HTML d'une page d'annonces.
+
+    ## Returns:
+        int | None: Nombre de pages de résultats, None si le nombre d'annonces est introuvable.
+
+    ## Example(s):
+        >>> recup_nombre_pages(Path("pages/exemple_annonces.html").read_bytes())
+        ... 18817
+    """
+    if isinstance(contenu, str):
+        contenu = contenu.encode("utf-8")
+    total = None
+    correspondance = MOTIF_TOTAL.search(contenu)
+    if correspondance is not None:
+        chiffres = re.sub(rb"\D", b"", correspondance.group(1).replace(b"&nbsp;", b""))
+        if chiffres != b"":
+            total = int(chiffres)
+    if total is None:
+        correspondance = MOTIF_TOTAL_ETAT.search(contenu)
+        if correspondance is None:
+            return None
+        total = int(correspondance.group(1))
+    correspondance = MOTIF_TAILLE_PAGE.search(contenu)
+    taille_page = int(correspondance.group(1)) if correspondance is not None else 0
+    return math.ceil(total / (taille_page if taille_page > 0 else TAILLE_PAGE))
+
+
+def get_derniere_page(contenu: str | bytes, nombre_pages: int) -> int:
+    """
+    Calcule le numéro de la dernière page à extraire pour un modèle à partir de sa première page.
+
+    ## Parameters:
+        contenu (str | bytes): Contenu HTML de la première page d'annonces du modèle.
+        nombre_pages (int): Limite du nombre de pages (les pages extraites vont de 1 à nombre_pages - 1).
+
+    ## Returns:
+        int: Numéro de la dernière page. Si le nombre de pages est introuvable, la limite est renvoyée
+        et les pages sont parcourues jusqu'à la première page vide.
+    """
+    nombre_pages_annonce = recup_nombre_pages(contenu)
+    if nombre_pages_annonce is None:
+        return nombre_pages - 1
+    return min(nombre_pages - 1, nombre_pages_annonce)
+
+
+class ErreurRalentissement(rq.ConnectionError):
+    """
+    Le site répond encore 429 ou 5xx après la dernière tentative : la page n'a pas pu être récupérée.
+    """
+
+
+def est_ralentissement(reponse: rq.Response) -> bool:
+    """
+    Indique si une réponse HTTP signale que le site est surchargé ou limite les requêtes (429 ou 5xx).
+    """
+    return reponse.status_code == 429 or reponse.status_code >= 500
+
+
+def get_retry_after(reponse: rq.Response) -> float | None:
+    """
+    Renvoie le délai demandé par l'en-tête Retry-After d'une réponse (en secondes), ou None.
+    """
+    try:
+        return float(reponse.headers["Retry-After"])
+    except (KeyError, ValueError):
+        return None
+
+
+@dataclass
+class ParametresClient:
+    taille_pool: int = 10
+    connexions_par_hote: int = 10
+    max_retries: int = 3
+    timeout_connexion: float = 10
+    timeout_lecture: float = 30
+    base_url: str = URL_LACENTRALE
+
+
+class ClientScraping:
+    """
+    Client HTTP du scraping : une session persistante (keep-alive) avec un pool de connexions,
+    une politique de nouvelles tentatives, des timeouts et un régulateur de débit adaptatif.
+
+    ## Example(s):
+        >>> with ClientScraping(ParametresClient(connexions_par_hote=16)) as client:
+        ...     page = recup_page(1, "CITROEN", "C3", client)
+        >>> client.connexions_reutilisees()
+        ... 0
+    """
+
+    def __init__(
+        self,
+        parametres: ParametresClient | None = None,
+        regulateur: RegulateurDebit | None = None,
+    ) -> None:
+        self.parametres = parametres if parametres is not None else ParametresClient()
+        self.regulateur = regulateur if regulateur is not None else RegulateurDebit()
+        self.base_url = self.parametres.base_url
+        # urllib3 ne relance que les erreurs de connexion, sans attendre : les réponses 429/5xx
+        # sont relancées par telecharger_page pour que le régulateur les observe
+        retry = Retry(
+            total=self.parametres.max_retries,
+            status_forcelist=(),
+            allowed_methods=("GET",),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.parametres.taille_pool,
+            pool_maxsize=self.parametres.connexions_par_hote,
+            max_retries=retry,
+        )
+        self.session = rq.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def get(self, adresse: str) -> rq.Response:
+        """
+        Envoie une requête GET avec un User-Agent aléatoire en réutilisant les connexions du pool.
+        La requête attend l'autorisation du régulateur, qui est ensuite informé du résultat.
+
+        ## Parameters:
+            adresse (str): Url de la page à télécharger.
+
+        ## Raises:
+            rq.ConnectionError, rq.Timeout: Erreur de connexion ou timeout.
+
+        ## Returns:
+            rq.Response: La réponse HTTP.
+        """
+        self.regulateur.attendre()
+        debut = time.monotonic()
+        try:
+            reponse = self.session.get(
+                url=adresse,
+                headers={"User-Agent": get_random_user_agent()},
+                timeout=(
+                    self.parametres.timeout_connexion,
+                    self.parametres.timeout_lecture,
+                ),
+            )
+        except (rq.ConnectionError, rq.Timeout):
+            self.regulateur.signaler_erreur()
+            raise
+        if est_ralentissement(reponse):
+            self.regulateur.signaler_ralentissement()
+        else:
+            self.regulateur.signaler_succes(time.monotonic() - debut)
+        return reponse
+
+    def _pools(self) -> list:
+        pools = []
+        # Le même adaptateur est monté pour http et https : on ne le compte qu'une fois
+        adapters = {id(adapter): adapter for adapter in self.session.adapters.values()}
+        for adapter in adapters.values():
+            if isinstance(adapter, HTTPAdapter):
+                pools.extend(
+                    adapter.poolmanager.pools[cle]
+                    for cle in adapter.poolmanager.pools.keys()
+                )
+        return pools
+
+    def connexions_ouvertes(self) -> int:
+        """
+        Renvoie le nombre de connexions TCP ouvertes depuis la création du client.
+        """
+        return sum(pool.num_connections for pool in self._pools())
+
+    def connexions_reutilisees(self) -> int:
+        """
+        Renvoie le nombre de requêtes qui ont réutilisé une connexion déjà ouverte.
+        """
+        return sum(pool.num_requests - pool.num_connections for pool in self._pools())
+
+    def fermer(self) -> None:
+        """
+        Ferme la session et toutes les connexions du pool.
+        """
+        self.session.close()
+
+    def __enter__(self) -> "ClientScraping":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.fermer()
+
+
+def telecharger_page(
+    numero_page: int,
+    marque: str,
+    modele: str,
+    client: ClientScraping | None = None,
+    archive: ArchivePages | None = None,
+) -> bytes:
+    """
+    Télécharge le contenu HTML brut d'une page spécifique.
+
+    ## Parameters:
+        numero_page (int): Numéro de la page.
+        marque (str): Nom de la marque.
+        modele (str): Nom du modèle de véhicule.
+        client (ClientScraping | None): Client HTTP à utiliser. Un client temporaire est créé si None.
+        archive (ArchivePages | None): Archive locale où chaque page reçue avec succès est enregistrée.
 
     ## Raises:
         rq.ConnectionError: Erreur de connexion en cas d'échec après plusieurs tentatives.
+        ErreurRalentissement: Réponse 429 ou 5xx à la dernière tentative (sous-classe de rq.ConnectionError).
 
     ## Returns:
-        BeautifulSoup: Objet BeautifulSoup contenant le contenu de la page.
+        bytes: Contenu HTML de la page.
     """
-    headers = get_random_user_agent()
-    adresse = f"https://www.lacentrale.fr/listing?makesModelsCommercialNames={marque.upper()}%3A{modele.upper()}&options=&page={numero_page}"
+    if client is None:
+        with ClientScraping() as client_temporaire:
+            return telecharger_page(
+                numero_page, marque, modele, client_temporaire, archive
+            )
+    adresse = construire_adresse(numero_page, marque, modele, client.base_url)
     max_attempts = 3  # Nombre maximal de tentatives
     current_attempt = 0
 
     while current_attempt < max_attempts:
         try:
-            requete = rq.get(url=adresse, headers=headers)
-            page = BeautifulSoup(requete.content, "html.parser")
-            return page
-        except rq.ConnectionError as e:
+            requete = client.get(adresse)
+        except (rq.ConnectionError, rq.Timeout) as e:
             print(f"Erreur de connexion : {e}")
             print("Tentative de reconnexion...")
-            time.sleep(60)
+            time.sleep(client.regulateur.delai_backoff(current_attempt))
             current_attempt += 1
+            continue
+        if est_ralentissement(requete):
+            # Le corps d'une réponse d'erreur ne doit pas être lu comme une page sans annonce
+            if current_attempt == max_attempts - 1:
+                raise ErreurRalentissement(
+                    f"Réponse {requete.status_code} après {max_attempts} tentatives.",
+                    response=requete,
+                )
+            delai = client.regulateur.delai_backoff(
+                current_attempt, get_retry_after(requete)
+            )
+            print(
+                f"Réponse {requete.status_code}, nouvelle tentative dans {delai:.1f}s..."
+            )
+            time.sleep(delai)
+            current_attempt += 1
+            continue
+        if archive is not None and requete.ok:
+            archive.enregistrer(requete.content, marque, modele, numero_page, adresse)
+        return requete.content
     print("Échec des tentatives de connexion. Arrêt du programme.")
     raise rq.ConnectionError("Échec des tentatives de connexion.")
 
 
+def recup_page(
+    numero_page: int,
+    marque: str,
+    modele: str,
+    client: ClientScraping | None = None,
+    archive: ArchivePages | None = None,
+) -> BeautifulSoup:
+    """
+    Récupère les informations d'une page spécifique.
+
+    ## Parameters:
+        numero_page (int): Numéro de la page.
+        marque (str): Nom de la marque.
+        modele (str): Nom du modèle de véhicule.
+        client (ClientScraping | None): Client HTTP à utiliser. Un client temporaire est créé si None.
+        archive (ArchivePages | None): Archive locale où la page brute est enregistrée.
+
+    ## Raises:
+        rq.ConnectionError: Erreur de connexion en cas d'échec après plusieurs tentatives.
+
+    ## Returns:
+        BeautifulSoup: Objet BeautifulSoup contenant le contenu de la page.
+    """
+    contenu = telecharger_page(numero_page, marque, modele, client, archive)
+    page = BeautifulSoup(contenu, "html.parser")
+    return page
+
+
 def recup_annonces(page: BeautifulSoup) -> ResultSet:
     """
     Récupère les éléments div contenant les informations de chaque annonce pour une page donnée.
@@ -330,13 +620,18 @@ def recup_data_voitures(annonces: ResultSet) -> list[voiture]:
     return voitures
 
 
-def print_info_scraping(pages_extraites: int, temps_execution: float) -> None:
+def print_info_scraping(
+    pages_extraites: int,
+    temps_execution: float,
+    connexions_reutilisees: int | None = None,
+) -> None:
     """
     Affiche les informations sur le scraping effectué.
 
     ## Parameters:
         pages_extraites (int): Nombre total de pages extraites.
         temps_execution (float): Temps total d'exécution en secondes.
+        connexions_reutilisees (int | None): Nombre de requêtes ayant réutilisé une connexion du pool.
 
     ## Returns:
         None
@@ -344,12 +639,16 @@ def print_info_scraping(pages_extraites: int, temps_execution: float) -> None:
     if temps_execution != 0:
         pages_par_minute = (pages_extraites / temps_execution) * 60
         info_string = f"Nombre total de pages extraites : {pages_extraites} ||| {pages_par_minute:.2f} pages/min."
+        if connexions_reutilisees is not None:
+            info_string += f" ||| {connexions_reutilisees} connexions réutilisées."
         print(info_string, end="\r")
     return None
 
 
 def extraire_toutes_annonces(
-    nombre_pages: int, nom_marques_modeles: NomMarquesModeles
+    nombre_pages: int,
+    nom_marques_modeles: NomMarquesModeles,
+    client: ClientScraping | None = None,
 ) -> list:
     """
     Récupère toutes les annonces pour une liste de marques et de modèles sur un certain nombre de pages.
@@ -357,6 +656,7 @@ def extraire_toutes_annonces(
     ## Parameters:
         nombre_pages (int): Nombre total de pages extraites pour chaque marque et modèle.
         nom_marques_modeles (NomMarquesModeles): Liste contenant les noms des marques et leurs modèles associés.
+        client (ClientScraping | None): Client HTTP partagé par toutes les requêtes. Un client est créé si None.
 
     ## Raises:
         rq.ConnectionError : En cas d'erreur de connexion lors de l'extraction.
@@ -365,17 +665,27 @@ def extraire_toutes_annonces(
         list: Liste regroupant toutes les annonces extraites.
     """
 
+    if client is None:
+        with ClientScraping() as client_temporaire:
+            return extraire_toutes_annonces(
+                nombre_pages, nom_marques_modeles, client_temporaire
+            )
     liste_annonces = list()
     pages_extraites = 0
     temps_debut = time.time()
     try:
         for i in nom_marques_modeles:
-            time.sleep(0.01)
             marque = i.marque
             for modele in i.modeles:
-                time.sleep(0.01)
+                derniere_page = nombre_pages - 1
                 for num_page in range(1, nombre_pages, 1):
-                    page = recup_page(num_page, marque, modele)
+                    if num_page > derniere_page:
+                        break
+                    contenu = telecharger_page(num_page, marque, modele, client)
+                    if num_page == 1:
+                        # Seules les pages annoncées par la première page sont demandées
+                        derniere_page = get_derniere_page(contenu, nombre_pages)
+                    page = BeautifulSoup(contenu, "html.parser")
                     annonces_page = recup_annonces(page)
                     if annonces_page == []:
                         break
@@ -383,9 +693,11 @@ def extraire_toutes_annonces(
                         liste_annonces.append(annonces_page)
                         pages_extraites += 1
                         temps_execution = time.time() - temps_debut
-                        print_info_scraping(pages_extraites, temps_execution)
-                        if pages_extraites % 2000 == 0:
-                            time.sleep(30)
+                        print_info_scraping(
+                            pages_extraites,
+                            temps_execution,
+                            client.connexions_reutilisees(),
+                        )
     except rq.ConnectionError:
         print(
             f"""
@@ -425,6 +737,7 @@ def export_to_json(voitures: list[voiture], chemin_sortie: str) -> None:
 def fusionner_fichiers_json(fichiers_entree: list[str]) -> list[dict]:
     """
     Fusionne les données de plusieurs fichiers JSON en une seule liste de dictionnaires.
+    Pour de gros volumes, `charger_voitures` (module `stockage`) lit les fichiers dans un LazyFrame Polars.
 
     ## Parameters:
         fichiers_entree (list[str]): Liste des chemins des fichiers JSON en entrée.
@@ -0,0 +1,226 @@
+"""
+Module de validation des données nettoyées.
+
+Étape de `gazoduc` placée après les conversions de types, l'extraction du cylindre et la suppression des doublons :
+
+1. Vérification du schéma déclaré (`SCHEMA_NETTOYE`) : une colonne absente ou d'un autre type lève une
+   `ErreurSchema`. Les valeurs manquantes ne sont pas vérifiées ici : le résultat dépendrait de la taille
+   du lot (une seule annonce au cylindre illisible donne une colonne puissance entièrement vide).
+2. Vérification des valeurs, ligne par ligne, par des expressions Polars vectorisées : valeurs obligatoires
+   manquantes (dont la marque), bornes de prix, kilométrage, année et puissance, année 2024 avec plus de
+   50 000 km et énergie en erreur.
+
+Les lignes rejetées sont enregistrées dans un fichier Parquet annexe (colonnes d'identification et valeurs
+vérifiées), avec les motifs du rejet. Pour un LazyFrame, `marquer_rejets` garde lignes valides et rejetées
+dans le même plan, séparées par `separer_rejets` après une seule exécution.
+"""
+
+import datetime
+from pathlib import Path
+import polars as pl
+
+
+SCHEMA_NETTOYE = {
+    "annee": pl.Int32,
+    "kilometrage": pl.Int64,
+    "boite": pl.Utf8,
+    "energie": pl.Utf8,
+    "prix": pl.Int64,
+    "position_marché": pl.Utf8,
+    "garantie": pl.Int64,
+    "lien": pl.Utf8,
+    "marque": pl.Utf8,
+    "modele": pl.Utf8,
+    "generation": pl.Utf8,
+    "cylindre": pl.Utf8,
+    "moteur": pl.Utf8,
+    "puissance": pl.Int64,
+    "finition": pl.Utf8,
+    "batterie": pl.Utf8,
+}
+COLONNES_OBLIGATOIRES = [
+    "marque",
+    "prix",
+    "kilometrage",
+    "annee",
+    "puissance",
+    "energie",
+]
+COLONNES_REJETS = [
+    "lien",
+    "marque",
+    "modele",
+    "annee",
+    "kilometrage",
+    "prix",
+    "puissance",
+    "energie",
+]
+# Bornes inclusives des valeurs acceptées
+BORNES = {
+    "prix": (100, 2_000_000),
+    "kilometrage": (0, 449_999),
+    "annee": (1900, datetime.date.today().year + 1),
+    "puissance": (1, 2_000),
+}
+
+
+class ErreurSchema(ValueError):
+    """
+    Le schéma des données ne correspond pas au schéma déclaré.
+    """
+
+
+def verifier_schema(data: pl.DataFrame | pl.LazyFrame) -> None:
+    """
+    Vérifie que les données respectent le schéma déclaré `SCHEMA_NETTOYE`.
+
+    ## Parameters:
+        data (pl.DataFrame | pl.LazyFrame): Données après les conversions de types et l'extraction du cylindre.
+
+    ## Raises:
+        ErreurSchema: Si une colonne est absente ou d'un autre type.
+    """
+    schema = data.schema
+    erreurs = [
+        f"{colonne} : {type_attendu} attendu, {schema.get(colonne, 'colonne absente')} trouvé"
+        for colonne, type_attendu in SCHEMA_NETTOYE.items()
+        if schema.get(colonne) != type_attendu
+    ]
+    if erreurs != []:
+        raise ErreurSchema("Schéma invalide : " + " ; ".join(erreurs))
+
+
+def regles_validation() -> dict[str, pl.Expr]:
+    """
+    Renvoie les règles de validation : motif du rejet -> expression vraie pour les lignes à rejeter.
+    """
+    regles = {
+        f"{colonne} manquant": pl.col(colonne).is_null()
+        for colonne in COLONNES_OBLIGATOIRES
+    }
+    for colonne, (minimum, maximum) in BORNES.items():
+        regles[f"{colonne} hors de [{minimum}, {maximum}]"] = ~pl.col(
+            colonne
+        ).is_between(minimum, maximum)
+    regles["annee 2024 et plus de 50000 km"] = (pl.col("annee") == 2024) & (
+        pl.col("kilometrage") > 50000
+    )
+    regles["energie erreur"] = pl.col("energie") == "erreur"
+    # Une comparaison avec une valeur manquante donne null : la règle n'est alors pas appliquée
+    return {motif: expression.fill_null(False) for motif, expression in regles.items()}
+
+
+def expression_motifs(regles: dict[str, pl.Expr]) -> pl.Expr:
+    """
+    Renvoie l'expression des motifs de rejet d'une ligne, séparés par " ; " (texte vide si la ligne est valide).
+
+    Chaque motif vérifié ajoute " ; motif" : le premier séparateur est retiré. Les expressions de texte
+    restent exécutables par le moteur streaming (les listes ne peuvent pas être écrites en streaming).
+    """
+    return (
+        pl.concat_str(
+            [
+                pl.when(expression).then(pl.lit(f" ; {motif}")).otherwise(pl.lit(""))
+                for motif, expression in regles.items()
+            ]
+        )
+        .str.slice(3)
+        .alias("motifs")
+    )
+
+
+def valider(
+    data: pl.DataFrame | pl.LazyFrame, chemin_rejets: str | Path | None = None
+) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Vérifie le schéma puis garde uniquement les lignes valides, en enregistrant les lignes rejetées.
+
+    Les motifs de rejet ne sont calculés que sur les lignes rejetées : le coût de leur enregistrement dépend
+    du nombre de rejets. Pour un DataFrame, le masque des lignes rejetées est calculé une seule fois. Un
+    LazyFrame reste un plan à exécuter : pour enregistrer ses rejets, utiliser `marquer_rejets` puis
+    `separer_rejets` sur le résultat d'une seule exécution.
+
+    ## Parameters:
+        data (pl.DataFrame | pl.LazyFrame): Données après les conversions de types et l'extraction du cylindre.
+        chemin_rejets (str | Path | None): Fichier Parquet (écrasé) des lignes rejetées : colonnes `COLONNES_REJETS`
+            et "motifs". Aucun enregistrement si None.
+
+    ## Returns:
+        pl.DataFrame | pl.LazyFrame: Les lignes valides.
+
+    ## Raises:
+        ErreurSchema: Si les données ne respectent pas le schéma déclaré.
+        ValueError: Si `chemin_rejets` est donné pour un LazyFrame.
+
+    ## Example(s):
+        >>> valider(data.pipe(get_km_prix_annee).pipe(get_garantie).pipe(get_cylindre), "data/rejets.parquet")
+    """
+    verifier_schema(data)
+    regles = regles_validation()
+    rejet = pl.any_horizontal(list(regles.values()))
+    if isinstance(data, pl.LazyFrame):
+        if chemin_rejets is not None:
+            raise ValueError(
+                "Rejets d'un LazyFrame : utiliser marquer_rejets puis separer_rejets"
+            )
+        return data.filter(~rejet)
+    rejet = data.select(rejet).to_series()
+    if chemin_rejets is not None:
+        # Les colonnes des règles font toutes partie de COLONNES_REJETS
+        (
+            data.filter(rejet)
+            .select(COLONNES_REJETS)
+            .with_columns(expression_motifs(regles))
+            .write_parquet(chemin_rejets)
+        )
+    return data.filter(~rejet)
+
+
+def marquer_rejets(data: pl.DataFrame | pl.LazyFrame) -> pl.DataFrame | pl.LazyFrame:
+    """
+    Vérifie le schéma puis ajoute la colonne "motifs" : motifs du rejet, null pour les lignes valides.
+
+    Les lignes valides et rejetées restent dans le même plan : une seule exécution donne les deux,
+    séparées ensuite par `separer_rejets`.
+
+    ## Parameters:
+        data (pl.DataFrame | pl.LazyFrame): Données après les conversions de types et l'extraction du cylindre.
+
+    ## Returns:
+        pl.DataFrame | pl.LazyFrame: Les données avec la colonne "motifs".
+
+    ## Raises:
+        ErreurSchema: Si les données ne respectent pas le schéma déclaré.
+
+    ## Example(s):
+        >>> valides, rejets = separer_rejets(marquer_rejets(pipeline).collect(streaming=True))
+    """
+    verifier_schema(data)
+    regles = regles_validation()
+    return data.with_columns(
+        pl.when(pl.any_horizontal(list(regles.values())))
+        .then(expression_motifs(regles))
+        .otherwise(pl.lit(None, pl.Utf8))
+        .alias("motifs")
+    )
+
+
+def separer_rejets(
+    data: pl.DataFrame | pl.LazyFrame,
+) -> tuple[pl.DataFrame, pl.DataFrame] | tuple[pl.LazyFrame, pl.LazyFrame]:
+    """
+    Sépare des données marquées par `marquer_rejets` en lignes valides et lignes rejetées.
+
+    ## Parameters:
+        data (pl.DataFrame | pl.LazyFrame): Données avec la colonne "motifs".
+
+    ## Returns:
+        tuple: Les lignes valides (sans la colonne "motifs") et les lignes rejetées (colonnes `COLONNES_REJETS`
+            et "motifs").
+    """
+    rejet = pl.col("motifs").is_not_null()
+    return (
+        data.filter(~rejet).drop("motifs"),
+        data.filter(rejet).select([*COLONNES_REJETS, "motifs"]),
+    )
@@ -0,0 +1,91 @@
+"""Fixtures partagées par les tests du scraping
+
+Le serveur HTTP local remplace lacentrale.fr : il renvoie la page d'exemple `pages/exemple_annonces.html`
+pour les premières pages de chaque modèle, puis une page sans annonce. Le nombre d'annonces affiché
+par la page correspond à `pages_par_modele` pages de 16 annonces (il peut être masqué avec `afficher_total`).
+Des codes d'erreur HTTP peuvent être forcés pour les prochaines requêtes avec `statuts_forces`.
+"""
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+import threading
+import time
+import pytest
+
+
+class ServeurAnnonces(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, pages_par_modele: int = 2, latence: float = 0.0) -> None:
+        super().__init__(("127.0.0.1", 0), GestionnaireAnnonces)
+        self.page_annonces = (
+            Path(".").resolve() / "pages/exemple_annonces.html"
+        ).read_bytes()
+        self.page_vide = b"<html><body><p>Aucune annonce</p></body></html>"
+        self.pages_par_modele = pages_par_modele
+        self.latence = latence
+        self.afficher_total = True
+        self.statuts_forces: list[int] = []
+        self.requetes: list[str] = []
+        self.en_cours = 0
+        self.max_en_cours = 0
+        self.verrou = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def contenu_page(self, numero_page: int) -> bytes:
+        if numero_page > self.pages_par_modele:
+            return self.page_vide
+        total = str(self.pages_par_modele * 16).encode() if self.afficher_total else b""
+        return self.page_annonces.replace(
+            b'<span class="total">301&nbsp;061</span>',
+            b'<span class="total">' + total + b"</span>",
+        ).replace(b'"total":301061', b'"total":' + total if total else b"")
+
+
+class GestionnaireAnnonces(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: ServeurAnnonces
+
+    def do_GET(self) -> None:
+        serveur = self.server
+        with serveur.verrou:
+            serveur.requetes.append(self.path)
+            statut = serveur.statuts_forces.pop(0) if serveur.statuts_forces else 200
+            serveur.en_cours += 1
+            serveur.max_en_cours = max(serveur.max_en_cours, serveur.en_cours)
+        try:
+            time.sleep(serveur.latence)
+            requete = parse_qs(urlparse(self.path).query)
+            numero_page = int(requete.get("page", ["1"])[0])
+            if statut != 200:
+                contenu = b"Erreur"
+            else:
+                contenu = serveur.contenu_page(numero_page)
+            self.send_response(statut)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(contenu)))
+            self.end_headers()
+            self.wfile.write(contenu)
+        finally:
+            with serveur.verrou:
+                serveur.en_cours -= 1
+
+    def log_message(self, format, *args) -> None:
+        return None
+
+
+@pytest.fixture
+def serveur_annonces():
+    """
+    Lance un serveur HTTP local servant la page d'exemple et l'arrête à la fin du test.
+    """
+    serveur = ServeurAnnonces()
+    thread = threading.Thread(target=serveur.serve_forever, daemon=True)
+    thread.start()
+    yield serveur
+    serveur.shutdown()
+    serveur.server_close()
@@ -0,0 +1,109 @@
+"""Module de test sur le module archive"""
+
+from pathlib import Path
+from src.modules.scraping.webscraping import (
+    NomMarquesModeles,
+    ClientScraping,
+    ParametresClient,
+    recup_page,
+)
+from src.modules.scraping.archive import ArchivePages
+from src.modules.scraping.pipeline import (
+    extraire_toutes_voitures,
+    generer_voitures,
+    rejouer_archive,
+)
+
+
+PAGE_EXEMPLE = Path(".").resolve() / "pages/exemple_annonces.html"
+
+
+def test_archive_deduplication(tmp_path):
+    """
+    Vérifie qu'un contenu identique n'est stocké qu'une fois, compressé, et relu à l'identique.
+    """
+    archive = ArchivePages(tmp_path / "archive")
+    contenu = PAGE_EXEMPLE.read_bytes()
+    empreinte1 = archive.enregistrer(contenu, "CITROEN", "c3", 1)
+    empreinte2 = archive.enregistrer(contenu, "CITROEN", "c4", 1)
+    assert empreinte1 == empreinte2
+    objets = list((tmp_path / "archive" / "objets").rglob("*.html.gz"))
+    assert len(objets) == 1
+    assert objets[0].stat().st_size < len(contenu)
+    assert archive.lire(empreinte1) == contenu
+    assert len(list(archive.entrees())) == 2
+
+
+def test_archive_derniere_version(tmp_path):
+    """
+    Vérifie que seule la dernière version d'une page est relue par défaut.
+    """
+    archive = ArchivePages(tmp_path / "archive")
+    archive.enregistrer(b"ancienne", "CITROEN", "c3", 1)
+    archive.enregistrer(b"autre", "CITROEN", "c3", 2)
+    archive.enregistrer(b"nouvelle", "CITROEN", "c3", 1)
+    entrees = list(archive.entrees())
+    assert [archive.lire(e["sha256"]) for e in entrees] == [b"nouvelle", b"autre"]
+    assert len(list(archive.entrees(derniere_version=False))) == 3
+
+
+def test_archive_executions(tmp_path):
+    """
+    Vérifie qu'une exécution est relue seule : les pages d'une exécution plus ancienne et plus longue
+    ne sont pas mélangées à la plus récente.
+    """
+    ancienne = ArchivePages(tmp_path / "archive", execution="20240101")
+    for page in [1, 2, 3]:
+        ancienne.enregistrer(f"ancienne {page}".encode(), "CITROEN", "c3", page)
+    recente = ArchivePages(tmp_path / "archive", execution="20240102")
+    recente.enregistrer(b"recente 1", "CITROEN", "c3", 1)
+    archive = ArchivePages(tmp_path / "archive")
+    assert archive.executions() == ["20240101", "20240102"]
+    assert [archive.lire(e["sha256"]) for e in archive.entrees()] == [b"recente 1"]
+    assert len(list(archive.entrees(execution="20240101"))) == 3
+    assert len(list(archive.entrees(derniere_version=False))) == 4
+
+
+def test_recup_page_archive(serveur_annonces, tmp_path):
+    """
+    Vérifie que recup_page enregistre la page brute dans l'archive.
+    """
+    archive = ArchivePages(tmp_path / "archive")
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    recup_page(1, "CITROEN", "c3", client, archive)
+    entree = next(archive.entrees())
+    assert (entree["marque"], entree["modele"], entree["page"]) == ("CITROEN", "c3", 1)
+    assert archive.lire(entree["sha256"]) == serveur_annonces.contenu_page(1)
+
+
+def test_rejouer_archive(serveur_annonces, tmp_path):
+    """
+    Vérifie que le rejeu de l'archive redonne les voitures du scraping sans requête réseau.
+    """
+    archive = ArchivePages(tmp_path / "archive")
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    nom_marques_modeles = [NomMarquesModeles(marque="CITROEN", modeles=["c3", "c4"])]
+    voitures = list(generer_voitures(10, nom_marques_modeles, client, archive=archive))
+    nombre_requetes = len(serveur_annonces.requetes)
+    assert list(rejouer_archive(archive)) == voitures
+    assert len(serveur_annonces.requetes) == nombre_requetes
+    # Une exécution plus courte (un seul modèle) est relue sans les pages de la précédente
+    nouvelle = ArchivePages(tmp_path / "archive")
+    c3 = [NomMarquesModeles(marque="CITROEN", modeles=["c3"])]
+    voitures_c3 = list(generer_voitures(10, c3, client, archive=nouvelle))
+    assert list(rejouer_archive(archive)) == voitures_c3
+    assert list(rejouer_archive(archive, execution=archive.executions()[0])) == voitures
+
+
+def test_extraire_toutes_voitures_archive(serveur_annonces, tmp_path):
+    """
+    Vérifie que extraire_toutes_voitures enregistre aussi les pages téléchargées dans l'archive.
+    """
+    archive = ArchivePages(tmp_path / "archive")
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    nom_marques_modeles = [NomMarquesModeles(marque="CITROEN", modeles=["c3"])]
+    voitures = extraire_toutes_voitures(
+        10, nom_marques_modeles, client, archive=archive
+    )
+    assert len(list(archive.entrees())) == 2
+    assert list(rejouer_archive(archive)) == voitures
@@ -0,0 +1,212 @@
+"""Module de test sur le module base_donnees"""
+
+import json
+import duckdb
+from src.modules.scraping.webscraping import fusionner_fichiers_json
+from src.modules.app.import_mm import import_marques_modeles
+from src.modules.datacleaning import gazoduc
+from src.modules.base_donnees import (
+    BaseNettoyee,
+    BilanNettoyage,
+    exporter_base,
+    lire_base,
+    migrer_base,
+    nettoyage_incremental,
+    appliquer_delta,
+    get_empreintes_donnees,
+)
+from polars.testing import assert_frame_equal
+import polars as pl
+
+
+def get_donnees_brutes() -> pl.DataFrame:
+    return pl.DataFrame(fusionner_fichiers_json(["test_data.json"]))
+
+
+def test_nettoyage_incremental(tmp_path):
+    """
+    Vérifie que le nettoyage par lots donne la même base que gazoduc sur toutes les données,
+    et que seules les parties contenant des annonces remplacées sont réécrites.
+    """
+    data_brutes = get_donnees_brutes()
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    with BaseNettoyee(tmp_path / "database") as base:
+        bilan1 = nettoyage_incremental(data_brutes.head(2), nom_marques_modeles, base)
+        bilan2 = nettoyage_incremental(data_brutes.tail(3), nom_marques_modeles, base)
+        assert bilan1 == BilanNettoyage(ajoutees=2)
+        assert bilan2 == BilanNettoyage(ajoutees=2, remplacees=1)
+        # La seule annonce RENAULT du premier lot a été remplacée : sa partie est supprimée
+        assert [p.relative_to(base.dossier).as_posix() for p in base.parties()] == [
+            "marque=CITROEN/partie-000001.parquet",
+            "marque=PEUGEOT/partie-000002.parquet",
+            "marque=RENAULT/partie-000002.parquet",
+        ]
+        assert len(base) == 4
+        assert_frame_equal(
+            base.lire().collect().sort("lien"),
+            gazoduc(data_brutes, nom_marques_modeles).sort("lien"),
+        )
+
+
+def test_nettoyage_incremental_sans_remplacement(tmp_path):
+    """
+    Vérifie que sans remplacement, la première version d'une annonce est gardée (comme supp_doublons).
+    """
+    data_brutes = get_donnees_brutes()
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    modifiee = data_brutes.head(1).with_columns(pl.lit("9 999 €").alias("prix"))
+    with BaseNettoyee(tmp_path / "database") as base:
+        nettoyage_incremental(data_brutes, nom_marques_modeles, base)
+        parties = base.parties()
+        bilan = nettoyage_incremental(
+            modifiee, nom_marques_modeles, base, remplacer=False
+        )
+        assert bilan == BilanNettoyage(ignorees=1)
+        assert base.parties() == parties
+        assert_frame_equal(
+            base.lire().collect().sort("lien"),
+            gazoduc(data_brutes, nom_marques_modeles).sort("lien"),
+        )
+
+
+def test_appliquer_delta(tmp_path):
+    """
+    Vérifie l'application d'un fichier delta : modification, ajout et suppression d'annonces.
+    """
+    data_brutes = get_donnees_brutes()
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    liens = data_brutes["lien"].to_list()
+    modifiee = data_brutes.row(0, named=True) | {"prix": "9 999 €"}
+    nouvelle = data_brutes.row(1, named=True) | {"lien": "lien-nouveau"}
+    with open(tmp_path / "delta.ndjson", "w", encoding="utf-8") as delta:
+        for operation, donnees in [
+            ("modification", modifiee),
+            ("ajout", nouvelle),
+            ("suppression", {"lien": liens[2], "marque": "X", "modele": "y"}),
+        ]:
+            delta.write(json.dumps({"operation": operation, **donnees}) + "\n")
+
+    with BaseNettoyee(tmp_path / "database") as base:
+        nettoyage_incremental(data_brutes, nom_marques_modeles, base)
+        bilan = appliquer_delta(tmp_path / "delta.ndjson", nom_marques_modeles, base)
+        assert bilan == BilanNettoyage(ajoutees=1, remplacees=1, supprimees=1)
+        base_nettoyee = base.lire().collect()
+        assert sorted(base_nettoyee["lien"]) == sorted(
+            [liens[0], liens[1], liens[3], "lien-nouveau"]
+        )
+        assert base_nettoyee.filter(pl.col("lien") == liens[0])["prix"][0] == 9999
+
+
+def test_reconstruire_index(tmp_path):
+    """
+    Vérifie que l'index des liens est reconstruit à l'identique depuis les parties Parquet.
+    """
+    data_brutes = get_donnees_brutes()
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    with BaseNettoyee(tmp_path / "database") as base:
+        nettoyage_incremental(data_brutes.head(2), nom_marques_modeles, base)
+        nettoyage_incremental(data_brutes.tail(2), nom_marques_modeles, base)
+        requete = "SELECT lien, partie FROM liens ORDER BY lien"
+        avant = base.connexion.execute(requete).fetchall()
+        base.connexion.execute("DELETE FROM liens")
+        base.reconstruire_index()
+        assert base.connexion.execute(requete).fetchall() == avant
+        assert base.supprimer(["lien-inconnu"]) == 0
+
+
+def test_compacter(tmp_path):
+    """
+    Vérifie que les parties d'une marque sont fusionnées (à la demande ou au-delà de `parties_max`) sans
+    changer la base, et que l'index des liens désigne la nouvelle partie.
+    """
+    data_brutes = get_donnees_brutes()
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    with BaseNettoyee(tmp_path / "database", parties_max=None) as base:
+        for i in range(data_brutes.height):
+            nettoyage_incremental(data_brutes.slice(i, 1), nom_marques_modeles, base)
+        avant = base.lire().collect().sort("lien")
+        assert len(base.parties("RENAULT")) == 2
+        assert base.compacter("RENAULT") == 2
+        assert base.compacter() == 0
+        assert [p.relative_to(base.dossier).as_posix() for p in base.parties()] == [
+            "marque=CITROEN/partie-000001.parquet",
+            "marque=PEUGEOT/partie-000003.parquet",
+            "marque=RENAULT/partie-000005.parquet",
+        ]
+        assert_frame_equal(base.lire().collect().sort("lien"), avant)
+        requete = "SELECT lien, partie FROM liens ORDER BY lien"
+        index = base.connexion.execute(requete).fetchall()
+        base.reconstruire_index()
+        assert base.connexion.execute(requete).fetchall() == index
+    with BaseNettoyee(tmp_path / "database_auto", parties_max=1) as base:
+        for i in range(data_brutes.height):
+            nettoyage_incremental(data_brutes.slice(i, 1), nom_marques_modeles, base)
+        assert len(base.parties()) == 3
+        assert_frame_equal(base.lire().collect().sort("lien"), avant)
+
+
+def test_migrer_base(tmp_path):
+    """
+    Vérifie la conversion d'une ancienne base monolithique en base partitionnée.
+    """
+    nettoyees = gazoduc(get_donnees_brutes(), pl.DataFrame(import_marques_modeles()))
+    nettoyees.write_parquet(tmp_path / "database.parquet")
+    migrer_base(tmp_path / "database.parquet", tmp_path / "database")
+    with BaseNettoyee(tmp_path / "database") as base:
+        assert len(base) == nettoyees.height
+        assert_frame_equal(base.lire().collect().sort("lien"), nettoyees.sort("lien"))
+
+
+def test_exporter_base(tmp_path):
+    """
+    Vérifie l'écriture de la base partitionnée par marque, triée par modèle, et la lecture d'une seule partition
+    avec Polars et avec DuckDB (élagage des partitions).
+    """
+    data_brutes = get_donnees_brutes()
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    nettoyees = gazoduc(data_brutes, nom_marques_modeles)
+    exporter_base(nettoyees.lazy(), tmp_path / "database")
+    exporter_base(nettoyees, tmp_path / "database")
+    assert sorted(p.name for p in (tmp_path / "database").iterdir()) == [
+        "index_liens.duckdb",
+        "marque=CITROEN",
+        "marque=PEUGEOT",
+        "marque=RENAULT",
+    ]
+    renault = lire_base(tmp_path / "database", "RENAULT").collect()
+    assert renault.columns == nettoyees.columns
+    assert renault["modele"].to_list() == ["CAPTUR", "CLIO"]
+    source = (
+        f"read_parquet('{tmp_path}/database/*/*.parquet', hive_partitioning = true)"
+    )
+    assert duckdb.sql(
+        f"SELECT modele FROM {source} WHERE marque = 'RENAULT' ORDER BY modele"
+    ).fetchall() == [("CAPTUR",), ("CLIO",)]
+    with BaseNettoyee(tmp_path / "database") as base:
+        assert len(base) == 4
+
+
+def test_get_empreintes_donnees(tmp_path):
+    """
+    Vérifie que seule l'empreinte de la marque dont une annonce est modifiée change.
+    """
+    data_brutes = get_donnees_brutes()
+    nettoyees = gazoduc(data_brutes, pl.DataFrame(import_marques_modeles()))
+    exporter_base(nettoyees, tmp_path / "database")
+    source = (
+        f"read_parquet('{tmp_path}/database/*/*.parquet', hive_partitioning = true)"
+    )
+    marques = ["CITROEN", "PEUGEOT", "RENAULT"]
+    avant = get_empreintes_donnees(marques, source)
+    assert sorted(avant) == marques
+    assert get_empreintes_donnees(marques, source) == avant
+    with BaseNettoyee(tmp_path / "database") as base:
+        base.ajouter(
+            nettoyees.filter(pl.col("marque") == "PEUGEOT").with_columns(
+                pl.col("prix") + 1
+            )
+        )
+    apres = get_empreintes_donnees(marques, source)
+    assert [marque for marque in marques if apres[marque] != avant[marque]] == [
+        "PEUGEOT"
+    ]
@@ -0,0 +1,113 @@
+"""Module de test sur le module checkpoint
+
+La reprise du scraping est testée contre un serveur HTTP local qui sert `pages/exemple_annonces.html`.
+"""
+
+from src.modules.scraping.regulation import ParametresRegulateur, RegulateurDebit
+from src.modules.scraping.webscraping import (
+    NomMarquesModeles,
+    ClientScraping,
+    ParametresClient,
+    voiture,
+)
+from src.modules.scraping.checkpoint import JournalReprise
+from src.modules.scraping.pipeline import extraire_toutes_voitures
+
+
+VOITURE_EX = voiture(
+    marque="CITROEN C3 III",
+    cylindre="1.2 PURETECH 110 FEEL",
+    annee="2019",
+    kilometrage="10 698 km",
+    boite="Automatique",
+    energie="Essence",
+    prix="15 990 €",
+    position_marché="Bonne affaire",
+    garantie="Garantie 12 mois",
+    lien="https://www.lacentrale.fr/auto-occasion-annonce-69112858137.html",
+)
+
+MARQUES_MODELES = [NomMarquesModeles(marque="CITROEN", modeles=["c3", "c4"])]
+
+
+def test_journal_reprise_rechargement(tmp_path):
+    """
+    Vérifie que les pages et les fins de modèle enregistrées sont retrouvées à la réouverture du journal.
+    """
+    chemin = tmp_path / "journal.ndjson"
+    with JournalReprise(chemin) as journal:
+        journal.enregistrer_page("CITROEN", "c3", 1, [VOITURE_EX])
+        journal.enregistrer_page("CITROEN", "c4", 1, [VOITURE_EX, VOITURE_EX])
+        assert journal.voitures_page("CITROEN", "c4", 1) == [VOITURE_EX, VOITURE_EX]
+        journal.enregistrer_fin_modele("CITROEN", "c3")
+    with JournalReprise(chemin) as journal:
+        assert journal.pages_modele("CITROEN", "c4") == [1]
+        assert journal.page_faite("CITROEN", "c3", 1)
+        assert not journal.page_faite("CITROEN", "c3", 2)
+        assert journal.modele_termine("CITROEN", "c3")
+        assert journal.voitures_page("CITROEN", "c3", 1) == [VOITURE_EX]
+
+
+def test_journal_reprise_ligne_incomplete(tmp_path):
+    """
+    Vérifie qu'une ligne incomplète (arrêt pendant une écriture) est ignorée et supprimée du journal.
+    """
+    chemin = tmp_path / "journal.ndjson"
+    with JournalReprise(chemin) as journal:
+        journal.enregistrer_page("CITROEN", "c3", 1, [VOITURE_EX])
+    with open(chemin, "a", encoding="utf-8") as fichier:
+        fichier.write('{"type": "page", "marque": "CITR')
+    with JournalReprise(chemin) as journal:
+        assert journal.pages_modele("CITROEN", "c3") == [1]
+        journal.enregistrer_page("CITROEN", "c3", 2, [VOITURE_EX])
+    with JournalReprise(chemin) as journal:
+        assert journal.pages_modele("CITROEN", "c3") == [1, 2]
+
+
+def test_extraire_toutes_voitures_reprise(serveur_annonces, tmp_path):
+    """
+    Vérifie qu'un scraping relancé avec un journal partiel ne retélécharge que les pages manquantes
+    et renvoie les mêmes voitures qu'un scraping complet.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    complet = extraire_toutes_voitures(10, MARQUES_MODELES, client)
+    assert len(serveur_annonces.requetes) == 4
+
+    chemin = tmp_path / "journal.ndjson"
+    with JournalReprise(chemin) as journal:
+        journal.enregistrer_page("CITROEN", "c3", 1, complet[:4], nombre_pages=2)
+    serveur_annonces.requetes.clear()
+    with JournalReprise(chemin) as journal:
+        assert journal.nombre_pages_annonce("CITROEN", "c3") == 2
+        repris = extraire_toutes_voitures(10, MARQUES_MODELES, client, journal)
+    assert repris == complet
+    # La première page de c3 est reprise du journal avec son nombre de pages : aucune page vide n'est demandée
+    assert len(serveur_annonces.requetes) == 3
+
+    serveur_annonces.requetes.clear()
+    with JournalReprise(chemin) as journal:
+        assert extraire_toutes_voitures(10, MARQUES_MODELES, client, journal) == complet
+    assert serveur_annonces.requetes == []
+
+
+def test_extraire_toutes_voitures_reprise_erreur_serveur(serveur_annonces, tmp_path):
+    """
+    Vérifie qu'un modèle interrompu par une page en erreur (503 à chaque tentative) n'est pas marqué terminé,
+    et que la reprise retélécharge la page en erreur.
+    """
+    client = ClientScraping(
+        ParametresClient(base_url=serveur_annonces.base_url),
+        RegulateurDebit(ParametresRegulateur(delai_base=0.01)),
+    )
+    chemin = tmp_path / "journal.ndjson"
+    serveur_annonces.statuts_forces = [200, 503, 503, 503]
+    with JournalReprise(chemin) as journal:
+        interrompu = extraire_toutes_voitures(10, MARQUES_MODELES, client, journal)
+        assert len(interrompu) == 4
+        assert not journal.modele_termine("CITROEN", "c3")
+    serveur_annonces.requetes.clear()
+    with JournalReprise(chemin) as journal:
+        repris = extraire_toutes_voitures(10, MARQUES_MODELES, client, journal)
+        assert journal.modele_termine("CITROEN", "c3")
+    assert len(repris) == 16
+    assert "page=2" in serveur_annonces.requetes[0]
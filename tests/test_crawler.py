@@ -0,0 +1,164 @@
+"""Module de test sur le module crawler
+
+Le scraping asynchrone est testé contre un serveur HTTP local qui sert `pages/exemple_annonces.html`.
+"""
+
+import asyncio
+import threading
+from bs4 import BeautifulSoup
+from pathlib import Path
+from src.modules.scraping.webscraping import (
+    NomMarquesModeles,
+    ClientScraping,
+    recup_annonces,
+    recup_data_voitures,
+    export_to_json,
+)
+from src.modules.scraping.crawler import (
+    CrawlerAsync,
+    ParametresCrawl,
+    extraire_toutes_voitures_async,
+)
+
+
+def get_voitures_exemple():
+    """
+    Récupère les voitures de la page d'exemple avec le scraping séquentiel.
+
+    ## Returns:
+        list: Liste des objets voiture de la page d'exemple.
+    """
+    chemin_exemple = Path(".").resolve() / "pages/exemple_annonces.html"
+    page = BeautifulSoup(
+        chemin_exemple.read_text(encoding="utf8"), features="html.parser"
+    )
+    return recup_data_voitures(recup_annonces(page))
+
+
+MARQUES_MODELES = [
+    NomMarquesModeles(marque="CITROEN", modeles=["c3", "c4"]),
+    NomMarquesModeles(marque="RENAULT", modeles=["clio"]),
+]
+
+
+def test_extraire_toutes_voitures_async(serveur_annonces):
+    """
+    Vérifie que le scraping asynchrone renvoie les mêmes voitures, dans le même ordre, que le scraping séquentiel.
+    Chaque modèle a 2 pages d'annonces, annoncées sur la première page : aucune page vide n'est demandée.
+    """
+    parametres = ParametresCrawl(concurrence=4, base_url=serveur_annonces.base_url)
+    voitures = extraire_toutes_voitures_async(10, MARQUES_MODELES, parametres)
+    assert voitures == get_voitures_exemple() * 6
+    assert len(serveur_annonces.requetes) == 6
+
+
+def test_extraire_toutes_voitures_async_nombre_pages(serveur_annonces):
+    """
+    Vérifie que le nombre de pages par modèle est bien limité par `nombre_pages`.
+    """
+    parametres = ParametresCrawl(base_url=serveur_annonces.base_url)
+    voitures = extraire_toutes_voitures_async(2, MARQUES_MODELES, parametres)
+    assert voitures == get_voitures_exemple() * 3
+
+
+def test_extraire_toutes_voitures_async_export_json(serveur_annonces, tmp_path):
+    """
+    Vérifie que l'export JSON du scraping asynchrone est identique octet par octet à celui du scraping séquentiel.
+    """
+    parametres = ParametresCrawl(base_url=serveur_annonces.base_url)
+    voitures = extraire_toutes_voitures_async(10, MARQUES_MODELES, parametres)
+    export_to_json(voitures, str(tmp_path / "async.json"))
+    export_to_json(get_voitures_exemple() * 6, str(tmp_path / "sequentiel.json"))
+    assert (tmp_path / "async.json").read_bytes() == (
+        tmp_path / "sequentiel.json"
+    ).read_bytes()
+
+
+def test_extraire_toutes_voitures_async_politesse(serveur_annonces):
+    """
+    Vérifie que le nombre de requêtes simultanées vers l'hôte ne dépasse pas la limite par hôte.
+    """
+    serveur_annonces.latence = 0.05
+    parametres = ParametresCrawl(
+        concurrence=8, concurrence_par_hote=2, base_url=serveur_annonces.base_url
+    )
+    extraire_toutes_voitures_async(10, MARQUES_MODELES, parametres)
+    assert serveur_annonces.max_en_cours <= 2
+
+
+def test_extraire_toutes_voitures_async_pages_entrelacees(serveur_annonces):
+    """
+    Vérifie que les pages restantes des modèles sont demandées en alternant les modèles,
+    après les premières pages de tous les modèles.
+    """
+    serveur_annonces.pages_par_modele = 3
+    parametres = ParametresCrawl(concurrence=1, base_url=serveur_annonces.base_url)
+    voitures = extraire_toutes_voitures_async(10, MARQUES_MODELES, parametres)
+    assert voitures == get_voitures_exemple() * 9
+    pages = [
+        (requete.split("%3A")[1].split("&")[0], requete.split("page=")[1])
+        for requete in serveur_annonces.requetes
+    ]
+    assert pages[3:] == [
+        ("C3", "2"),
+        ("C4", "2"),
+        ("CLIO", "2"),
+        ("C3", "3"),
+        ("C4", "3"),
+        ("CLIO", "3"),
+    ]
+
+
+def test_extraire_toutes_voitures_async_sans_nombre_pages(serveur_annonces):
+    """
+    Vérifie que, sans nombre d'annonces lisible, chaque modèle est parcouru jusqu'à sa première page vide.
+    """
+    serveur_annonces.afficher_total = False
+    parametres = ParametresCrawl(base_url=serveur_annonces.base_url)
+    voitures = extraire_toutes_voitures_async(10, MARQUES_MODELES, parametres)
+    assert voitures == get_voitures_exemple() * 6
+    assert len(serveur_annonces.requetes) == 9
+
+
+def test_extraire_toutes_voitures_async_taches_bornees(serveur_annonces, monkeypatch):
+    """
+    Vérifie que le nombre de tâches asyncio ne dépend pas du nombre de pages demandées.
+    """
+    serveur_annonces.pages_par_modele = 12
+    nombres_taches = []
+    recup_voitures_page_ou_none = CrawlerAsync.recup_voitures_page_ou_none
+
+    async def recup_en_comptant(self, *args):
+        nombres_taches.append(len(asyncio.all_tasks()))
+        return await recup_voitures_page_ou_none(self, *args)
+
+    monkeypatch.setattr(CrawlerAsync, "recup_voitures_page_ou_none", recup_en_comptant)
+    parametres = ParametresCrawl(concurrence=2, base_url=serveur_annonces.base_url)
+    voitures = extraire_toutes_voitures_async(20, MARQUES_MODELES, parametres)
+    assert voitures == get_voitures_exemple() * 36
+    assert len(nombres_taches) == 33
+    # La tâche principale, celle qui alimente la file et les deux tâches de traitement
+    assert max(nombres_taches) <= 4
+
+
+def test_crawler_pools_threads(serveur_annonces, monkeypatch):
+    """
+    Vérifie que les requêtes sont exécutées dans le pool de threads du crawler, et non dans le pool
+    par défaut d'asyncio, avec une concurrence supérieure à sa taille.
+    """
+    threads = set()
+    get = ClientScraping.get
+
+    def get_en_notant(self, *args, **kwargs):
+        threads.add(threading.current_thread().name.split("_")[0])
+        return get(self, *args, **kwargs)
+
+    monkeypatch.setattr(ClientScraping, "get", get_en_notant)
+    parametres = ParametresCrawl(concurrence=40, base_url=serveur_annonces.base_url)
+
+    async def lancer():
+        with CrawlerAsync(10, parametres) as crawler:
+            return await crawler.extraire(MARQUES_MODELES)
+
+    assert asyncio.run(lancer()) == get_voitures_exemple() * 6
+    assert threads == {"crawler-reseau"}
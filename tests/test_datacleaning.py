@@ -4,6 +4,8 @@ from src.modules.scraping.webscraping import fusionner_fichiers_json
 from src.modules.app.import_mm import import_marques_modeles
 from src.modules.datacleaning import (
     recup_marque_modele_generation,
+    indexer_marques_modeles,
+    resoudre_marque_modele_generation,
     get_cylindre,
     get_garantie,
     get_km_prix_annee,
@@ -15,6 +17,8 @@ from src.modules.datacleaning import (
     filter_data,
     clean_cylindre,
     gazoduc,
+    gazoduc_lazy,
+    gazoduc_vers_parquet,
 )
 from polars.testing import assert_frame_equal
 import polars as pl
@@ -50,6 +54,56 @@ def test_get_recup_marques_modeles_generation():
     assert_frame_equal(get_marque_modele_generation(data_ex, mrq_mod_ex), resultat)
 
 
+def test_resoudre_marque_modele_generation_identique():
+    """
+    Vérifie que la résolution indexée donne le même résultat que recup_marque_modele_generation
+    pour tous les modèles connus, y compris dans les cas limites (marque au milieu du nom ou d'un mot, modèle
+    seul, modèle collé à la suite, modèle en minuscules, nom inconnu).
+    """
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    index = indexer_marques_modeles(nom_marques_modeles)
+    for marque, modeles in nom_marques_modeles.iter_rows():
+        for modele in modeles:
+            for nom_vehicule in [
+                f"{marque} {modele.upper()}",
+                f"{marque} {modele.upper()} II",
+                f"X {marque} {modele.upper()} phase 2",
+                f"{marque} {modele}",
+                f"{marque} {modele.upper()}X",
+                f"X{marque} {modele.upper()}X {modele.upper()} 3",
+            ]:
+                assert resoudre_marque_modele_generation(
+                    nom_vehicule, index
+                ) == recup_marque_modele_generation(
+                    (nom_vehicule,), nom_marques_modeles
+                )
+    assert resoudre_marque_modele_generation("MARQUE INCONNUE", index) is None
+
+
+def test_get_marque_modele_generation_doublons():
+    """
+    Vérifie que les noms répétés et les noms inconnus sont rattachés aux bonnes lignes, dans l'ordre d'origine.
+    """
+    data_ex = pl.DataFrame(
+        {
+            "prix": [1, 2, 3, 4],
+            "marque": ["RENAULT CLIO V", "INCONNU", "CITROEN C3 III", "RENAULT CLIO V"],
+        }
+    )
+    mrq_mod_ex = pl.DataFrame(
+        {"marque": ["CITROEN", "RENAULT"], "modeles": [["C3"], ["CLIO"]]}
+    )
+    resultat = pl.DataFrame(
+        {
+            "prix": [1, 2, 3, 4],
+            "marque": ["RENAULT", None, "CITROEN", "RENAULT"],
+            "modele": ["CLIO", None, "C3", "CLIO"],
+            "generation": ["V", None, "III", "V"],
+        }
+    )
+    assert_frame_equal(get_marque_modele_generation(data_ex, mrq_mod_ex), resultat)
+
+
 def test_get_km_prix_annee():
     """
     Vérifie que la fonction get_km_prix_annee() renvoie le DataFrame résultant attendu avec les colonnes "kilometrage",
@@ -226,6 +280,34 @@ def test_get_cylindre():
     assert_frame_equal(get_cylindre(data_ex), resultat)
 
 
+def test_get_cylindre_cas_limites():
+    """
+    Vérifie les cas où plusieurs motifs se recouvrent : la priorité des colonnes complétées est conservée.
+    """
+    data_ex = pl.DataFrame(
+        {
+            "cylindre": [
+                "1.6 HDI 90 5P",
+                "1.5 DCI 110",
+                "2.0 150",
+                "300ch 80kWh E-TECH 300",
+                "1.5 E-TECH 140 ZEN",
+                None,
+            ]
+        }
+    )
+    resultat = pl.DataFrame(
+        {
+            "cylindre": ["1.6", "1.5", "2.0", None, "1.5", None],
+            "moteur": ["HDI", "DCI", None, None, "E-TECH", None],
+            "puissance": [90, 110, 150, 300, 140, None],
+            "finition": ["5P", None, None, "E-TECH 300", "ZEN", None],
+            "batterie": [None, None, None, "80kWh", None, None],
+        }
+    )
+    assert_frame_equal(get_cylindre(data_ex), resultat)
+
+
 def test_filter_data():
     """
     Teste la fonction filter_data pour s'assurer qu'elle filtre correctement les données.
@@ -344,3 +426,59 @@ def test_gazoduc():
         ]
     )
     assert_frame_equal(gazoduc(data_brutes, nom_marques_modeles), resultat)
+
+
+def get_donnees_brutes_doublons() -> pl.DataFrame:
+    """
+    Renvoie les données de test répétées, avec une ligne inconnue et une ligne rejetée par la validation.
+    """
+    data_brutes = pl.DataFrame(fusionner_fichiers_json(["test_data.json"]))
+    inconnue = data_brutes.head(1).with_columns(
+        pl.lit("INCONNU X").alias("marque"), pl.lit("lien-inconnu").alias("lien")
+    )
+    erreur = data_brutes.tail(1).with_columns(pl.lit("erreur").alias("energie"))
+    return pl.concat([erreur, data_brutes, inconnue, data_brutes.reverse()])
+
+
+def test_gazoduc_lazy():
+    """
+    Vérifie que le pipeline LazyFrame exécuté en streaming donne exactement le résultat de gazoduc.
+    """
+    data_brutes = get_donnees_brutes_doublons()
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    pipeline = gazoduc_lazy(data_brutes.lazy(), nom_marques_modeles)
+    assert isinstance(pipeline, pl.LazyFrame)
+    assert_frame_equal(
+        pipeline.collect(streaming=True), gazoduc(data_brutes, nom_marques_modeles)
+    )
+
+
+def test_gazoduc_vers_parquet(tmp_path):
+    """
+    Vérifie que le nettoyage en deux passes streaming vers Parquet donne exactement le résultat de gazoduc,
+    lignes rejetées comprises.
+    """
+    data_brutes = get_donnees_brutes_doublons()
+    data_brutes.write_parquet(tmp_path / "brut.parquet")
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    gazoduc_vers_parquet(
+        pl.scan_parquet(tmp_path / "brut.parquet"),
+        nom_marques_modeles,
+        tmp_path / "database.parquet",
+        tmp_path / "rejets.parquet",
+    )
+    assert_frame_equal(
+        pl.read_parquet(tmp_path / "database.parquet"),
+        gazoduc(data_brutes, nom_marques_modeles, tmp_path / "rejets_gazoduc.parquet"),
+    )
+    assert_frame_equal(
+        pl.read_parquet(tmp_path / "rejets.parquet"),
+        pl.read_parquet(tmp_path / "rejets_gazoduc.parquet"),
+    )
+    assert pl.read_parquet(tmp_path / "rejets.parquet").height == 2
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "brut.parquet",
+        "database.parquet",
+        "rejets.parquet",
+        "rejets_gazoduc.parquet",
+    ]
@@ -0,0 +1,107 @@
+"""Module de test sur le module dedoublonnage"""
+
+from src.modules.scraping.webscraping import fusionner_fichiers_json
+from src.modules.app.import_mm import import_marques_modeles
+from src.modules.datacleaning import gazoduc
+from src.modules.dedoublonnage import IndexEmpreintes
+from src.modules.base_donnees import (
+    BaseNettoyee,
+    BilanNettoyage,
+    nettoyage_incremental,
+)
+import polars as pl
+import pytest
+
+
+def get_donnees_nettoyees() -> pl.DataFrame:
+    data_brutes = pl.DataFrame(fusionner_fichiers_json(["test_data.json"]))
+    return gazoduc(data_brutes, pl.DataFrame(import_marques_modeles()))
+
+
+def test_filtrer(tmp_path):
+    """
+    Vérifie qu'une annonce remise en vente sous un nouveau lien est écartée, dans un lot suivant comme dans
+    le même lot, et qu'une annonce revue ou modifiée sous le même lien est gardée.
+    """
+    nettoyees = get_donnees_nettoyees()
+    remise_en_vente = nettoyees.head(1).with_columns(
+        pl.lit("lien-nouveau").alias("lien"), pl.col("modele").str.to_lowercase()
+    )
+    modifiee = nettoyees.tail(1).with_columns(pl.col("prix") - 500)
+    with IndexEmpreintes(tmp_path / "empreintes.duckdb") as empreintes:
+        assert empreintes.filtrer(nettoyees).equals(nettoyees)
+        assert len(empreintes) == nettoyees.height
+        lot = pl.concat([remise_en_vente, nettoyees.head(2), modifiee, modifiee])
+        assert empreintes.filtrer(lot).equals(pl.concat([nettoyees.head(2), modifiee]))
+        assert len(empreintes) == nettoyees.height
+        assert empreintes.filtrer(lot.clear()).height == 0
+
+
+def test_oublier(tmp_path):
+    """
+    Vérifie qu'une annonce supprimée puis remise en vente n'est plus un doublon, y compris après réouverture
+    de l'index.
+    """
+    nettoyees = get_donnees_nettoyees()
+    remise_en_vente = nettoyees.head(1).with_columns(
+        pl.lit("lien-nouveau").alias("lien")
+    )
+    with IndexEmpreintes(tmp_path / "empreintes.duckdb") as empreintes:
+        empreintes.filtrer(nettoyees)
+    with IndexEmpreintes(tmp_path / "empreintes.duckdb") as empreintes:
+        assert empreintes.filtrer(remise_en_vente).height == 0
+        assert empreintes.oublier(nettoyees.head(1)["lien"]) == 1
+        assert empreintes.oublier(["lien-inconnu"]) == 0
+        assert empreintes.filtrer(remise_en_vente).equals(remise_en_vente)
+
+
+def test_nettoyage_incremental_empreintes(tmp_path):
+    """
+    Vérifie que le nettoyage incrémental n'intègre pas les annonces remises en vente sous un nouveau lien.
+    """
+    data_brutes = pl.DataFrame(fusionner_fichiers_json(["test_data.json"]))
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    remise_en_vente = data_brutes.head(1).with_columns(
+        pl.lit("lien-nouveau").alias("lien")
+    )
+    with (
+        BaseNettoyee(tmp_path / "database") as base,
+        IndexEmpreintes(tmp_path / "empreintes.duckdb") as empreintes,
+    ):
+        nettoyage_incremental(
+            data_brutes, nom_marques_modeles, base, empreintes=empreintes
+        )
+        bilan = nettoyage_incremental(
+            remise_en_vente, nom_marques_modeles, base, empreintes=empreintes
+        )
+        assert bilan == BilanNettoyage(doublons=1)
+        assert len(base) == 4
+
+
+def test_nettoyage_incremental_echec_ecriture(tmp_path, monkeypatch):
+    """
+    Vérifie que les empreintes d'un lot ne sont pas enregistrées si l'écriture dans la base échoue : le lot
+    repassé ensuite est intégré.
+    """
+    data_brutes = pl.DataFrame(fusionner_fichiers_json(["test_data.json"]))
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+
+    def ajouter_en_echec(*args, **kwargs):
+        raise OSError("disque plein")
+
+    with (
+        BaseNettoyee(tmp_path / "database") as base,
+        IndexEmpreintes(tmp_path / "empreintes.duckdb") as empreintes,
+    ):
+        with monkeypatch.context() as patch:
+            patch.setattr(base, "ajouter", ajouter_en_echec)
+            with pytest.raises(OSError):
+                nettoyage_incremental(
+                    data_brutes, nom_marques_modeles, base, empreintes=empreintes
+                )
+        assert len(empreintes) == 0
+        bilan = nettoyage_incremental(
+            data_brutes, nom_marques_modeles, base, empreintes=empreintes
+        )
+        assert bilan.doublons == 0
+        assert len(base) == len(empreintes) == 4
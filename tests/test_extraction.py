@@ -0,0 +1,79 @@
+"""Module de test sur le module extraction
+
+Les moteurs d'extraction doivent renvoyer exactement les mêmes voitures que les fonctions `recup_*`.
+"""
+
+from pathlib import Path
+from bs4 import BeautifulSoup
+from src.modules.scraping.extraction import (
+    ExtracteurAnnonces,
+    ExtracteurClassique,
+    ExtracteurRapide,
+    extraire_carte,
+    get_extracteur,
+)
+from src.modules.scraping.webscraping import recup_informations_voiture
+import pytest
+
+
+def get_contenu_exemple():
+    """
+    Renvoie le contenu de la page d'exemple.
+    """
+    return (Path(".").resolve() / "pages/exemple_annonces.html").read_bytes()
+
+
+def test_extracteur_rapide_identique():
+    """
+    Vérifie que le moteur rapide renvoie les mêmes voitures que le moteur classique sur la page d'exemple.
+    """
+    contenu = get_contenu_exemple()
+    classique = ExtracteurClassique().extraire(contenu)
+    assert len(classique) == 4
+    assert ExtracteurRapide().extraire(contenu) == classique
+    assert ExtracteurRapide(parser="html.parser").extraire(contenu) == classique
+
+
+def test_extraire_carte_sans_garantie_ni_lien():
+    """
+    Vérifie les cas dégradés : énergie absente, pas de garantie et pas de lien.
+    """
+    carte = BeautifulSoup(
+        """<div class="searchCardContainer">
+        <h2 class="Text_Text_text Vehiculecard_Vehiculecard_title Text_Text_subtitle2">DACIA SANDERO</h2>
+        <div class="Text_Text_text Vehiculecard_Vehiculecard_subTitle Text_Text_body2">1.0 SCE 65</div>
+        <div class="Text_Text_text Vehiculecard_Vehiculecard_characteristicsItems Text_Text_body2">2020</div>
+        <div class="Text_Text_text Vehiculecard_Vehiculecard_characteristicsItems Text_Text_body2">10 000 km</div>
+        <div class="Text_Text_text Vehiculecard_Vehiculecard_characteristicsItems Text_Text_body2">Manuelle</div>
+        <span class="Text_Text_text Vehiculecard_Vehiculecard_price Text_Text_subtitle2">9 990 €</span>
+        <div class="Text_Text_text Text_Text_bold Text_Text_label2">Bonne affaire</div>
+        </div>""",
+        "html.parser",
+    ).div
+    assert extraire_carte(carte) == recup_informations_voiture(carte)
+    assert extraire_carte(carte).energie == "erreur"
+    assert extraire_carte(carte).garantie == "NA"
+    assert extraire_carte(carte).lien == "NA"
+
+
+def test_get_extracteur_inconnu():
+    """
+    Vérifie qu'un nom de moteur inconnu génère une ValueError.
+    """
+    assert isinstance(get_extracteur("classique"), ExtracteurClassique)
+    with pytest.raises(ValueError):
+        get_extracteur("regex")
+
+
+def test_extracteur_abstrait():
+    """
+    Vérifie qu'un moteur sans méthode extraire ne peut pas être instancié.
+    """
+    with pytest.raises(TypeError):
+        ExtracteurAnnonces()
+
+    class ExtracteurIncomplet(ExtracteurAnnonces):
+        nom = "incomplet"
+
+    with pytest.raises(TypeError):
+        ExtracteurIncomplet()
@@ -0,0 +1,180 @@
+"""Module de test sur le module incremental
+
+Le scraping incrémental est testé contre un serveur HTTP local qui sert `pages/exemple_annonces.html`
+(4 annonces par page, les mêmes sur chaque page).
+"""
+
+import json
+from src.modules.scraping.regulation import ParametresRegulateur, RegulateurDebit
+from src.modules.scraping.webscraping import (
+    NomMarquesModeles,
+    ClientScraping,
+    ParametresClient,
+)
+from src.modules.scraping.incremental import (
+    EntreeIndex,
+    IndexAnnonces,
+    scraping_incremental,
+)
+
+
+MARQUES_MODELES = [NomMarquesModeles(marque="CITROEN", modeles=["c3"])]
+LIEN_EX = "https://www.lacentrale.fr/auto-occasion-annonce-69112858137.html"
+
+
+def lire_delta(chemin) -> list[dict]:
+    with open(chemin, encoding="utf-8") as fichier:
+        return [json.loads(ligne) for ligne in fichier]
+
+
+def test_scraping_incremental_premier_passage(serveur_annonces, tmp_path):
+    """
+    Vérifie qu'un premier passage parcourt tout le modèle, ajoute les annonces et supprime celles qui ont disparu.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    index = IndexAnnonces(tmp_path / "index.parquet")
+    index.ajouter(
+        "ancienne",
+        EntreeIndex("CITROEN", "c3", "10 000 €", "Bonne affaire", "2024-01-01"),
+    )
+    bilan = scraping_incremental(
+        10, MARQUES_MODELES, index, tmp_path / "delta.ndjson", client, date="2024-01-02"
+    )
+    assert (bilan.ajouts, bilan.modifications, bilan.suppressions) == (4, 0, 1)
+    assert bilan.pages_extraites == 2
+    assert bilan.modeles_complets == 1
+    delta = lire_delta(tmp_path / "delta.ndjson")
+    assert [d["operation"] for d in delta] == ["ajout"] * 4 + ["suppression"]
+    assert delta[0]["lien"] == LIEN_EX
+    assert delta[-1]["lien"] == "ancienne"
+    assert len(index) == 4
+    assert index.annonces[LIEN_EX].derniere_vue == "2024-01-02"
+
+
+def test_scraping_incremental_arret_page_connue(serveur_annonces, tmp_path):
+    """
+    Vérifie qu'un second passage s'arrête à la première page connue et inchangée, sans suppression,
+    et qu'une modification de prix est détectée.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    chemin_index = tmp_path / "index.parquet"
+    index = IndexAnnonces(chemin_index)
+    scraping_incremental(10, MARQUES_MODELES, index, tmp_path / "delta1.ndjson", client)
+    index.sauvegarder()
+
+    serveur_annonces.requetes.clear()
+    index = IndexAnnonces(chemin_index)
+    assert len(index) == 4
+    bilan = scraping_incremental(
+        10, MARQUES_MODELES, index, tmp_path / "delta2.ndjson", client
+    )
+    assert len(serveur_annonces.requetes) == 1
+    assert (bilan.ajouts, bilan.modifications, bilan.suppressions) == (0, 0, 0)
+    assert bilan.modeles_complets == 0
+    assert lire_delta(tmp_path / "delta2.ndjson") == []
+
+    index.annonces[LIEN_EX].prix = "99 999 €"
+    bilan = scraping_incremental(
+        10, MARQUES_MODELES, index, tmp_path / "delta3.ndjson", client
+    )
+    assert bilan.modifications == 1
+    assert bilan.pages_extraites == 2
+    delta = lire_delta(tmp_path / "delta3.ndjson")
+    assert [(d["operation"], d["lien"], d["prix"]) for d in delta] == [
+        ("modification", LIEN_EX, "15 990 €")
+    ]
+    assert index.annonces[LIEN_EX].prix == "15 990 €"
+
+
+def test_scraping_incremental_limite_pages(serveur_annonces, tmp_path):
+    """
+    Vérifie qu'un modèle arrêté par la limite du nombre de pages ne supprime aucune annonce de l'index.
+    """
+    serveur_annonces.pages_par_modele = 50
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    index = IndexAnnonces(tmp_path / "index.parquet")
+    index.ajouter(
+        "ancienne",
+        EntreeIndex("CITROEN", "c3", "10 000 €", "Bonne affaire", "2024-01-01"),
+    )
+    bilan = scraping_incremental(
+        4, MARQUES_MODELES, index, tmp_path / "delta.ndjson", client
+    )
+    assert bilan.pages_extraites == 3
+    assert (bilan.suppressions, bilan.modeles_complets) == (0, 0)
+    assert "ancienne" in index
+
+
+def test_scraping_incremental_erreur_serveur(serveur_annonces, tmp_path):
+    """
+    Vérifie qu'une page en erreur (503 à chaque tentative) n'est pas lue comme la fin du modèle.
+    """
+    serveur_annonces.statuts_forces = [503, 503, 503]
+    client = ClientScraping(
+        ParametresClient(base_url=serveur_annonces.base_url),
+        RegulateurDebit(ParametresRegulateur(delai_base=0.01)),
+    )
+    index = IndexAnnonces(tmp_path / "index.parquet")
+    index.ajouter(
+        LIEN_EX,
+        EntreeIndex("CITROEN", "c3", "15 990 €", "Bonne affaire", "2024-01-01"),
+    )
+    bilan = scraping_incremental(
+        10, MARQUES_MODELES, index, tmp_path / "delta.ndjson", client
+    )
+    assert (bilan.pages_extraites, bilan.suppressions, bilan.modeles_complets) == (
+        0,
+        0,
+        0,
+    )
+    assert len(index) == 1
+    assert lire_delta(tmp_path / "delta.ndjson") == []
+
+
+def test_scraping_incremental_passage_complet(serveur_annonces, tmp_path):
+    """
+    Vérifie qu'un modèle dont une annonce n'a pas été vue depuis `jours_passage_complet` jours est parcouru
+    sans arrêt anticipé, ce qui supprime les annonces disparues.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    index = IndexAnnonces(tmp_path / "index.parquet")
+    scraping_incremental(
+        10,
+        MARQUES_MODELES,
+        index,
+        tmp_path / "delta1.ndjson",
+        client,
+        date="2024-01-10",
+    )
+    index.ajouter(
+        "ancienne",
+        EntreeIndex("CITROEN", "c3", "10 000 €", "Bonne affaire", "2024-01-10"),
+    )
+    bilan = scraping_incremental(
+        10,
+        MARQUES_MODELES,
+        index,
+        tmp_path / "delta2.ndjson",
+        client,
+        date="2024-01-12",
+    )
+    assert (bilan.pages_extraites, bilan.suppressions) == (1, 0)
+    assert "ancienne" in index
+    bilan = scraping_incremental(
+        10,
+        MARQUES_MODELES,
+        index,
+        tmp_path / "delta3.ndjson",
+        client,
+        date="2024-01-17",
+    )
+    assert (bilan.pages_extraites, bilan.modeles_complets, bilan.suppressions) == (
+        2,
+        1,
+        1,
+    )
+    assert (
+        index.liens_modele("CITROEN", "c3")
+        == [LIEN_EX] + [lien for lien in index.annonces if lien != LIEN_EX][:3]
+    )
+    assert index.plus_ancienne_vue("CITROEN", "c3") == "2024-01-17"
@@ -1,11 +1,30 @@
 """Module de test sur le machinelearning
 """
 
-from src.modules.machinelearning import split_data
+from src.modules.machinelearning import (
+    split_data,
+    planifier_entrainements,
+    LotEntrainement,
+    entrainer_marque,
+    get_pipeline,
+    find_best_model,
+    get_recherche,
+    set_models,
+    MemoirePreprocesseurs,
+)
+from sklearn.linear_model import LinearRegression
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.model_selection import GridSearchCV
+import numpy as np
+import pickle
+import tempfile
+import pytest
+import pandas as pd
 import polars as pl
 from polars.testing import assert_frame_equal
 
 
+# fmt: off
 data = pl.DataFrame(
     [
         pl.Series("annee", [2023, 2018, 2021, 2024, 2021, 2022, 2007, 2023, 2024, 2021, 2021, 2024, 2023, 2023, 2023, 2021, 2021, 2018, 2022, 2023], dtype=pl.Int32),
@@ -26,7 +45,9 @@ data = pl.DataFrame(
         pl.Series("batterie", [None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None, None], dtype=pl.Utf8),
     ]
 )
-    
+# fmt: on
+
+
 def test_split_data():
     """
     Vérifie que la fonction split_data renvoie les résultats attendus pour les données d'entrée.
@@ -37,9 +58,226 @@ def test_split_data():
         de split_data ne correspondent pas aux attentes.
     """
     X, y, X_train, X_test, y_train, y_test = split_data(data, "CITROEN")
-    assert_frame_equal(data[['annee', 'kilometrage', 'boite', 'energie', 'marque', 'modele', 'generation', 'cylindre', 'moteur', 'puissance', 'finition', 'batterie']], X)    
-    assert_frame_equal(data[['prix']], y)
-    assert len(X_train) == len(data)*0.8
-    assert len(X_test) == len(data)*0.2
-    assert len(y_train) == len(data)*0.8
-    assert len(y_test) == len(data)*0.2
+    assert_frame_equal(
+        data[
+            [
+                "annee",
+                "kilometrage",
+                "boite",
+                "energie",
+                "marque",
+                "modele",
+                "generation",
+                "cylindre",
+                "moteur",
+                "puissance",
+                "finition",
+                "batterie",
+            ]
+        ],
+        X,
+    )
+    assert_frame_equal(data[["prix"]], y)
+    assert len(X_train) == len(data) * 0.8
+    assert len(X_test) == len(data) * 0.2
+    assert len(y_train) == len(data) * 0.8
+    assert len(y_test) == len(data) * 0.2
+
+
+def test_planifier_entrainements():
+    """
+    Vérifie que les marques sont lancées de la plus grosse à la plus petite, que les grosses marques
+    reçoivent plus de threads et que les cœurs sont répartis entre les processus sans dépassement.
+    """
+    effectifs = {"AUDI": 500, "PEUGEOT": 3000, "BMW": 800, "DACIA": 800}
+    assert planifier_entrainements(effectifs, n_coeurs=8) == [
+        LotEntrainement(["PEUGEOT"], 1, 8),
+        LotEntrainement(["BMW", "DACIA", "AUDI"], 3, 2),
+    ]
+    assert planifier_entrainements(effectifs, n_workers=2, n_coeurs=8) == [
+        LotEntrainement(["PEUGEOT"], 1, 8),
+        LotEntrainement(["BMW", "DACIA", "AUDI"], 2, 4),
+    ]
+    egaux = {"AUDI": 800, "BMW": 800, "DACIA": 800}
+    assert planifier_entrainements(egaux, n_coeurs=8) == [
+        LotEntrainement(["AUDI", "BMW", "DACIA"], 3, 2)
+    ]
+    for n_workers, n_coeurs in ((16, 2), (1, 8), (3, 8)):
+        for lot in planifier_entrainements(effectifs, n_workers, n_coeurs):
+            assert lot.n_workers <= min(n_workers, n_coeurs)
+            assert lot.n_workers * lot.n_jobs <= n_coeurs
+    assert planifier_entrainements(effectifs, n_workers=1, n_coeurs=8) == [
+        LotEntrainement(["PEUGEOT", "BMW", "DACIA", "AUDI"], 1, 8)
+    ]
+    assert planifier_entrainements({}) == []
+
+
+def test_entrainer_marque_erreur(tmp_path, monkeypatch):
+    """
+    Vérifie qu'une erreur pendant l'entraînement d'une marque est renvoyée dans son résultat sans être levée.
+    """
+    monkeypatch.chdir(tmp_path)
+    resultat = entrainer_marque("CITROEN", 1)
+    assert resultat.marque == "CITROEN"
+    assert resultat.modele is None
+    assert resultat.erreur is not None
+
+
+def test_memoire_preprocesseurs():
+    """
+    Vérifie que le préprocesseur n'est ajusté qu'une fois par pli pour toutes les combinaisons de paramètres,
+    avec les mêmes scores que sans cache.
+    """
+    X, y, X_train, X_test, y_train, y_test = split_data(data, "CITROEN")
+    grille = {"model__n_neighbors": [1, 2, 3, 4]}
+    memoire = MemoirePreprocesseurs()
+    avec_cache = GridSearchCV(
+        get_pipeline(KNeighborsRegressor(), memoire=memoire), grille, cv=5
+    ).fit(X_train, y_train)
+    sans_cache = GridSearchCV(get_pipeline(KNeighborsRegressor()), grille, cv=5).fit(
+        X_train, y_train
+    )
+    # Cinq plis, puis le réentraînement sur tout X_train
+    assert len(memoire.resultats) == 6
+    np.testing.assert_allclose(
+        avec_cache.cv_results_["mean_test_score"],
+        sans_cache.cv_results_["mean_test_score"],
+    )
+
+
+def test_find_best_model(tmp_path, monkeypatch):
+    """
+    Vérifie que find_best_model renvoie un pipeline entraîné et exporte les paramètres sans le préfixe du pipeline.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cv_results").mkdir()
+    X, y, X_train, X_test, y_train, y_test = split_data(data, "CITROEN")
+    models = {
+        "LinearRegression": LinearRegression(),
+        "KNeighbors": KNeighborsRegressor(),
+    }
+    param_grids = {"LinearRegression": {}, "KNeighbors": {"n_neighbors": [2, 3]}}
+    best_pipeline, best_model_name = find_best_model(
+        models,
+        param_grids,
+        None,
+        X_train,
+        y_train,
+        "CITROEN",
+        memoire=MemoirePreprocesseurs(),
+    )
+    assert best_model_name in models
+    assert best_pipeline.predict(X_test).shape[0] == len(X_test)
+    resultats = pd.read_json(
+        tmp_path / "cv_results/CITROEN_KNeighbors_results.json", lines=True
+    )
+    assert list(resultats["params"][0]) == ["n_neighbors"]
+    assert "param_n_neighbors" in resultats.columns
+
+
+def test_get_recherche():
+    """
+    Vérifie que la recherche par divisions successives de la forêt aléatoire utilise le nombre d'arbres comme
+    ressource, qu'une grille d'une combinaison ou une petite marque donnent une recherche sur grille, et qu'une
+    recherche inconnue lève une ValueError.
+    """
+    models, param_grids = set_models()
+    recherche = get_recherche(
+        get_pipeline(models["RandomForest"]),
+        param_grids["RandomForest"],
+        "RandomForest",
+        "halving",
+    )
+    assert recherche.resource == "model__n_estimators"
+    assert recherche.max_resources == max(param_grids["RandomForest"]["n_estimators"])
+    assert "model__n_estimators" not in recherche.param_grid
+    assert isinstance(
+        get_recherche(
+            get_pipeline(models["LinearRegression"]), {}, "LinearRegression", "halving"
+        ),
+        GridSearchCV,
+    )
+    assert isinstance(
+        get_recherche(
+            get_pipeline(models["KNeighbors"]),
+            param_grids["KNeighbors"],
+            "KNeighbors",
+            "halving",
+            nombre_observations=len(data),
+        ),
+        GridSearchCV,
+    )
+    with pytest.raises(ValueError, match="Recherche inconnue"):
+        get_recherche(get_pipeline(models["KNeighbors"]), {}, "KNeighbors", "aleatoire")
+
+
+def test_find_best_model_halving(tmp_path, monkeypatch):
+    """
+    Vérifie que les résultats exportés d'une recherche par divisions successives contiennent toutes les
+    itérations avec leurs ressources, le rang 1 étant le meilleur candidat de la dernière itération.
+    """
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cv_results").mkdir()
+    # Assez d'observations pour une première itération d'au moins OBSERVATIONS_MIN_HALVING observations
+    X, y, X_train, X_test, y_train, y_test = split_data(
+        pl.concat([data] * 60), "CITROEN"
+    )
+    find_best_model(
+        {"KNeighbors": KNeighborsRegressor()},
+        {"KNeighbors": {"n_neighbors": [1, 2, 3]}},
+        None,
+        X_train,
+        y_train,
+        "CITROEN",
+        recherche="halving",
+    )
+    resultats = pd.read_json(
+        tmp_path / "cv_results/CITROEN_KNeighbors_results.json", lines=True
+    )
+    assert len(resultats) > 3
+    assert {"iter", "n_resources"} <= set(resultats.columns)
+    meilleur = resultats[resultats["rank_test_score"] == 1].iloc[0]
+    assert meilleur["iter"] == resultats["iter"].max()
+    assert meilleur["n_resources"] == resultats["n_resources"].max()
+
+
+def test_memoire_preprocesseurs_bornee():
+    """
+    Vérifie que le cache en mémoire est borné et qu'il n'est pas copié avec le pipeline vers un autre processus.
+    """
+    X, y, X_train, X_test, y_train, y_test = split_data(data, "CITROEN")
+    memoire = MemoirePreprocesseurs(taille_max=2)
+    GridSearchCV(
+        get_pipeline(KNeighborsRegressor(), memoire=memoire),
+        {"model__n_neighbors": [1, 2]},
+        cv=5,
+    ).fit(X_train, y_train)
+    assert len(memoire.resultats) == 2
+    copie = pickle.loads(pickle.dumps(memoire))
+    assert copie.taille_max == 2
+    assert len(copie.resultats) == 0
+
+
+def test_find_best_model_parallele(tmp_path, monkeypatch):
+    """
+    Vérifie qu'avec une recherche parallèle, le cache en mémoire est remplacé par un dossier temporaire supprimé
+    ensuite, et que le pipeline renvoyé garde le cache en mémoire.
+    """
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(tempfile, "tempdir", str(tmp_path))
+    (tmp_path / "cv_results").mkdir()
+    X, y, X_train, X_test, y_train, y_test = split_data(data, "CITROEN")
+    memoire = MemoirePreprocesseurs()
+    best_pipeline, best_model_name = find_best_model(
+        {"KNeighbors": KNeighborsRegressor()},
+        {"KNeighbors": {"n_neighbors": [2, 3]}},
+        None,
+        X_train,
+        y_train,
+        "CITROEN",
+        n_jobs=2,
+        memoire=memoire,
+    )
+    assert best_pipeline.memory is memoire
+    assert best_pipeline.predict(X_test).shape[0] == len(X_test)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["cv_results"]
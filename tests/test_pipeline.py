@@ -0,0 +1,53 @@
+"""Module de test sur le module pipeline
+
+Les pipelines sont testés contre un serveur HTTP local qui sert `pages/exemple_annonces.html`.
+"""
+
+from src.modules.scraping.webscraping import (
+    NomMarquesModeles,
+    ClientScraping,
+    ParametresClient,
+)
+from src.modules.scraping.pipeline import (
+    generer_voitures,
+    generer_voitures_parallele,
+)
+
+
+MARQUES_MODELES = [
+    NomMarquesModeles(marque="CITROEN", modeles=["c3", "c4"]),
+    NomMarquesModeles(marque="RENAULT", modeles=["clio"]),
+]
+
+
+def test_generer_voitures_parallele_ordre(serveur_annonces):
+    """
+    Vérifie que l'analyse dans un pool de processus renvoie les mêmes voitures, dans le même ordre,
+    que le pipeline séquentiel, et ne télécharge pas plus de pages.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    sequentiel = list(generer_voitures(10, MARQUES_MODELES, client))
+    requetes_sequentiel = len(serveur_annonces.requetes)
+    serveur_annonces.requetes.clear()
+    parallele = list(
+        generer_voitures_parallele(10, MARQUES_MODELES, client, nombre_workers=2)
+    )
+    assert parallele == sequentiel
+    assert len(parallele) == 24
+    assert len(serveur_annonces.requetes) == requetes_sequentiel
+
+
+def test_generer_voitures_parallele_arret_anticipe(serveur_annonces):
+    """
+    Vérifie que l'arrêt du consommateur avant la fin arrête aussi le téléchargement des pages.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    nom_marques_modeles = [
+        NomMarquesModeles(marque="CITROEN", modeles=[f"c{n}" for n in range(10)])
+    ]
+    voitures = generer_voitures_parallele(
+        10, nom_marques_modeles, client, nombre_workers=1
+    )
+    assert next(voitures).marque == "CITROEN C3 III"
+    voitures.close()
+    assert len(serveur_annonces.requetes) < 30
@@ -0,0 +1,96 @@
+"""Module de test sur le module reentrainement"""
+
+from src.modules.machinelearning import ResultatEntrainement
+from src.modules.registre import publier_modele
+from src.modules import reentrainement
+from src.modules.reentrainement import (
+    get_raison_entrainement,
+    lire_manifeste,
+    reentrainer_modeles,
+)
+
+
+def test_get_raison_entrainement(tmp_path):
+    """
+    Vérifie la raison du réentraînement d'une marque selon le manifeste et le registre des modèles.
+    """
+    manifeste = {
+        "marques": {"AUDI": {"empreinte_donnees": "d", "empreinte_configuration": "c"}},
+        "executions": [],
+    }
+    assert (
+        get_raison_entrainement("BMW", "d", "c", manifeste, tmp_path)
+        == "jamais entraînée"
+    )
+    assert (
+        get_raison_entrainement("AUDI", "d", "c2", manifeste, tmp_path)
+        == "configuration modifiée"
+    )
+    assert (
+        get_raison_entrainement("AUDI", "d2", "c", manifeste, tmp_path)
+        == "données modifiées"
+    )
+    assert (
+        get_raison_entrainement("AUDI", "d", "c", manifeste, tmp_path)
+        == "modèle absent"
+    )
+    publier_modele("AUDI", "modèle", "préprocesseur", registre=tmp_path)
+    assert get_raison_entrainement("AUDI", "d", "c", manifeste, tmp_path) is None
+
+
+def test_reentrainer_modeles(tmp_path, monkeypatch):
+    """
+    Vérifie que seules les marques modifiées ou en échec au dernier entraînement sont réentraînées,
+    et que le manifeste enregistre les marques entraînées, ignorées et en échec.
+    """
+    empreintes = {"AUDI": "a1", "BMW": "b1", "DACIA": "c1"}
+    echecs = {"DACIA"}
+    entrainees = []
+
+    def entrainer_marques(
+        effectifs, n_workers, recherche, empreintes_marques, registre
+    ):
+        entrainees.append(sorted(effectifs))
+        resultats = []
+        for marque in effectifs:
+            resultat = ResultatEntrainement(marque=marque, lignes=effectifs[marque])
+            if marque in echecs:
+                resultat.erreur = "Traceback"
+            else:
+                assert empreintes_marques[marque] == empreintes[marque]
+                resultat.modele, resultat.mae = "KNeighbors", 1000.0
+                resultat.version = publier_modele(
+                    marque, "modèle", "préprocesseur", registre=registre
+                )
+            resultats.append(resultat)
+        return resultats
+
+    monkeypatch.setattr(reentrainement, "entrainer_marques", entrainer_marques)
+    monkeypatch.setattr(
+        reentrainement,
+        "get_effectifs_marques",
+        lambda nombre_marques: {"AUDI": 300, "BMW": 200, "DACIA": 100},
+    )
+    monkeypatch.setattr(
+        reentrainement, "get_empreintes_donnees", lambda marques: dict(empreintes)
+    )
+    chemin_manifeste = tmp_path / "manifeste.json"
+
+    reentrainer_modeles(chemin_manifeste=chemin_manifeste, registre=tmp_path)
+    echecs.clear()
+    empreintes["BMW"] = "b2"
+    reentrainer_modeles(chemin_manifeste=chemin_manifeste, registre=tmp_path)
+    reentrainer_modeles(chemin_manifeste=chemin_manifeste, registre=tmp_path)
+    assert entrainees == [["AUDI", "BMW", "DACIA"], ["BMW", "DACIA"], []]
+
+    manifeste = lire_manifeste(chemin_manifeste)
+    assert manifeste["marques"]["BMW"]["raison"] == "données modifiées"
+    assert manifeste["marques"]["BMW"]["empreinte_donnees"] == "b2"
+    assert manifeste["marques"]["BMW"]["version"] == "v0002"
+    assert [execution["entrainees"] for execution in manifeste["executions"]] == [
+        {"AUDI": "jamais entraînée", "BMW": "jamais entraînée"},
+        {"BMW": "données modifiées", "DACIA": "jamais entraînée"},
+        {},
+    ]
+    assert manifeste["executions"][0]["echecs"] == ["DACIA"]
+    assert manifeste["executions"][2]["ignorees"] == ["AUDI", "BMW", "DACIA"]
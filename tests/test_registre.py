@@ -0,0 +1,77 @@
+"""Module de test sur le module registre"""
+
+from src.modules.registre import (
+    ErreurRegistre,
+    charger_version,
+    lire_manifeste_version,
+    lister_versions,
+    publier_modele,
+    revenir_version,
+    version_courante,
+)
+from sklearn.linear_model import LinearRegression
+from sklearn.preprocessing import StandardScaler
+import pytest
+
+
+def test_publier_modele(tmp_path):
+    """
+    Vérifie qu'une publication crée une nouvelle version courante avec son manifeste, sans dossier temporaire,
+    et que seules les versions les plus récentes sont gardées.
+    """
+    assert version_courante("AUDI", tmp_path) is None
+    assert lister_versions("AUDI", tmp_path) == []
+    version = publier_modele(
+        "AUDI",
+        LinearRegression(),
+        StandardScaler(),
+        {"mae": 1000.0, "empreinte_donnees": "d1"},
+        tmp_path,
+    )
+    assert version == "v0001"
+    assert version_courante("AUDI", tmp_path) == "v0001"
+    manifeste = lire_manifeste_version("AUDI", registre=tmp_path)
+    assert manifeste["version"] == "v0001"
+    assert manifeste["mae"] == 1000.0
+    assert manifeste["empreinte_donnees"] == "d1"
+    model, preprocessor = charger_version("AUDI", registre=tmp_path)
+    assert isinstance(model, LinearRegression)
+    assert isinstance(preprocessor, StandardScaler)
+    for _ in range(3):
+        publier_modele(
+            "AUDI", LinearRegression(), StandardScaler(), registre=tmp_path, conserver=2
+        )
+    assert lister_versions("AUDI", tmp_path) == ["v0003", "v0004"]
+    assert version_courante("AUDI", tmp_path) == "v0004"
+    assert sorted(chemin.name for chemin in (tmp_path / "AUDI").iterdir()) == [
+        "COURANT",
+        "v0003",
+        "v0004",
+    ]
+
+
+def test_revenir_version(tmp_path):
+    """
+    Vérifie le retour à la version précédente ou à une version donnée, et les erreurs du registre.
+    """
+    with pytest.raises(ErreurRegistre):
+        charger_version("BMW", registre=tmp_path)
+    for mae in [1000.0, 900.0, 800.0]:
+        publier_modele(
+            "BMW", LinearRegression(), StandardScaler(), {"mae": mae}, tmp_path
+        )
+    assert revenir_version("BMW", registre=tmp_path) == "v0002"
+    assert lire_manifeste_version("BMW", registre=tmp_path)["mae"] == 900.0
+    assert revenir_version("BMW", registre=tmp_path) == "v0001"
+    with pytest.raises(ErreurRegistre):
+        revenir_version("BMW", registre=tmp_path)
+    assert revenir_version("BMW", "v0003", tmp_path) == "v0003"
+    with pytest.raises(ErreurRegistre):
+        revenir_version("BMW", "v0009", tmp_path)
+    assert version_courante("BMW", tmp_path) == "v0003"
+    # Une nouvelle publication suit la version la plus récente, pas la version courante
+    revenir_version("BMW", "v0001", tmp_path)
+    assert (
+        publier_modele("BMW", LinearRegression(), StandardScaler(), registre=tmp_path)
+        == "v0004"
+    )
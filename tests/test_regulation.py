@@ -0,0 +1,128 @@
+"""Module de test sur le module regulation
+
+Le régulateur est testé avec une horloge simulée pour ne pas dépendre du temps réel.
+"""
+
+from src.modules.scraping.regulation import ParametresRegulateur, RegulateurDebit
+from src.modules.scraping.webscraping import (
+    ClientScraping,
+    ErreurRalentissement,
+    ParametresClient,
+    telecharger_page,
+)
+import pytest
+
+
+class HorlogeSimulee:
+    """
+    Horloge dont le temps n'avance que lorsqu'on "dort".
+    """
+
+    def __init__(self) -> None:
+        self.temps = 0.0
+
+    def __call__(self) -> float:
+        return self.temps
+
+    def dormir(self, duree: float) -> None:
+        self.temps += duree
+
+
+def get_regulateur(**parametres) -> tuple[RegulateurDebit, HorlogeSimulee]:
+    """
+    Crée un régulateur branché sur une horloge simulée.
+    """
+    horloge = HorlogeSimulee()
+    regulateur = RegulateurDebit(
+        ParametresRegulateur(**parametres), horloge=horloge, dormir=horloge.dormir
+    )
+    return regulateur, horloge
+
+
+def test_regulateur_augmentation_additive():
+    """
+    Vérifie que le débit augmente d'un incrément par réponse rapide, sans dépasser le débit maximal.
+    """
+    regulateur, _ = get_regulateur(debit_initial=1, increment=0.5, debit_max=2)
+    regulateur.signaler_succes(0.1)
+    assert regulateur.etat().debit == 1.5
+    for _ in range(5):
+        regulateur.signaler_succes(0.1)
+    assert regulateur.etat().debit == 2
+
+
+def test_regulateur_reduction_multiplicative():
+    """
+    Vérifie qu'une réponse 429/5xx divise le débit, une seule fois par intervalle de réduction.
+    """
+    regulateur, horloge = get_regulateur(
+        debit_initial=8, facteur_reduction=0.5, delai_reduction=1, debit_min=1
+    )
+    regulateur.signaler_ralentissement()
+    regulateur.signaler_ralentissement()
+    assert regulateur.etat().debit == 4
+    horloge.dormir(1)
+    regulateur.signaler_erreur()
+    etat = regulateur.etat()
+    assert etat.debit == 2
+    assert (etat.ralentissements, etat.erreurs) == (2, 1)
+
+
+def test_regulateur_latence_elevee():
+    """
+    Vérifie qu'une latence moyenne supérieure à la cible réduit le débit.
+    """
+    regulateur, _ = get_regulateur(debit_initial=4, latence_cible=1)
+    regulateur.signaler_succes(3)
+    assert regulateur.etat().debit == 2
+    assert regulateur.etat().latence_moyenne == 3
+
+
+def test_regulateur_seau_a_jetons():
+    """
+    Vérifie qu'une fois la capacité consommée, les requêtes sont espacées selon le débit.
+    """
+    regulateur, horloge = get_regulateur(debit_initial=2, capacite=2)
+    for _ in range(4):
+        regulateur.attendre()
+    assert horloge.temps == 1
+
+
+def test_regulateur_delai_backoff():
+    """
+    Vérifie que le délai de nouvelle tentative est aléatoire, exponentiel, plafonné et respecte Retry-After.
+    """
+    regulateur, _ = get_regulateur(delai_base=1, delai_max=10)
+    for tentative in range(6):
+        assert 0 <= regulateur.delai_backoff(tentative) <= min(10, 2**tentative)
+    assert regulateur.delai_backoff(0, retry_after=5) >= 5
+
+
+def test_telecharger_page_reessaie_apres_503(serveur_annonces):
+    """
+    Vérifie qu'une réponse 503 réduit le débit et déclenche une nouvelle tentative.
+    """
+    serveur_annonces.statuts_forces = [503]
+    regulateur = RegulateurDebit(ParametresRegulateur(delai_base=0.01))
+    client = ClientScraping(
+        ParametresClient(base_url=serveur_annonces.base_url), regulateur
+    )
+    contenu = telecharger_page(1, "CITROEN", "C3", client)
+    assert b"searchCardContainer" in contenu
+    assert len(serveur_annonces.requetes) == 2
+    assert regulateur.etat().ralentissements == 1
+    assert regulateur.etat().succes == 1
+
+
+def test_telecharger_page_ralentissement_persistant(serveur_annonces):
+    """
+    Vérifie qu'une réponse 503 à la dernière tentative lève une erreur au lieu d'être lue comme une page.
+    """
+    serveur_annonces.statuts_forces = [503, 503, 503]
+    client = ClientScraping(
+        ParametresClient(base_url=serveur_annonces.base_url),
+        RegulateurDebit(ParametresRegulateur(delai_base=0.01)),
+    )
+    with pytest.raises(ErreurRalentissement):
+        telecharger_page(1, "CITROEN", "C3", client)
+    assert len(serveur_annonces.requetes) == 3
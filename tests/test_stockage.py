@@ -0,0 +1,189 @@
+"""Module de test sur le module stockage
+"""
+
+import json
+import duckdb
+from dataclasses import asdict, replace
+import polars as pl
+import pyarrow.parquet as pq
+import pytest
+from src.modules.scraping.webscraping import (
+    NomMarquesModeles,
+    ClientScraping,
+    ParametresClient,
+    voiture,
+    import_marques_modeles,
+    export_to_json,
+)
+from src.modules.scraping.pipeline import generer_voitures
+from src.modules.scraping.stockage import (
+    exporter_ndjson,
+    exporter_parquet,
+    lire_voitures_parquet,
+    charger_voitures,
+    lire_tableaux_json,
+)
+from src.modules.datacleaning import gazoduc
+
+
+VOITURE_EX = voiture(
+    marque="CITROEN C3 III",
+    cylindre="1.2 PURETECH 110 FEEL",
+    annee="2019",
+    kilometrage="10 698 km",
+    boite="Automatique",
+    energie="Essence",
+    prix="15 990 €",
+    position_marché="Bonne affaire",
+    garantie="Garantie 12 mois",
+    lien="https://www.lacentrale.fr/auto-occasion-annonce-69112858137.html",
+)
+
+
+def test_exporter_ndjson(tmp_path):
+    """
+    Vérifie que chaque voiture est écrite sur une ligne avec les mêmes champs que l'export JSON.
+    """
+    chemin = tmp_path / "voitures.ndjson"
+    assert exporter_ndjson(iter([VOITURE_EX, VOITURE_EX]), chemin) == 2
+    lignes = chemin.read_text(encoding="utf-8").splitlines()
+    assert len(lignes) == 2
+    assert json.loads(lignes[0]) == {
+        "marque": "CITROEN C3 III",
+        "cylindre": "1.2 PURETECH 110 FEEL",
+        "annee": "2019",
+        "kilometrage": "10 698 km",
+        "boite": "Automatique",
+        "energie": "Essence",
+        "prix": "15 990 €",
+        "position_marché": "Bonne affaire",
+        "garantie": "Garantie 12 mois",
+        "lien": "https://www.lacentrale.fr/auto-occasion-annonce-69112858137.html",
+    }
+
+
+def test_generer_voitures_paresseux(serveur_annonces):
+    """
+    Vérifie que le pipeline ne télécharge une page que lorsque ses voitures sont demandées.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    voitures = generer_voitures(
+        10, [NomMarquesModeles(marque="CITROEN", modeles=["c3", "c4"])], client
+    )
+    assert serveur_annonces.requetes == []
+    assert next(voitures) == VOITURE_EX
+    assert len(serveur_annonces.requetes) == 1
+
+
+def test_generer_voitures_export_ndjson(serveur_annonces, tmp_path):
+    """
+    Vérifie que toutes les voitures du pipeline sont écrites dans le fichier NDJSON.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    voitures = generer_voitures(
+        10, [NomMarquesModeles(marque="CITROEN", modeles=["c3", "c4"])], client
+    )
+    assert exporter_ndjson(voitures, tmp_path / "voitures.ndjson") == 16
+
+
+def test_exporter_parquet_groupes(tmp_path):
+    """
+    Vérifie que les voitures sont écrites par groupes de lignes, avec un schéma de chaînes, et relues à l'identique.
+    """
+    chemin = tmp_path / "voitures.parquet"
+    assert exporter_parquet(iter([VOITURE_EX] * 5), chemin, taille_groupe=2) == 5
+    assert pq.ParquetFile(chemin).metadata.num_row_groups == 3
+    voitures = lire_voitures_parquet(chemin)
+    assert isinstance(voitures, pl.LazyFrame)
+    donnees = voitures.collect()
+    assert donnees.schema == {colonne: pl.Utf8 for colonne in asdict(VOITURE_EX)}
+    assert donnees.row(0, named=True) == asdict(VOITURE_EX)
+    assert donnees.height == 5
+
+
+def test_gazoduc_parquet(serveur_annonces, tmp_path):
+    """
+    Vérifie que gazoduc nettoie directement le fichier Parquet du scraping, comme les données JSON.
+    """
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    voitures = list(
+        generer_voitures(
+            10, [NomMarquesModeles(marque="CITROEN", modeles=["c3"])], client
+        )
+    )
+    chemin = tmp_path / "voitures.parquet"
+    exporter_parquet(voitures, chemin)
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    attendu = gazoduc(pl.DataFrame([asdict(v) for v in voitures]), nom_marques_modeles)
+    assert gazoduc(lire_voitures_parquet(chemin), nom_marques_modeles).equals(attendu)
+
+
+def test_charger_voitures_formats(tmp_path):
+    """
+    Vérifie que le chargeur lit les tableaux JSON, le NDJSON et le Parquet avec des motifs glob,
+    dans l'ordre des fichiers, en supprimant les annonces en double sur `lien` (sauf "NA").
+    """
+    voiture2 = replace(VOITURE_EX, lien="https://www.lacentrale.fr/2.html", prix="1 €")
+    voiture3 = replace(VOITURE_EX, lien="https://www.lacentrale.fr/3.html")
+    sans_lien = replace(VOITURE_EX, lien="NA")
+    export_to_json([VOITURE_EX, sans_lien], str(tmp_path / "a.json"))
+    exporter_ndjson([voiture2, VOITURE_EX, sans_lien], tmp_path / "b.ndjson")
+    exporter_parquet([voiture3, voiture2], tmp_path / "c.parquet")
+
+    voitures = charger_voitures([tmp_path / "*.json", str(tmp_path / "*.[np]*")])
+    assert isinstance(voitures, pl.LazyFrame)
+    donnees = voitures.collect()
+    assert donnees.columns == list(asdict(VOITURE_EX))
+    assert donnees["lien"].to_list() == [
+        VOITURE_EX.lien,
+        "NA",
+        voiture2.lien,
+        "NA",
+        voiture3.lien,
+    ]
+    assert charger_voitures(str(tmp_path / "*")).collect().height == 5
+    assert (
+        charger_voitures(str(tmp_path / "*"), dedoublonner=False).collect().height == 7
+    )
+
+
+def test_lire_tableaux_json(tmp_path):
+    """
+    Vérifie que les tableaux JSON sont relus à l'identique, fichier par fichier, et qu'un tableau incomplet
+    est signalé.
+    """
+    voitures = [VOITURE_EX, replace(VOITURE_EX, lien="NA", prix="1 €"), VOITURE_EX]
+    export_to_json(voitures, str(tmp_path / "voitures.json"))
+    (tmp_path / "vide.json").write_text(" [ ] ", encoding="utf-8")
+    fichiers = [str(tmp_path / "voitures.json"), str(tmp_path / "vide.json")]
+    tableaux = lire_tableaux_json(fichiers, nombre_threads=2)
+    assert list(tableaux) == fichiers
+    assert tableaux[fichiers[0]].to_dicts() == [asdict(v) for v in voitures]
+    assert tableaux[fichiers[1]].columns == list(asdict(VOITURE_EX))
+    assert tableaux[fichiers[1]].height == 0
+    (tmp_path / "tronque.json").write_text('[{"lien": "a"}, {"li', encoding="utf-8")
+    with pytest.raises(duckdb.InvalidInputException):
+        lire_tableaux_json([str(tmp_path / "tronque.json")])
+
+
+def test_charger_voitures_sans_lien(tmp_path):
+    """
+    Vérifie que les annonces sans lien (valeur manquante) sont toutes conservées, comme les liens "NA".
+    """
+    sans_lien = replace(VOITURE_EX, lien=None)
+    export_to_json([sans_lien, VOITURE_EX, sans_lien], str(tmp_path / "a.json"))
+    donnees = charger_voitures(tmp_path / "a.json")
+    assert donnees.collect()["lien"].to_list() == [None, VOITURE_EX.lien, None]
+
+
+def test_charger_voitures_erreurs(tmp_path):
+    """
+    Vérifie les erreurs du chargeur : liste vide, aucun fichier trouvé, format inconnu.
+    """
+    with pytest.raises(ValueError):
+        charger_voitures([])
+    with pytest.raises(FileNotFoundError):
+        charger_voitures(str(tmp_path / "*.json"))
+    (tmp_path / "voitures.csv").write_text("marque\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        charger_voitures(str(tmp_path / "*"))
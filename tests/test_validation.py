@@ -0,0 +1,118 @@
+"""Module de test sur le module validation"""
+
+import pytest
+from src.modules.scraping.webscraping import fusionner_fichiers_json
+from src.modules.app.import_mm import import_marques_modeles
+from src.modules.datacleaning import gazoduc
+from src.modules.validation import (
+    SCHEMA_NETTOYE,
+    BORNES,
+    ErreurSchema,
+    verifier_schema,
+    valider,
+    marquer_rejets,
+    separer_rejets,
+)
+import polars as pl
+
+
+def get_donnees_converties() -> pl.DataFrame:
+    """
+    Renvoie des données au schéma déclaré : une ligne valide et une ligne par type de rejet.
+    """
+    lignes = [
+        {"prix": 15000, "kilometrage": 45000, "annee": 2019, "puissance": 110},
+        {"prix": 15000, "kilometrage": 45000, "annee": 2019, "puissance": None},
+        {"prix": 1, "kilometrage": 45000, "annee": 2019, "puissance": 110},
+        {"prix": 15000, "kilometrage": 900000, "annee": 1800, "puissance": 110},
+        {"prix": 15000, "kilometrage": 60000, "annee": 2024, "puissance": 110},
+    ]
+    return pl.DataFrame(
+        [
+            {
+                colonne: ligne.get(colonne, "X" if type_colonne == pl.Utf8 else 0)
+                for colonne, type_colonne in SCHEMA_NETTOYE.items()
+            }
+            for ligne in lignes
+        ],
+        schema=SCHEMA_NETTOYE,
+    )
+
+
+def test_verifier_schema():
+    """
+    Vérifie qu'une colonne absente ou d'un autre type lève une ErreurSchema, mais pas une colonne
+    entièrement vide (les valeurs manquantes sont rejetées ligne par ligne).
+    """
+    data = get_donnees_converties()
+    verifier_schema(data)
+    with pytest.raises(ErreurSchema, match="prix"):
+        verifier_schema(data.drop("prix"))
+    with pytest.raises(ErreurSchema, match="annee"):
+        verifier_schema(data.with_columns(pl.col("annee").cast(pl.Utf8)))
+    verifier_schema(data.with_columns(pl.lit(None, pl.Int64).alias("puissance")))
+    verifier_schema(data.lazy())
+
+
+def test_valider(tmp_path):
+    """
+    Vérifie que seules les lignes valides sont gardées et que les rejets sont enregistrés avec leurs motifs.
+    """
+    valides = valider(get_donnees_converties(), tmp_path / "rejets.parquet")
+    assert valides.height == 1
+    assert pl.read_parquet(tmp_path / "rejets.parquet")["motifs"].to_list() == [
+        "puissance manquant",
+        "prix hors de [100, 2000000]",
+        f"kilometrage hors de [0, 449999] ; annee hors de [1900, {BORNES['annee'][1]}]",
+        "annee 2024 et plus de 50000 km",
+    ]
+    assert valider(get_donnees_converties().lazy()).collect().equals(valides)
+    with pytest.raises(ValueError):
+        valider(get_donnees_converties().lazy(), tmp_path / "rejets_lazy.parquet")
+
+
+def test_marquer_rejets(tmp_path):
+    """
+    Vérifie que les lignes valides et rejetées d'un LazyFrame sont obtenues en une seule exécution,
+    identiques à celles de valider.
+    """
+    valides = valider(get_donnees_converties(), tmp_path / "rejets.parquet")
+    donnees = tmp_path / "donnees.parquet"
+    get_donnees_converties().write_parquet(donnees)
+    marquees = marquer_rejets(pl.scan_parquet(donnees)).collect(streaming=True)
+    assert marquees["motifs"].null_count() == 1
+    valides_lazy, rejets = separer_rejets(marquees)
+    assert valides_lazy.equals(valides)
+    assert rejets.equals(pl.read_parquet(tmp_path / "rejets.parquet"))
+
+
+def test_gazoduc_rejets(tmp_path):
+    """
+    Vérifie que gazoduc enregistre les lignes écartées au lieu de les supprimer silencieusement,
+    y compris pour un lot d'une seule annonce au cylindre illisible. La validation suit la suppression
+    des doublons : une annonce dont la première occurrence est rejetée est écartée.
+    """
+    data_brutes = pl.DataFrame(fusionner_fichiers_json(["test_data.json"]))
+    nom_marques_modeles = pl.DataFrame(import_marques_modeles())
+    erreur = data_brutes.tail(1).with_columns(pl.lit("erreur").alias("energie"))
+    resultat = gazoduc(
+        pl.concat([erreur, data_brutes]),
+        nom_marques_modeles,
+        chemin_rejets=tmp_path / "rejets.parquet",
+    )
+    assert erreur["lien"][0] not in resultat["lien"].to_list()
+    rejets = pl.read_parquet(tmp_path / "rejets.parquet")
+    assert rejets.select("lien", "motifs").rows() == [
+        (erreur["lien"][0], "energie erreur")
+    ]
+    illisible = data_brutes.head(1).with_columns(pl.lit("DOLLY").alias("cylindre"))
+    assert (
+        gazoduc(illisible, nom_marques_modeles, tmp_path / "rejets.parquet").height == 0
+    )
+    assert pl.read_parquet(tmp_path / "rejets.parquet")["motifs"].to_list() == [
+        "puissance manquant"
+    ]
+    gazoduc(illisible.lazy(), nom_marques_modeles, tmp_path / "rejets_lazy.parquet")
+    assert pl.read_parquet(tmp_path / "rejets_lazy.parquet").equals(
+        pl.read_parquet(tmp_path / "rejets.parquet")
+    )
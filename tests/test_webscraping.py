@@ -26,7 +26,16 @@ from src.modules.scraping.webscraping import (
     recup_nom_vehicule,
     recup_position_marché,
     recup_prix,
+    recup_page,
+    recup_annonces,
+    recup_nombre_pages,
+    get_derniere_page,
     fusionner_fichiers_json,
+    print_info_scraping,
+    extraire_toutes_annonces,
+    ClientScraping,
+    ParametresClient,
+    NomMarquesModeles,
 )
 import pytest
 
@@ -40,7 +49,9 @@ def get_annonces_pour_test():
 
     """
     chemin_exemple = Path(".").resolve() / "pages/exemple_annonces.html"
-    page = BeautifulSoup(chemin_exemple.read_text(encoding="utf8"), features="html.parser")
+    page = BeautifulSoup(
+        chemin_exemple.read_text(encoding="utf8"), features="html.parser"
+    )
     annonces = page.find_all("div", class_="searchCardContainer")
     return annonces
 
@@ -270,3 +281,51 @@ def test_fusionner_fichiers_json_FileNotFoundError():
     """
     with pytest.raises(FileNotFoundError):
         fusionner_fichiers_json(["abcdefg.json", "fichier_introuvable.json"])
+
+
+def test_client_scraping_reutilise_connexions(serveur_annonces):
+    """
+    Vérifie que le client de scraping réutilise la même connexion keep-alive pour plusieurs pages.
+    """
+    with ClientScraping(ParametresClient(base_url=serveur_annonces.base_url)) as client:
+        for num_page in range(1, 4):
+            page = recup_page(num_page, "CITROEN", "C3", client)
+        assert client.connexions_ouvertes() == 1
+        assert client.connexions_reutilisees() == 2
+    assert recup_annonces(page) == []
+
+
+def test_extraire_toutes_annonces(serveur_annonces):
+    """
+    Vérifie que la boucle de scraping utilise le client fourni et ne demande que les pages annoncées
+    par la première page de chaque modèle.
+    """
+    nom_marques_modeles = [NomMarquesModeles(marque="CITROEN", modeles=["c3", "c4"])]
+    client = ClientScraping(ParametresClient(base_url=serveur_annonces.base_url))
+    annonces = extraire_toutes_annonces(10, nom_marques_modeles, client)
+    assert len(annonces) == 16
+    assert len(serveur_annonces.requetes) == 4
+    assert client.connexions_reutilisees() == 3
+
+
+def test_print_info_scraping(capsys):
+    """
+    Vérifie que le nombre de connexions réutilisées est affiché avec la progression du scraping.
+    """
+    print_info_scraping(10, 60, 9)
+    sortie = capsys.readouterr().out
+    assert "10 pages/min" in sortie.replace("10.00", "10")
+    assert "9 connexions réutilisées" in sortie
+
+
+def test_recup_nombre_pages():
+    """
+    Vérifie la lecture du nombre de pages de résultats : 301 061 annonces par pages de 16.
+    """
+    contenu = (Path(".").resolve() / "pages/exemple_annonces.html").read_bytes()
+    assert recup_nombre_pages(contenu) == 18817
+    assert recup_nombre_pages(contenu.decode("utf-8")) == 18817
+    assert recup_nombre_pages(b"<html><body></body></html>") is None
+    assert get_derniere_page(contenu, 10) == 9
+    assert get_derniere_page(b"<html></html>", 10) == 9
+    assert get_derniere_page(b'<span class="total">40</span>', 10) == 3